@@ -0,0 +1,64 @@
+"""Add indexed substring search for assets."""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_asset_search_index"
+down_revision: Union[str, None] = "0002_security_roles"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = (
+    "assets_tag",
+    "assets_notes",
+    *(f"asset_definableFields_{index}" for index in range(1, 11)),
+)
+
+
+def _document(alias: str) -> str:
+    return " || ' ' || ".join(f'coalesce({alias}."{name}", \'\')' for name in SEARCH_COLUMNS)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_assets_search_trgm ON assets "
+            f"USING gin ((lower({_document('assets')})) gin_trgm_ops)"
+        )
+    elif dialect == "sqlite":
+        columns = ", ".join(f'"{name}"' for name in SEARCH_COLUMNS)
+        op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS assets_search USING fts5(document, tokenize='trigram')")
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS assets_search_ai AFTER INSERT ON assets BEGIN "
+            f"INSERT INTO assets_search(rowid, document) VALUES (new.assets_id, {_document('new')}); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS assets_search_ad AFTER DELETE ON assets BEGIN "
+            "DELETE FROM assets_search WHERE rowid = old.assets_id; END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS assets_search_au AFTER UPDATE OF assets_id, {columns} ON assets BEGIN "
+            "DELETE FROM assets_search WHERE rowid = old.assets_id; "
+            f"INSERT INTO assets_search(rowid, document) VALUES (new.assets_id, {_document('new')}); END"
+        )
+        op.execute(
+            "INSERT INTO assets_search(rowid, document) "
+            f"SELECT assets.assets_id, {_document('assets')} FROM assets"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_assets_search_trgm")
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS assets_search_au")
+        op.execute("DROP TRIGGER IF EXISTS assets_search_ad")
+        op.execute("DROP TRIGGER IF EXISTS assets_search_ai")
+        op.execute("DROP TABLE IF EXISTS assets_search")
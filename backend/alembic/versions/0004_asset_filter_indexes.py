@@ -0,0 +1,29 @@
+"""Add composite indexes for asset list filters and facets."""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_asset_filter_indexes"
+down_revision: Union[str, None] = "0003_asset_search_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_assets_instance_deleted_id": ["instances_id", "assets_deleted", "assets_id"],
+    "ix_assets_instance_deleted_type": ["instances_id", "assets_deleted", "assetTypes_id"],
+    "ix_assets_instance_deleted_location": ["instances_id", "assets_deleted", "assets_storageLocation"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, "assets", columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name in reversed(list(INDEXES)):
+        op.drop_index(name, table_name="assets", if_exists=True)
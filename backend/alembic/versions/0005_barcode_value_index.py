@@ -0,0 +1,21 @@
+"""Index asset barcodes by value for scanner lookups."""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_barcode_value_index"
+down_revision: Union[str, None] = "0004_asset_filter_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_assetsBarcodes_value", "assetsBarcodes", ["assetsBarcodes_value"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assetsBarcodes_value", table_name="assetsBarcodes", if_exists=True)
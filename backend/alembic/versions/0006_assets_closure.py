@@ -0,0 +1,41 @@
+"""Add the assetsClosure table for case/kit hierarchy lookups."""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_assets_closure"
+down_revision: Union[str, None] = "0005_barcode_value_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MAX_DEPTH = 32
+
+
+def upgrade() -> None:
+    op.create_table(
+        "assetsClosure",
+        sa.Column("ancestor_id", sa.Integer(), primary_key=True),
+        sa.Column("descendant_id", sa.Integer(), primary_key=True),
+        sa.Column("depth", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_assetsClosure_descendant", "assetsClosure", ["descendant_id", "depth"])
+    op.execute(
+        'INSERT INTO "assetsClosure" (ancestor_id, descendant_id, depth) '
+        "WITH RECURSIVE paths(ancestor_id, descendant_id, depth) AS ("
+        "SELECT assets_id, assets_id, 0 FROM assets "
+        "UNION ALL "
+        'SELECT paths.ancestor_id, assets.assets_id, paths.depth + 1 FROM assets '
+        'JOIN paths ON assets."assets_linkedTo" = paths.descendant_id '
+        f"WHERE paths.depth < {MAX_DEPTH}"
+        ") SELECT ancestor_id, descendant_id, depth FROM paths"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assetsClosure_descendant", table_name="assetsClosure")
+    op.drop_table("assetsClosure")
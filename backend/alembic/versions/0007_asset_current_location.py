@@ -0,0 +1,49 @@
+"""Add the asset_current_location projection of the latest barcode scan per asset."""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_asset_current_location"
+down_revision: Union[str, None] = "0006_assets_closure"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "asset_current_location",
+        sa.Column("assets_id", sa.Integer(), primary_key=True),
+        sa.Column("assetsBarcodes_id", sa.Integer(), nullable=False),
+        sa.Column("scanned_at", sa.DateTime(), nullable=False),
+        sa.Column("locations_id", sa.Integer()),
+        sa.Column("location_assets_id", sa.Integer()),
+        sa.Column("custom_location", sa.String(500)),
+    )
+    op.create_index("ix_asset_current_location_location", "asset_current_location", ["locations_id"])
+    op.create_index("ix_asset_current_location_container", "asset_current_location", ["location_assets_id"])
+    op.execute(
+        'INSERT INTO asset_current_location (assets_id, "assetsBarcodes_id", scanned_at, '
+        "locations_id, location_assets_id, custom_location) "
+        'SELECT assets_id, "assetsBarcodes_id", scanned_at, locations_id, location_assets_id, custom_location '
+        "FROM ("
+        'SELECT b.assets_id, s."assetsBarcodes_id", s."assetsBarcodesScans_timestamp" AS scanned_at, '
+        'lb.locations_id, s.location_assets_id, s."assetsBarcodes_customLocation" AS custom_location, '
+        "ROW_NUMBER() OVER (PARTITION BY b.assets_id "
+        'ORDER BY s."assetsBarcodesScans_timestamp" DESC, s."assetsBarcodesScans_id" DESC) AS position '
+        'FROM "assetsBarcodesScans" s '
+        'JOIN "assetsBarcodes" b ON b."assetsBarcodes_id" = s."assetsBarcodes_id" '
+        'LEFT JOIN "locationsBarcodes" lb ON lb."locationsBarcodes_id" = s."locationsBarcodes_id" '
+        "WHERE b.assets_id IS NOT NULL"
+        ") ranked WHERE position = 1"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_asset_current_location_container", table_name="asset_current_location")
+    op.drop_index("ix_asset_current_location_location", table_name="asset_current_location")
+    op.drop_table("asset_current_location")
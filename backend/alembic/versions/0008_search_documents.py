@@ -0,0 +1,91 @@
+"""Add the search_documents index behind the global search endpoint."""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.models.search import search_documents_ddl
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_search_documents"
+down_revision: Union[str, None] = "0007_asset_current_location"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFINABLE_FIELDS = tuple(f"asset_definableFields_{index}" for index in range(1, 11))
+
+# (entity, table, id column, instance column, title, body columns, live condition)
+SOURCES = (
+    (
+        "asset",
+        "assets",
+        "assets_id",
+        "instances_id",
+        "coalesce(\"assets_tag\", 'Asset ' || \"assets_id\")",
+        ("assets_notes", *DEFINABLE_FIELDS),
+        '"assets_deleted" = false',
+    ),
+    ("asset_type", "assetTypes", "assetTypes_id", "instances_id", '"assetTypes_name"', ("assetTypes_description",), None),
+    ("project", "projects", "projects_id", "instances_id", '"projects_name"', ("projects_description",), '"projects_deleted" = false'),
+    (
+        "client",
+        "clients",
+        "clients_id",
+        "instances_id",
+        '"clients_name"',
+        ("clients_email", "clients_website", "clients_phone", "clients_address", "clients_notes"),
+        '"clients_deleted" = false',
+    ),
+    (
+        "user",
+        "users",
+        "users_userid",
+        None,
+        "coalesce(nullif(trim(coalesce(\"users_name1\", '') || ' ' || coalesce(\"users_name2\", '')), ''), "
+        "\"users_username\", 'User ' || \"users_userid\")",
+        ("users_username",),
+        '"users_deleted" = false AND "users_suspended" = false',
+    ),
+)
+
+
+def _body(columns: Sequence[str]) -> str:
+    return "trim(" + " || ' ' || ".join(f'coalesce(CAST("{name}" AS TEXT), \'\')' for name in columns) + ")"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "search_documents",
+        sa.Column("search_documents_id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("entity", sa.String(32), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("instances_id", sa.Integer()),
+        sa.Column("title", sa.String(500), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False, server_default=""),
+        sa.UniqueConstraint("entity", "entity_id", name="uq_search_documents_entity"),
+    )
+    op.create_index("ix_search_documents_instance", "search_documents", ["instances_id"])
+
+    create, _ = search_documents_ddl(op.get_bind().dialect.name)
+    for statement in create:
+        op.execute(statement)
+
+    for entity, table, id_column, instance_column, title, body, live in SOURCES:
+        instance = f'"{instance_column}"' if instance_column else "NULL"
+        where = f" WHERE {live}" if live else ""
+        op.execute(
+            "INSERT INTO search_documents (entity, entity_id, instances_id, title, body) "
+            f"SELECT '{entity}', \"{id_column}\", {instance}, substr({title}, 1, 500), {_body(body)} "
+            f'FROM "{table}"{where}'
+        )
+
+
+def downgrade() -> None:
+    _, drop = search_documents_ddl(op.get_bind().dialect.name)
+    for statement in drop:
+        op.execute(statement)
+    op.drop_index("ix_search_documents_instance", table_name="search_documents")
+    op.drop_table("search_documents")
@@ -0,0 +1,42 @@
+"""Add instance-leading composite and partial indexes for tenant-scoped reads."""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_tenant_indexes"
+down_revision: Union[str, None] = "0008_search_documents"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name: (table, columns, soft-delete column of the partial predicate or None)
+INDEXES = {
+    "ix_assets_instance_live": ("assets", ["instances_id", "assets_id"], "assets_deleted"),
+    "ix_projects_instance_live": ("projects", ["instances_id", "projects_id"], "projects_deleted"),
+    "ix_clients_instance_live": ("clients", ["instances_id", "clients_name"], "clients_deleted"),
+    "ix_locations_instance_live": ("locations", ["instances_id", "locations_id"], "locations_deleted"),
+    "ix_assetTypes_instance": ("assetTypes", ["instances_id", "assetTypes_id"], None),
+    "ix_assetsAssignments_project_live": (
+        "assetsAssignments",
+        ["projects_id", "assets_id"],
+        "assetsAssignments_deleted",
+    ),
+}
+
+
+def upgrade() -> None:
+    for name, (table, columns, deleted) in INDEXES.items():
+        where = {}
+        if deleted is not None:
+            predicate = sa.column(deleted) == sa.false()
+            where = {"postgresql_where": predicate, "sqlite_where": predicate}
+        op.create_index(name, table, columns, if_not_exists=True, **where)
+
+
+def downgrade() -> None:
+    for name, (table, _columns, _deleted) in reversed(list(INDEXES.items())):
+        op.drop_index(name, table_name=table, if_exists=True)
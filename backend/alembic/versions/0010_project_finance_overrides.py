@@ -0,0 +1,32 @@
+"""Add the per-project day and week overrides used by the finance totals.
+
+The legacy PHP migration ``20240320173000_new_project_finance_maths`` already
+adds both columns to databases it manages, so they are only added when absent.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_project_finance_overrides"
+down_revision: Union[str, None] = "0009_tenant_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ("projects_dates_finances_days", "projects_dates_finances_weeks")
+
+
+def upgrade() -> None:
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("projects")}
+    for name in COLUMNS:
+        if name not in existing:
+            op.add_column("projects", sa.Column(name, sa.SmallInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    for name in reversed(COLUMNS):
+        op.drop_column("projects", name)
@@ -1,10 +1,13 @@
 from fastapi import APIRouter
 
-from app.api.routes import assets, health, integrations
+from app.api.routes import assets, barcodes, batch, health, integrations, search
 
 api_router = APIRouter()
 api_router.include_router(health.router)
 api_router.include_router(assets.router)
+api_router.include_router(barcodes.router)
+api_router.include_router(search.router)
 api_router.include_router(integrations.router)
+api_router.include_router(batch.router)
 
 __all__ = ["api_router"]
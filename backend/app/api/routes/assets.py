@@ -1,20 +1,106 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Annotated, Awaitable, Callable
 
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.caching import conditional_response
+from app.core.config import get_settings
+from app.core.tenancy import require_tenant
+from app.db.async_session import get_async_db
+from app.db.changes import asset_view_version
 from app.feature_flags import ensure_feature
-from app.schemas.assets import AssetDetails, AssetListResponse
-from app.services.assets import AssetsService
+from app.schemas.assets import (
+    AssetAvailabilityResponse,
+    AssetBatchResponse,
+    AssetDetails,
+    AssetFilters,
+    AssetListResponse,
+    AssetSort,
+    AssetSummary,
+    AssetTreeResponse,
+    TotalMode,
+    parse_facets,
+    parse_fields,
+)
+from app.services.asset_export import EXPORT_MEDIA_TYPES, ExportFormat, stream_export
+from app.services.assets import AsyncAssetsService, response_cache
+from app.services.availability import AsyncAvailabilityService
 
 
-router = APIRouter(prefix="/assets", tags=["assets"])
+router = APIRouter(prefix="/assets", tags=["assets"], dependencies=[Depends(require_tenant)])
 require_assets_feature = ensure_feature("assets_api")
+FIELDS_DESCRIPTION = "Comma-separated response fields to return, e.g. id,tag,day_rate"
+FACETS_DESCRIPTION = "Comma-separated facets to count over all matches: type, location, category"
+
+
+def get_assets_service(db: Annotated[AsyncSession, Depends(get_async_db)]) -> AsyncAssetsService:
+    return AsyncAssetsService.from_session(db)
+
+
+def get_availability_service(db: Annotated[AsyncSession, Depends(get_async_db)]) -> AsyncAvailabilityService:
+    return AsyncAvailabilityService.from_session(db)
+
+
+def get_asset_filters(
+    instance_id: Annotated[int | None, Query(ge=1, description="Only assets of this instance")] = None,
+    asset_type_id: Annotated[int | None, Query(ge=1, description="Only assets of this asset type")] = None,
+    storage_location_id: Annotated[
+        int | None, Query(ge=1, description="Only assets stored at this location")
+    ] = None,
+    deleted: Annotated[bool | None, Query(description="Only deleted (true) or live (false) assets")] = None,
+    archived: Annotated[
+        bool | None, Query(description="Only archived (true) or unarchived (false) assets")
+    ] = None,
+    current_location_id: Annotated[
+        int | None, Query(ge=1, description="Only assets last scanned at this location")
+    ] = None,
+) -> AssetFilters:
+    return AssetFilters(
+        instance_id=instance_id,
+        asset_type_id=asset_type_id,
+        storage_location_id=storage_location_id,
+        deleted=deleted,
+        archived=archived,
+        current_location_id=current_location_id,
+    )
+
+
+def _selected_fields(raw: str | None, model: type[BaseModel]) -> frozenset[str] | None:
+    if raw is None:
+        return None
+    try:
+        return parse_fields(raw, model)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
 
+def _selected_facets(raw: str | None) -> tuple[str, ...]:
+    if raw is None:
+        return ()
+    try:
+        return parse_facets(raw)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
 
-def get_assets_service(db: Session = Depends(get_db)) -> AssetsService:
-    return AssetsService.from_session(db)
+
+async def _cached(request: Request, render: Callable[[], Awaitable[BaseModel]]) -> Response:
+    """Serve a GET through the shared response cache with ETag revalidation.
+
+    Returning a ``Response`` also bypasses FastAPI's response_model pass, which
+    sparse fieldset models could not satisfy anyway.
+    """
+
+    async def render_body() -> bytes:
+        return (await render()).model_dump_json().encode("utf-8")
+
+    return await conditional_response(
+        request, response_cache, version=asset_view_version(), render=render_body
+    )
 
 
 @router.get(
@@ -25,13 +111,150 @@ def get_assets_service(db: Session = Depends(get_db)) -> AssetsService:
     dependencies=[Depends(require_assets_feature)],
 )
 async def list_assets(
+    request: Request,
+    *,
+    limit: Annotated[int, Query(ge=1, le=100, description="Maximum number of items to return")] = 20,
+    offset: Annotated[int, Query(ge=0, description="Offset for pagination")] = 0,
+    cursor: Annotated[
+        str | None,
+        Query(max_length=200, description="Opaque cursor from a previous page's next_cursor; replaces offset"),
+    ] = None,
+    search: Annotated[
+        str | None,
+        Query(max_length=100, description="Case-insensitive substring match against tag, notes and custom fields"),
+    ] = None,
+    sort: Annotated[AssetSort, Query(description="Order by identifier or, with search, by relevance")] = "id",
+    total_mode: Annotated[
+        TotalMode,
+        Query(description="exact runs COUNT(*), estimated uses planner statistics or a cached count, none skips it"),
+    ] = "exact",
+    fields: Annotated[str | None, Query(max_length=500, description=FIELDS_DESCRIPTION)] = None,
+    filters: Annotated[AssetFilters, Depends(get_asset_filters)],
+    facets: Annotated[str | None, Query(max_length=100, description=FACETS_DESCRIPTION)] = None,
+    service: Annotated[AsyncAssetsService, Depends(get_assets_service)],
+) -> AssetListResponse | Response:
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="offset and cursor cannot be combined",
+        )
+    if cursor is not None and sort == "relevance":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor pagination is only available when sorting by id",
+        )
+    selected = _selected_fields(fields, AssetSummary)
+    selected_facets = _selected_facets(facets)
+    return await _cached(
+        request,
+        lambda: service.list_assets(
+            limit=limit,
+            offset=offset,
+            search=search,
+            cursor=cursor,
+            total_mode=total_mode,
+            sort=sort,
+            fields=selected,
+            filters=filters,
+            facets=selected_facets,
+        ),
+    )
+
+
+def parse_asset_ids(
+    ids: Annotated[
+        list[str],
+        Query(description="Asset identifiers, comma-separated and/or repeated (ids=1,2&ids=3)"),
+    ],
+) -> list[int]:
+    try:
+        parsed = [int(part) for value in ids for part in value.split(",") if part.strip()]
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must be comma-separated integers",
+        ) from exc
+    if not parsed or any(asset_id < 1 for asset_id in parsed):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must contain positive integers",
+        )
+    max_ids = get_settings().assets_batch_max_ids
+    if len(set(parsed)) > max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {max_ids} ids can be requested at once",
+        )
+    return parsed
+
+
+@router.get(
+    ":batch",
+    response_model=AssetBatchResponse,
+    summary="Retrieve several assets by identifier in one request.",
+    operation_id="get_assets_batch",
+    dependencies=[Depends(require_assets_feature)],
+)
+async def get_assets_batch(
+    request: Request,
+    *,
+    asset_ids: Annotated[list[int], Depends(parse_asset_ids)],
+    service: Annotated[AsyncAssetsService, Depends(get_assets_service)],
+) -> AssetBatchResponse | Response:
+    return await _cached(request, lambda: service.get_assets(asset_ids))
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Stream every matching asset as CSV or NDJSON.",
+    operation_id="export_assets",
+    dependencies=[Depends(require_assets_feature)],
+)
+async def export_assets(
+    *,
+    format: Annotated[ExportFormat, Query(description="Export format: csv or ndjson")] = "csv",
+    after_id: Annotated[
+        int | None,
+        Query(ge=0, description="Resume after this asset identifier, e.g. from an interrupted export"),
+    ] = None,
+    search: Annotated[
+        str | None,
+        Query(max_length=100, description="Case-insensitive substring match against tag, notes and custom fields"),
+    ] = None,
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(format, search=search, after_id=after_id),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="assets.{format}"'},
+    )
+
+
+@router.get(
+    "/availability",
+    response_model=AssetAvailabilityResponse,
+    summary="List which assets are free or booked for a delivery window.",
+    operation_id="get_assets_availability",
+    dependencies=[Depends(require_assets_feature)],
+)
+async def get_assets_availability(
     *,
-    limit: int = Query(20, ge=1, le=100, description="Maximum number of items to return"),
-    offset: int = Query(0, ge=0, description="Offset for pagination"),
-    search: str | None = Query(None, max_length=100, description="Case-insensitive match against tags"),
-    service: AssetsService = Depends(get_assets_service),
-) -> AssetListResponse:
-    return service.list_assets(limit=limit, offset=offset, search=search)
+    start: Annotated[datetime, Query(description="Window start (inclusive), ISO 8601")],
+    end: Annotated[datetime, Query(description="Window end (exclusive), ISO 8601")],
+    asset_type_id: Annotated[
+        int | None, Query(alias="type", ge=1, description="Only assets of this asset type")
+    ] = None,
+    instance_id: Annotated[int | None, Query(ge=1, description="Only assets of this instance")] = None,
+    service: Annotated[AsyncAvailabilityService, Depends(get_availability_service)],
+) -> AssetAvailabilityResponse:
+    if (start.tzinfo is None) != (end.tzinfo is None) or end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="end must be after start and both must share a timezone style",
+        )
+    return await service.check(
+        start=start, end=end, asset_type_id=asset_type_id, instance_id=instance_id
+    )
 
 
 @router.get(
@@ -42,14 +265,43 @@ async def list_assets(
     dependencies=[Depends(require_assets_feature)],
 )
 async def get_asset(
+    request: Request,
     *,
-    asset_id: int = Path(..., ge=1, description="Numeric asset identifier"),
-    service: AssetsService = Depends(get_assets_service),
-) -> AssetDetails:
-    result = service.get_asset(asset_id)
-    if result is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
-    return result
+    asset_id: Annotated[int, Path(ge=1, description="Numeric asset identifier")],
+    fields: Annotated[str | None, Query(max_length=500, description=FIELDS_DESCRIPTION)] = None,
+    service: Annotated[AsyncAssetsService, Depends(get_assets_service)],
+) -> AssetDetails | Response:
+    selected = _selected_fields(fields, AssetDetails)
+
+    async def render() -> BaseModel:
+        result = await service.get_asset(asset_id, fields=selected)
+        if result is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+        return result
+
+    return await _cached(request, render)
+
+
+@router.get(
+    "/{asset_id}/tree",
+    response_model=AssetTreeResponse,
+    summary="Retrieve the case/kit subtree of an asset and the cases containing it.",
+    operation_id="get_asset_tree",
+    dependencies=[Depends(require_assets_feature)],
+)
+async def get_asset_tree(
+    request: Request,
+    *,
+    asset_id: Annotated[int, Path(ge=1, description="Numeric asset identifier")],
+    service: Annotated[AsyncAssetsService, Depends(get_assets_service)],
+) -> AssetTreeResponse | Response:
+    async def render() -> BaseModel:
+        result = await service.get_asset_tree(asset_id)
+        if result is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+        return result
+
+    return await _cached(request, render)
 
 
 __all__ = ["router"]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.tenancy import require_tenant
+from app.db.async_session import get_async_db
+from app.feature_flags import ensure_feature
+from app.schemas.barcodes import BarcodeDetails, BarcodeScansBulkRequest, BarcodeScansBulkResponse
+from app.services.barcodes import AsyncBarcodesService
+
+router = APIRouter(prefix="/barcodes", tags=["barcodes"], dependencies=[Depends(require_tenant)])
+require_barcodes_feature = ensure_feature("barcodes_api")
+
+
+def get_barcodes_service(db: Annotated[AsyncSession, Depends(get_async_db)]) -> AsyncBarcodesService:
+    return AsyncBarcodesService.from_session(db)
+
+
+@router.post(
+    "/scans:bulk",
+    response_model=BarcodeScansBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Record a burst of barcode scans in one request.",
+    operation_id="ingest_barcode_scans",
+    dependencies=[Depends(require_barcodes_feature)],
+)
+async def ingest_barcode_scans(
+    payload: BarcodeScansBulkRequest,
+    service: Annotated[AsyncBarcodesService, Depends(get_barcodes_service)],
+) -> BarcodeScansBulkResponse:
+    max_scans = get_settings().barcode_scans_bulk_max
+    if len(payload.scans) > max_scans:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {max_scans} scans can be sent at once",
+        )
+    return await service.ingest_scans(payload.scans)
+
+
+@router.get(
+    "/{value}",
+    response_model=BarcodeDetails,
+    summary="Resolve a scanned barcode value to its asset.",
+    operation_id="get_barcode",
+    dependencies=[Depends(require_barcodes_feature)],
+)
+async def get_barcode(
+    value: Annotated[str, Path(min_length=1, max_length=500, description="Scanned barcode value")],
+    service: Annotated[AsyncBarcodesService, Depends(get_barcodes_service)],
+) -> BarcodeDetails:
+    barcode = await service.lookup(value)
+    if barcode is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Barcode not found")
+    return barcode
+
+
+__all__ = ["router"]
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from app.core.config import get_settings
+from app.feature_flags import ensure_feature
+from app.schemas.batch import BatchRequest, BatchResponse
+from app.services.batch import BatchService
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+require_batch_feature = ensure_feature("batch_api")
+
+
+def get_batch_service(request: Request) -> BatchService:
+    settings = get_settings()
+    return BatchService(
+        app=request.app,
+        parent=request.scope,
+        max_concurrency=settings.batch_max_concurrency,
+        max_item_bytes=settings.batch_max_item_bytes,
+        max_batch_bytes=settings.batch_max_response_bytes,
+    )
+
+
+@router.post(
+    "",
+    response_model=BatchResponse,
+    summary="Run several GET requests in one round trip.",
+    operation_id="run_batch",
+    dependencies=[Depends(require_batch_feature)],
+)
+async def run_batch(
+    payload: BatchRequest,
+    service: Annotated[BatchService, Depends(get_batch_service)],
+) -> Response:
+    """Each item gets its own status; the batch itself succeeds even when items fail."""
+
+    limit = get_settings().batch_max_requests
+    if len(payload.requests) > limit:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {limit} requests per batch",
+        )
+    return Response(content=await service.run(payload.requests), media_type="application/json")
+
+
+__all__ = ["router"]
@@ -4,6 +4,7 @@ from fastapi import APIRouter, status
 from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 
+from app.db.async_session import replica_router
 from app.services.health import get_health_status
 from app.monitoring.metrics import render_metrics
 
@@ -12,6 +13,12 @@ class HealthResponse(BaseModel):
     status: str
 
 
+class ReplicaHealth(BaseModel):
+    name: str
+    healthy: bool
+    in_use: int
+
+
 router = APIRouter(tags=["health"])
 
 
@@ -22,6 +29,17 @@ async def read_health() -> HealthResponse:
     return HealthResponse(status=get_health_status())
 
 
+@router.get("/health/replicas", response_model=list[ReplicaHealth], status_code=status.HTTP_200_OK)
+async def read_replica_health() -> list[ReplicaHealth]:
+    """Probe each read replica and report whether it is in rotation."""
+
+    await replica_router.check_health()
+    return [
+        ReplicaHealth(name=replica.name, healthy=replica.healthy, in_use=replica.in_use)
+        for replica in replica_router.replicas
+    ]
+
+
 @router.get("/metrics", response_class=PlainTextResponse)
 async def metrics() -> PlainTextResponse:
     """Expose Prometheus metrics."""
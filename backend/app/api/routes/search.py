@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.tenancy import require_tenant
+from app.db.async_session import get_async_db
+from app.feature_flags import ensure_feature
+from app.schemas.search import SEARCH_ENTITY_TYPES, SearchResponse, parse_search_types
+from app.services.search import AsyncSearchService
+
+router = APIRouter(prefix="/search", tags=["search"], dependencies=[Depends(require_tenant)])
+require_search_feature = ensure_feature("search_api")
+
+
+def get_search_service(db: Annotated[AsyncSession, Depends(get_async_db)]) -> AsyncSearchService:
+    return AsyncSearchService.from_session(db)
+
+
+@router.get(
+    "",
+    response_model=SearchResponse,
+    summary="Search assets, asset types, projects, clients and users at once.",
+    operation_id="global_search",
+    dependencies=[Depends(require_search_feature)],
+)
+async def global_search(
+    *,
+    q: Annotated[str, Query(min_length=1, max_length=200, description="Words to find; each matches as a prefix")],
+    limit: Annotated[int, Query(ge=1, description="Maximum hits, capped by APP_SEARCH_MAX_RESULTS")] = 20,
+    types: Annotated[
+        str | None, Query(description=f"Comma-separated subset of: {', '.join(SEARCH_ENTITY_TYPES)}")
+    ] = None,
+    instance_id: Annotated[
+        int | None, Query(ge=1, description="Only documents of this instance, plus shared ones")
+    ] = None,
+    service: Annotated[AsyncSearchService, Depends(get_search_service)],
+) -> SearchResponse:
+    try:
+        selected = parse_search_types(types) if types else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    limit = min(limit, get_settings().search_max_results)
+    return await service.search(q, limit=limit, types=selected, instance_id=instance_id)
+
+
+__all__ = ["router"]
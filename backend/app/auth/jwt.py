@@ -94,6 +94,7 @@ class JWTManager:
             session=str(decoded.get("session")) if decoded.get("session") else None,
             mfa=bool(decoded.get("mfa", False)),
             type=str(decoded.get("type", "access")),
+            instance_id=int(decoded["instance_id"]) if decoded.get("instance_id") is not None else None,
         )
 
 
@@ -90,6 +90,7 @@ class TokenPayload(BaseModel):
     session: str | None = None
     mfa: bool = False
     type: str = "access"
+    instance_id: int | None = None
 
 
 class TokenPair(BaseModel):
@@ -110,13 +110,19 @@ class AuthService:
         session_id: str | None = None,
         mfa_code: str | None = None,
         require_mfa: bool = False,
+        instance_id: int | None = None,
     ) -> TokenPair:
-        """Return an access/refresh token pair for ``user``."""
+        """Return an access/refresh token pair for ``user``.
+
+        Tokens issued with *instance_id* scope the API requests they
+        authorise to that instance.
+        """
 
         scopes_list = sorted(set(scopes or []))
         session = session_id or uuid.uuid4().hex
         mfa_verified = self._ensure_mfa(user, mfa_code, required=require_mfa)
         session_claim = session
+        instance_claim = {} if instance_id is None else {"instance_id": instance_id}
         access_jti = uuid.uuid4().hex
         refresh_metadata = self._refresh_store.new_metadata(
             user_id=user.id,
@@ -133,6 +139,7 @@ class AuthService:
                 "scope": scopes_list,
                 "mfa": mfa_verified,
                 "type": "refresh",
+                **instance_claim,
             },
             expires_delta=self._settings.refresh_token_ttl,
         )
@@ -145,6 +152,7 @@ class AuthService:
                 "scope": scopes_list,
                 "mfa": mfa_verified,
                 "type": "access",
+                **instance_claim,
             },
             expires_delta=self._settings.access_token_ttl,
         )
@@ -192,6 +200,7 @@ class AuthService:
             session_id=metadata.session,
             mfa_code=mfa_code if metadata.mfa else None,
             require_mfa=metadata.mfa,
+            instance_id=payload.instance_id,
         )
         self._record_security_event(
             "auth.session_refreshed",
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from fastapi import Request, Response, status
+
+from app.core.compression import compress, negotiate
+from app.core.config import get_settings
+from app.core.tenancy import current_instance_id
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Small thread-safe LRU cache whose entries expire after ``ttl_seconds``."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], V]) -> V:
+        """Return the cached value for *key*, computing it with *factory* on a miss."""
+
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """Serialized response body together with its strong validator."""
+
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+
+
+def compute_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def representation_etag(etag: str, encoding: str | None) -> str:
+    """Return the validator for *etag*'s body sent with *encoding*.
+
+    Each content coding is a different representation, so it gets its own
+    strong validator.
+    """
+
+    return etag if encoding is None else f'{etag[:-1]}-{encoding}"'
+
+
+def _build_compressed_cache() -> TTLCache[bytes]:
+    settings = get_settings()
+    return TTLCache(
+        ttl_seconds=settings.compressed_cache_ttl_seconds,
+        max_entries=settings.compressed_cache_max_entries,
+    )
+
+
+# Compressed bodies keyed by (path, query, ETag, encoding). The ETag pins the
+# uncompressed content, so entries never need invalidating, only expiring.
+compressed_cache: TTLCache[bytes] = _build_compressed_cache()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return True when an ``If-None-Match`` header matches *etag*."""
+
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+async def conditional_response(
+    request: Request,
+    cache: TTLCache[CachedResponse],
+    *,
+    version: str,
+    render: Callable[[], Awaitable[bytes]],
+) -> Response:
+    """Serve *render*'s output through *cache*, answering 304 when validators match.
+
+    The cache key pairs the request URL and tenant with *version*, which
+    callers capture before rendering so a body built from pre-write data is
+    never reused. Bodies large enough to compress are served in the coding
+    negotiated from ``Accept-Encoding``, compressed once per ETag and coding
+    through :data:`compressed_cache`.
+    """
+
+    key = (
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+        current_instance_id(),
+        version,
+    )
+    cached = cache.get(key)
+    if cached is None:
+        body = await render()
+        cached = CachedResponse(body=body, etag=compute_etag(body))
+        cache.set(key, cached)
+    encoding = None
+    if len(cached.body) >= get_settings().compression_min_size:
+        encoding = negotiate(request.headers.get("accept-encoding"))
+    etag = representation_etag(cached.etag, encoding)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    # A validator from either coding proves the client holds the current content.
+    if etag_matches(if_none_match, etag) or etag_matches(if_none_match, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if encoding is None:
+        return Response(content=cached.body, media_type=cached.media_type, headers=headers)
+    body = compressed_cache.get_or_set(
+        (key[0], key[1], cached.etag, encoding), lambda: compress(cached.body, encoding)
+    )
+    headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=cached.media_type, headers=headers)
+
+
+__all__ = [
+    "TTLCache",
+    "CachedResponse",
+    "compressed_cache",
+    "compute_etag",
+    "etag_matches",
+    "representation_etag",
+    "conditional_response",
+]
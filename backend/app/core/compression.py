@@ -0,0 +1,225 @@
+"""Content-coding negotiation, compressors and the compression middleware.
+
+gzip is always available; brotli and zstd are offered when the ``brotli`` and
+``zstandard`` packages are installed. Cacheable GET bodies are compressed once
+per representation by :func:`app.core.caching.conditional_response`;
+:class:`CompressionMiddleware` compresses the remaining single-message
+responses on the fly. Streaming responses get one compressor each that is
+flushed after every chunk, so exports are compressed without being held back.
+"""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ModuleNotFoundError:  # pragma: no cover - fallback when brotli isn't installed
+    HAS_BROTLI = False
+else:
+    HAS_BROTLI = True
+
+try:
+    import zstandard
+except ModuleNotFoundError:  # pragma: no cover - fallback when zstandard isn't installed
+    HAS_ZSTD = False
+else:
+    HAS_ZSTD = True
+
+# Levels favour speed: bodies compressed per request must stay cheap, and even
+# cached ones are compressed on the request that first misses.
+_GZIP_LEVEL = 6
+_BROTLI_QUALITY = 5
+_ZSTD_LEVEL = 6
+_EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+
+class StreamCompressor(Protocol):
+    """Compresses one response body as it is sent, chunk by chunk."""
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress *data* and flush it, so the client can decode it right away."""
+
+    def finish(self) -> bytes:
+        """End the stream."""
+
+
+class _GzipStream:
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=_BROTLI_QUALITY)
+
+    def chunk(self, data: bytes) -> bytes:
+        return bytes(self._compressor.process(data) + self._compressor.flush())
+
+    def finish(self) -> bytes:
+        return bytes(self._compressor.finish())
+
+
+class _ZstdStream:
+    def __init__(self) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return bytes(self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK))
+
+    def finish(self) -> bytes:
+        return bytes(self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH))
+
+
+@dataclass(frozen=True, slots=True)
+class Codec:
+    name: str
+    compress: Callable[[bytes], bytes]
+    stream: Callable[[], StreamCompressor]
+
+
+def _codecs() -> dict[str, Codec]:
+    # Listed in server preference order, used to break ties between equal q-values.
+    codecs: dict[str, Codec] = {}
+    if HAS_ZSTD:
+        # Compressor objects are not thread-safe, so each call gets its own.
+        codecs["zstd"] = Codec(
+            "zstd", lambda body: zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(body), _ZstdStream
+        )
+    if HAS_BROTLI:
+        codecs["br"] = Codec("br", lambda body: brotli.compress(body, quality=_BROTLI_QUALITY), _BrotliStream)
+    codecs["gzip"] = Codec(
+        "gzip", lambda body: gzip.compress(body, compresslevel=_GZIP_LEVEL, mtime=0), _GzipStream
+    )
+    return codecs
+
+
+CODECS: dict[str, Codec] = _codecs()
+
+
+def negotiate(accept_encoding: str | None, codecs: dict[str, Codec] = CODECS) -> str | None:
+    """Pick the content coding for an ``Accept-Encoding`` header, ``None`` for identity."""
+
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in codecs:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    return CODECS[encoding].compress(body)
+
+
+class CompressionMiddleware:
+    """Compress responses with the negotiated coding.
+
+    Responses that already carry ``Content-Encoding`` (precompressed cached
+    bodies), event streams and single-message bodies under *minimum_size* pass
+    through unchanged. Streaming responses are compressed chunk by chunk and
+    never buffered; their size is unknown up front, so *minimum_size* does
+    not apply to them.
+    """
+
+    def __init__(self, app: ASGIApp, *, minimum_size: int) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        passthrough = False
+        stream: StreamCompressor | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough, stream
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                passthrough = "content-encoding" in headers or headers.get("content-type", "").startswith(
+                    _EXCLUDED_CONTENT_TYPES
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is not None:
+                data = stream.chunk(body) if body else b""
+                if not more_body:
+                    data += stream.finish()
+                await send({**message, "body": data})
+                return
+            assert start is not None
+            if not more_body and len(body) < self.minimum_size:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            headers["Content-Encoding"] = encoding
+            if more_body:
+                # The first of several chunks: compress the rest as it arrives.
+                del headers["Content-Length"]
+                stream = CODECS[encoding].stream()
+                await send(start)
+                await send({**message, "body": stream.chunk(body)})
+                return
+            compressed = compress(body, encoding)
+            headers["Content-Length"] = str(len(compressed))
+            await send(start)
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+
+__all__ = [
+    "CODECS",
+    "Codec",
+    "CompressionMiddleware",
+    "HAS_BROTLI",
+    "HAS_ZSTD",
+    "StreamCompressor",
+    "compress",
+    "negotiate",
+]
@@ -46,6 +46,57 @@ class Settings(BaseSettings):
     celery_beat_schedule_path: str = "backend/app/integrations/schedule.py"
     integration_modes: dict[str, str] = Field(default_factory=dict)
     queue_fallback_enabled: bool = True
+    assets_count_cache_ttl_seconds: float = 30.0
+    assets_count_cache_max_entries: int = 1024
+    asset_search_backend: Literal["auto", "like", "trigram", "fts5"] = "auto"
+    assets_batch_max_ids: int = 500
+    assets_batch_chunk_size: int = 100
+    assets_response_cache_ttl_seconds: float = 60.0
+    assets_response_cache_max_entries: int = 512
+    assets_export_batch_size: int = 1000
+    assets_tree_max_depth: int = 32
+    assets_closure_enabled: bool = False
+    availability_check_interval_seconds: float = 5.0
+    availability_max_age_seconds: float = 300.0
+    barcode_cache_ttl_seconds: float = 300.0
+    barcode_cache_max_entries: int = 50000
+    barcode_scans_bulk_max: int = 1000
+    finance_cache_enabled: bool = True
+    search_index_enabled: bool = True
+    search_max_results: int = 50
+    tenant_header: str = "X-Instance-Id"
+    tenant_header_trusted: bool = False
+    tenant_required: bool = True
+    batch_max_requests: int = 20
+    batch_max_concurrency: int = 8
+    batch_max_item_bytes: int = 1_048_576
+    batch_max_response_bytes: int = 8_388_608
+    compression_min_size: int = 512
+    compressed_cache_ttl_seconds: float = 300.0
+    compressed_cache_max_entries: int = 512
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 0
+    sqlite_connection_strategy: Literal["pool", "per_thread"] = "pool"
+    sqlite_journal_mode: Literal["wal", "delete", "truncate", "persist"] = "wal"
+    sqlite_synchronous: Literal["off", "normal", "full"] = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 268_435_456
+    database_replica_urls: list[str] = Field(default_factory=list)
+    replica_selection: Literal["round_robin", "least_connections"] = "round_robin"
+    replica_read_your_writes_seconds: float = 5.0
+    replica_health_check_interval_seconds: float = 10.0
+    replica_health_check_timeout_seconds: float = 2.0
+    statement_cache_max_entries: int = 256
+    slow_query_threshold_ms: float = 500.0
+    slow_query_log_path: str = Field(default="backend/var/slow_queries.jsonl")
+    slow_query_explain: bool = False
+    slow_query_log_parameters: bool = False
+    query_repeat_warning_threshold: int = 5
+    etl_batch_size: int = 1000
 
     @property
     def access_token_ttl(self) -> timedelta:
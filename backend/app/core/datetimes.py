@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Normalise *value* to the naive UTC datetimes the database returns."""
+
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+__all__ = ["to_naive_utc"]
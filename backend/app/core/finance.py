@@ -0,0 +1,108 @@
+"""Equipment totals for projects, ported from the PHP ``projectFinance`` helpers.
+
+Each line is one live assignment: ``(projects_id, day_rate, week_rate, value,
+mass, custom_price, discount)`` with money in pence and ``discount`` a
+percentage. A project is charged for a number of days and weeks
+(:func:`hire_period`, ``projectFinance::durationMaths``). A line costs its
+custom price when one is set, otherwise ``days * day_rate + weeks *
+week_rate``. A discount of ``d`` percent charges ``price * (1 - d / 100)``
+rounded half up, as moneyphp's ``Money::multiply`` does, and the discount is
+whatever that takes off the price (``src/api/projects/data.php``).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Iterable, Mapping, Sequence
+
+Line = Sequence[Any]
+# (weeks, days) charged for a project.
+Period = tuple[int, int]
+
+# PHP's strtotime() reads a missing date as false, which date() renders as the epoch.
+_EPOCH = datetime(1970, 1, 1)
+_MASS_PLACES = 5
+
+
+def hire_period(
+    start: datetime | None,
+    end: datetime | None,
+    *,
+    finance_days: int | None = None,
+    finance_weeks: int | None = None,
+) -> Period:
+    """Return the ``(weeks, days)`` a project is charged for.
+
+    The ``projects_dates_finances_*`` overrides win when both are set.
+    Otherwise PHP counts ``ceil((end 23:59:59 - start 00:00:00) / 86400)``
+    days, at least one, and no weeks: every calendar day from the start date
+    through the end date.
+    """
+
+    if finance_days is not None and finance_weeks is not None:
+        return (finance_weeks, finance_days)
+    first, last = (start or _EPOCH).date(), (end or _EPOCH).date()
+    return (0, max(1, (last - first).days + 1))
+
+
+def line_price(weeks: int, days: int, day_rate: Any, week_rate: Any, custom_price: Any) -> int:
+    """Price one assignment before its discount."""
+
+    if custom_price:
+        return int(custom_price)
+    return days * int(day_rate or 0) + weeks * int(week_rate or 0)
+
+
+def line_discount(price: int, discount: Any) -> int:
+    """Amount a *discount* percentage takes off *price*."""
+
+    if not discount or discount <= 0:
+        return 0
+    # moneyphp's Number::fromFloat renders the multiplier with sprintf('%.14F') before bcmul.
+    multiplier = Decimal(format(1 - float(discount) / 100, ".14f"))
+    return price - int((price * multiplier).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+@dataclass(frozen=True)
+class ProjectTotals:
+    projects_id: int
+    subtotal: int = 0
+    discounts: int = 0
+    value: int = 0
+    mass: Decimal = Decimal(0)
+
+    @property
+    def total(self) -> int:
+        return self.subtotal - self.discounts
+
+
+def compute_totals(lines: Sequence[Line], periods: Mapping[int, Period]) -> dict[int, ProjectTotals]:
+    """Total *lines* per project; projects without lines are absent from the result."""
+
+    # Deliberately per line in integer pence: each discount is rounded half up
+    # on its own line, as moneyphp does, which float arrays with np.rint
+    # (half to even) got wrong by a penny on ``.5`` results.
+    sums: dict[int, list[Any]] = {}
+    for project, day_rate, week_rate, value, mass, custom, discount in lines:
+        weeks, days = periods.get(project, (0, 0))
+        price = line_price(weeks, days, day_rate, week_rate, custom)
+        totals = sums.setdefault(project, [0, 0, 0, 0.0])
+        totals[0] += price
+        totals[1] += line_discount(price, discount)
+        totals[2] += int(value or 0)
+        totals[3] += float(mass or 0)
+    return {
+        project: ProjectTotals(project, subtotal, discounts, value, Decimal(str(round(mass, _MASS_PLACES))))
+        for project, (subtotal, discounts, value, mass) in sums.items()
+    }
+
+
+def totals_for(project_ids: Iterable[int], computed: Mapping[int, ProjectTotals]) -> list[ProjectTotals]:
+    """Totals for every id in *project_ids*, zeroed for projects with no lines."""
+
+    return [computed.get(project_id) or ProjectTotals(project_id) for project_id in project_ids]
+
+
+__all__ = ["ProjectTotals", "compute_totals", "hire_period", "line_discount", "line_price", "totals_for"]
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Any, Iterable
+
+
+class SortedIntervals:
+    """Static set of half-open ``[start, end)`` intervals with O(log n) overlap checks.
+
+    Intervals are kept sorted by start next to a running maximum of their ends:
+    the candidates for ``[start, end)`` are those starting before *end*, and one
+    of them overlaps exactly when the largest of their ends is after *start*.
+    Rebuild the instance when intervals change; it is cheap for the handful of
+    bookings a single asset carries.
+    """
+
+    __slots__ = ("_starts", "_max_ends")
+
+    def __init__(self, intervals: Iterable[tuple[Any, Any]] = ()) -> None:
+        ordered = sorted(interval for interval in intervals if interval[0] < interval[1])
+        self._starts = [start for start, _ in ordered]
+        self._max_ends = list(accumulate((end for _, end in ordered), max))
+
+    def overlaps(self, start: Any, end: Any) -> bool:
+        candidates = bisect_left(self._starts, end)
+        return candidates > 0 and self._max_ends[candidates - 1] > start
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+
+__all__ = ["SortedIntervals"]
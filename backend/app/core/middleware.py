@@ -1,11 +1,31 @@
 from __future__ import annotations
 
+from typing import Callable
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
-from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
+from app.core.compression import CompressionMiddleware
 from app.core.config import Settings
+from app.core.query_stats import QueryStatsMiddleware
+from app.auth.jwt import JWTDecodingError, JWTManager
+from app.core.tenancy import TenantScopeMiddleware
+
+
+def token_instance(settings: Settings) -> Callable[[str], int | None]:
+    """Read the ``instance_id`` claim of a verified access token."""
+
+    tokens = JWTManager(settings.jwt_secret_key, algorithm=settings.jwt_algorithm, issuer=settings.jwt_issuer)
+
+    def instance_id(token: str) -> int | None:
+        try:
+            payload = tokens.decode(token)
+        except JWTDecodingError as exc:
+            raise ValueError("Invalid bearer token") from exc
+        return payload.instance_id if payload.type == "access" else None
+
+    return instance_id
 
 
 def register_middleware(app: FastAPI, settings: Settings) -> None:
@@ -19,10 +39,19 @@ def register_middleware(app: FastAPI, settings: Settings) -> None:
         allow_headers=["*"],
         max_age=600,
     )
-    app.add_middleware(GZipMiddleware, minimum_size=512)
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_size)
+    app.add_middleware(
+        TenantScopeMiddleware,
+        header=settings.tenant_header,
+        token_instance=token_instance(settings),
+    )
+    app.add_middleware(
+        QueryStatsMiddleware,
+        repeat_threshold=settings.query_repeat_warning_threshold if settings.is_debug else 0,
+    )
 
     trusted_hosts = ["*"] if "*" in settings.cors_origins else ["localhost", "127.0.0.1"]
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=trusted_hosts)
 
 
-__all__ = ["register_middleware"]
+__all__ = ["register_middleware", "token_instance"]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+
+from fastapi import status
+
+from app.core.exceptions import ApplicationError
+
+
+class InvalidCursorError(ApplicationError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self, message: str = "Invalid pagination cursor") -> None:
+        super().__init__(message, status_code=status.HTTP_400_BAD_REQUEST)
+
+
+def encode_cursor(last_id: int) -> str:
+    """Return an opaque cursor pointing just past *last_id*."""
+
+    raw = json.dumps({"after": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Return the last seen identifier encoded in *cursor*."""
+
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise InvalidCursorError() from exc
+    if not isinstance(payload, dict):
+        raise InvalidCursorError()
+    last_id = payload.get("after")
+    if not isinstance(last_id, int) or isinstance(last_id, bool) or last_id < 0:
+        raise InvalidCursorError()
+    return last_id
+
+
+__all__ = ["InvalidCursorError", "encode_cursor", "decode_cursor"]
@@ -0,0 +1,106 @@
+"""Per-request database query statistics.
+
+:class:`QueryStatsMiddleware` gives each request a :class:`QueryStats` in a
+context variable; :mod:`app.db.instrumentation` adds every statement the
+request's engines run to it, including statements run from the threadpool
+and the async session's greenlets. When the response starts, the count and
+total database time go out in a ``Server-Timing`` header. When the request
+ends they are recorded as metrics. In debug mode, a warning names any
+statement repeated often enough to look like an N+1 loop.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import structlog
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.monitoring.metrics import record_request_queries
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """Statements run on behalf of one request."""
+
+    route: str = ""
+    count: int = 0
+    duration_seconds: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, duration_seconds: float) -> None:
+        self.count += 1
+        self.duration_seconds += duration_seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least *threshold* times, most frequent first."""
+
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration_seconds * 1000:.2f};desc="{self.count} queries"'
+
+
+_current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    """Return the statistics of the request being served, if any."""
+
+    return _current_query_stats.get()
+
+
+@contextmanager
+def query_stats_scope(route: str = "") -> Iterator[QueryStats]:
+    """Collect the statements run inside the block into a fresh :class:`QueryStats`."""
+
+    stats = QueryStats(route=route)
+    token = _current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_query_stats.reset(token)
+
+
+class QueryStatsMiddleware:
+    """Count each request's queries and report them in ``Server-Timing`` and metrics.
+
+    With *repeat_threshold* above zero, statements run that many times in one
+    request are logged as a suspected N+1 pattern.
+    """
+
+    def __init__(self, app: ASGIApp, *, repeat_threshold: int = 0) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        with query_stats_scope(f"{method} {scope['path']}") as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                record_request_queries(method, stats.count, stats.duration_seconds)
+                if self.repeat_threshold > 0:
+                    for statement, count in stats.repeated(self.repeat_threshold):
+                        logger.warning("n_plus_one_suspected", route=stats.route, count=count, statement=statement)
+
+
+__all__ = ["QueryStats", "QueryStatsMiddleware", "current_query_stats", "query_stats_scope"]
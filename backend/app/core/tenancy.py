@@ -0,0 +1,129 @@
+"""Request-scoped tenant (instance) context.
+
+The instance a request acts for lives in a context variable, so everything the
+request runs (dependencies, services, sync code in the threadpool and the async
+session's greenlets) sees it without it being threaded through every call.
+:mod:`app.db.tenancy` turns it into ORM criteria; caches fold it into their
+keys so one tenant never reads another's entries.
+"""
+
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+from fastapi import HTTPException, status
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+_current_instance_id: ContextVar[int | None] = ContextVar("current_instance_id", default=None)
+
+
+def current_instance_id() -> int | None:
+    """Return the instance the current request is scoped to, if any."""
+
+    return _current_instance_id.get()
+
+
+@contextmanager
+def tenant_scope(instance_id: int | None) -> Iterator[None]:
+    """Scope ORM queries run inside the block to *instance_id*; ``None`` lifts the scope."""
+
+    token = _current_instance_id.set(instance_id)
+    try:
+        yield
+    finally:
+        _current_instance_id.reset(token)
+
+
+def parse_instance_id(raw: str) -> int:
+    """Parse a tenant header value, rejecting anything but a positive integer."""
+
+    if not raw.isascii() or not raw.isdigit() or int(raw) < 1:
+        raise ValueError(f"Invalid instance id {raw!r}")
+    return int(raw)
+
+
+def require_tenant() -> None:
+    """FastAPI dependency refusing unscoped requests while ``APP_TENANT_REQUIRED`` is on."""
+
+    if current_instance_id() is None and get_settings().tenant_required:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This request must be scoped to an instance",
+        )
+
+
+class TenantScopeMiddleware:
+    """Scope each request to the instance it is authorised for.
+
+    The instance is the one *token_instance* reads from the request's bearer
+    token; it raises ``ValueError`` for a token that does not verify, which is
+    answered with 401. *header* is only honoured while
+    ``APP_TENANT_HEADER_TRUSTED`` is on, for deployments whose gateway sets it
+    and drops any client-sent copy; a malformed value is answered with 400.
+    Requests naming no instance run unscoped, and :func:`require_tenant` keeps
+    them away from tenant data.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        header: str,
+        token_instance: Callable[[str], int | None] | None = None,
+    ) -> None:
+        self.app = app
+        self.header = header.lower().encode("latin-1")
+        self.token_instance = token_instance
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        instance_id = None
+        token = _bearer_token(scope["headers"])
+        if token is not None and self.token_instance is not None:
+            try:
+                instance_id = self.token_instance(token)
+            except ValueError as exc:
+                await _error(send, 401, str(exc))
+                return
+        raw = next((value for name, value in scope["headers"] if name == self.header), None)
+        if instance_id is None and raw is not None and get_settings().tenant_header_trusted:
+            try:
+                instance_id = parse_instance_id(raw.decode("latin-1").strip())
+            except ValueError as exc:
+                await _error(send, 400, str(exc))
+                return
+        with tenant_scope(instance_id):
+            await self.app(scope, receive, send)
+
+
+def _bearer_token(headers: list[tuple[bytes, bytes]]) -> str | None:
+    raw = next((value for name, value in headers if name == b"authorization"), None)
+    if raw is None:
+        return None
+    scheme, _, token = raw.decode("latin-1").partition(" ")
+    token = token.strip()
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token
+
+
+async def _error(send: Send, status_code: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+__all__ = ["TenantScopeMiddleware", "current_instance_id", "parse_instance_id", "require_tenant", "tenant_scope"]
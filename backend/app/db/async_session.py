@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import AsyncGenerator
+
+from fastapi import Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.db.replicas import REPLICA_READS, Replica, ReplicaRouter, RoutingSession
+from app.db.session import configure_engine, default_database_url, engine_options
+
+# Async driver used for each sync backend; psycopg 3 serves both modes.
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "psycopg",
+}
+
+
+def to_async_url(database_url: str) -> str:
+    """Return *database_url* rewritten to use the async driver for its backend."""
+
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()!r}")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+_READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+def build_async_engine(database_url: str, *, name: str = "async") -> AsyncEngine:
+    """Create an async engine with the same pool and connection settings as the sync one."""
+
+    settings = get_settings()
+    async_url = to_async_url(database_url)
+    async_engine = create_async_engine(async_url, **engine_options(async_url, settings, is_async=True))
+    configure_engine(async_engine.sync_engine, settings, name=name)
+    return async_engine
+
+
+def build_replica_router() -> ReplicaRouter:
+    """Create the router over the replicas listed in ``database_replica_urls``."""
+
+    settings = get_settings()
+    replicas = [
+        Replica(f"replica-{position}", build_async_engine(url, name=f"replica-{position}"))
+        for position, url in enumerate(settings.database_replica_urls)
+    ]
+    return ReplicaRouter(
+        replicas,
+        selection=settings.replica_selection,
+        read_your_writes_seconds=settings.replica_read_your_writes_seconds,
+        health_check_interval_seconds=settings.replica_health_check_interval_seconds,
+        health_check_timeout_seconds=settings.replica_health_check_timeout_seconds,
+    )
+
+
+async_engine = build_async_engine(default_database_url)
+replica_router = build_replica_router()
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    router=replica_router,
+)
+# Same as AsyncSessionLocal, but reads may be served by a replica.
+ReadSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    router=replica_router,
+    info={REPLICA_READS: True},
+)
+
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    if request.method in _READ_METHODS:
+        await replica_router.maybe_check_health()
+        session_factory = ReadSessionLocal
+    else:
+        session_factory = AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+
+__all__ = [
+    "async_engine",
+    "AsyncSessionLocal",
+    "ReadSessionLocal",
+    "build_async_engine",
+    "build_replica_router",
+    "get_async_db",
+    "replica_router",
+    "to_async_url",
+]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import threading
+from itertools import chain
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+from app.models.derived import AssetCurrentLocation
+from app.models.generated import Assets, AssetsBarcodes, AssetTypes
+
+_UNKNOWN = object()
+
+
+class ChangeTracker:
+    """In-process change counters for one model, bumped when writes commit.
+
+    ``version()`` is global; ``version(instance_id)`` only moves when rows of
+    that instance change or when a bulk statement makes the instance unknown.
+    Counters are per process, so they only observe writes made by this worker.
+    """
+
+    def __init__(self, model: type[Any], *, instance_attr: str = "instances_id") -> None:
+        self.model = model
+        self.instance_attr = instance_attr
+        self._info_key = f"pending_changes:{model.__name__}"
+        self._global = 0
+        self._epoch = 0
+        self._per_instance: dict[int, int] = {}
+        self._subscribers: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def version(self, instance_id: int | None = None) -> str:
+        with self._lock:
+            if instance_id is None:
+                return str(self._global)
+            return f"{self._epoch}.{self._per_instance.get(instance_id, 0)}"
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """Call *callback* after every committed change."""
+
+        self._subscribers.append(callback)
+
+    def bump(self, instance_ids: set[Any]) -> None:
+        with self._lock:
+            self._global += 1
+            for instance_id in instance_ids:
+                if instance_id is _UNKNOWN or instance_id is None:
+                    self._epoch += 1
+                else:
+                    self._per_instance[instance_id] = self._per_instance.get(instance_id, 0) + 1
+        for callback in self._subscribers:
+            callback()
+
+    def watch(self) -> None:
+        """Register session listeners; affects every ``Session``, sync or async."""
+
+        event.listen(Session, "after_flush", self._after_flush)
+        event.listen(Session, "do_orm_execute", self._do_orm_execute)
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+    def _pending(self, session: Session) -> set[Any]:
+        pending: set[Any] = session.info.setdefault(self._info_key, set())
+        return pending
+
+    def _after_flush(self, session: Session, flush_context: UOWTransaction) -> None:
+        for obj in chain(session.new, session.dirty, session.deleted):
+            if isinstance(obj, self.model):
+                # Read the loaded state directly so expired or deleted rows never lazy-load.
+                self._pending(session).add(vars(obj).get(self.instance_attr, _UNKNOWN))
+
+    def _do_orm_execute(self, state: ORMExecuteState) -> None:
+        if not (state.is_insert or state.is_update or state.is_delete):
+            return
+        mapper = state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, self.model):
+            self._pending(state.session).add(_UNKNOWN)
+
+    def _after_commit(self, session: Session) -> None:
+        pending = session.info.pop(self._info_key, None)
+        if pending:
+            self.bump(pending)
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(self._info_key, None)
+
+
+asset_changes = ChangeTracker(Assets)
+asset_changes.watch()
+asset_type_changes = ChangeTracker(AssetTypes)
+asset_type_changes.watch()
+barcode_changes = ChangeTracker(AssetsBarcodes)
+barcode_changes.watch()
+location_changes = ChangeTracker(AssetCurrentLocation)
+location_changes.watch()
+
+
+def asset_view_version() -> str:
+    """Version of everything asset responses render: assets, their types' rates and locations."""
+
+    return f"{asset_changes.version()}:{asset_type_changes.version()}:{location_changes.version()}"
+
+
+__all__ = [
+    "ChangeTracker",
+    "asset_changes",
+    "asset_type_changes",
+    "asset_view_version",
+    "barcode_changes",
+    "location_changes",
+]
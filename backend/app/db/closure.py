@@ -0,0 +1,142 @@
+"""Maintenance of the ``assetsClosure`` table.
+
+When ``APP_ASSETS_CLOSURE_ENABLED`` is set, a flush listener mirrors every ORM
+insert, delete and ``assets_linkedTo`` change into the closure within the same
+transaction. Writes that bypass the ORM (bulk statements, the legacy PHP
+application) are not seen; run ``python -m app.db.closure`` to rebuild.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from typing import Any
+
+from sqlalchemy import Connection, Select, create_engine, delete, event, insert, inspect, literal, select, true
+from sqlalchemy.orm import Session, UOWTransaction, aliased
+
+from app.core.config import get_settings
+from app.models.derived import AssetsClosure
+from app.models.generated import Assets
+
+
+def _subtree(asset_id: int) -> Any:
+    return select(AssetsClosure.descendant_id).where(AssetsClosure.ancestor_id == asset_id)
+
+
+def detach(connection: Connection, asset_id: int, *, keep_self: bool = True) -> None:
+    """Unlink the subtree rooted at *asset_id* from all of its ancestors.
+
+    With ``keep_self=False`` the asset's own rows go too, as when it is deleted;
+    its children then become roots.
+    """
+
+    ancestors: Select[int] = select(AssetsClosure.ancestor_id).where(AssetsClosure.descendant_id == asset_id)
+    if keep_self:
+        ancestors = ancestors.where(AssetsClosure.ancestor_id != asset_id)
+    connection.execute(
+        delete(AssetsClosure).where(
+            AssetsClosure.descendant_id.in_(_subtree(asset_id)),
+            AssetsClosure.ancestor_id.in_(ancestors),
+        )
+    )
+
+
+def attach(connection: Connection, asset_id: int, parent_id: int) -> None:
+    """Link the subtree rooted at *asset_id* below *parent_id* and its ancestors."""
+
+    if connection.execute(_subtree(asset_id).where(AssetsClosure.descendant_id == parent_id)).first():
+        raise ValueError(f"Linking asset {asset_id} to {parent_id} would create a cycle")
+    above = aliased(AssetsClosure)
+    below = aliased(AssetsClosure)
+    connection.execute(
+        insert(AssetsClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+            .join_from(above, below, true())
+            .where(above.descendant_id == parent_id, below.ancestor_id == asset_id),
+        )
+    )
+
+
+def rebuild(connection: Connection) -> int:
+    """Recompute the whole closure from ``assets_linkedTo``; return the row count."""
+
+    assets = Assets.__table__
+    max_depth = get_settings().assets_tree_max_depth
+    paths = select(
+        assets.c.assets_id.label("ancestor_id"),
+        assets.c.assets_id.label("descendant_id"),
+        literal(0).label("depth"),
+    ).cte("paths", recursive=True)
+    paths = paths.union_all(
+        select(paths.c.ancestor_id, assets.c.assets_id, paths.c.depth + 1)
+        .join_from(assets, paths, assets.c.assets_linkedTo == paths.c.descendant_id)
+        .where(paths.c.depth < max_depth)
+    )
+    connection.execute(delete(AssetsClosure))
+    result = connection.execute(
+        insert(AssetsClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(paths.c.ancestor_id, paths.c.descendant_id, paths.c.depth),
+        )
+    )
+    return result.rowcount
+
+
+def _after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    if not get_settings().assets_closure_enabled:
+        return
+    connection = session.connection()
+    for obj in session.deleted:
+        if isinstance(obj, Assets):
+            # The row is gone, so read the id from the identity key rather than the instance.
+            identity = inspect(obj).identity
+            if identity is not None:
+                detach(connection, identity[0], keep_self=False)
+    for obj in session.new:
+        if isinstance(obj, Assets):
+            connection.execute(
+                insert(AssetsClosure).values(ancestor_id=obj.assets_id, descendant_id=obj.assets_id, depth=0)
+            )
+    for obj in (*session.new, *session.dirty):
+        if not isinstance(obj, Assets) or obj in session.deleted:
+            continue
+        attrs = inspect(obj).attrs
+        if obj not in session.new and not attrs.assets_linkedTo.history.has_changes():
+            continue
+        asset_id, parent_id = attrs.assets_id.value, attrs.assets_linkedTo.value
+        if obj not in session.new:
+            detach(connection, asset_id)
+        if parent_id is not None:
+            attach(connection, asset_id, parent_id)
+
+
+def watch() -> None:
+    """Register the flush listener; it is a no-op while the closure is disabled."""
+
+    event.listen(Session, "after_flush", _after_flush)
+
+
+watch()
+
+__all__ = ["attach", "detach", "rebuild", "watch", "main"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the assetsClosure table from assets_linkedTo.")
+    parser.add_argument(
+        "--database-url",
+        dest="database_url",
+        default=os.environ.get("APP_DATABASE_URL", get_settings().database_url),
+    )
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, future=True)
+    with engine.begin() as connection:
+        rows = rebuild(connection)
+    print(f"Rebuilt assetsClosure with {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Backfill of the ``asset_current_location`` projection.
+
+Scan ingestion keeps the projection current; this module rebuilds it from the
+full scan history, e.g. after deploying the table or after scans were written
+by the legacy application. Run it with ``python -m app.db.current_location``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+from sqlalchemy import Connection, create_engine, delete, func, insert, select
+
+from app.core.config import get_settings
+from app.models.derived import AssetCurrentLocation
+from app.models.generated import AssetsBarcodes, AssetsBarcodesScans, LocationsBarcodes
+
+PROJECTED_COLUMNS = (
+    "assets_id",
+    "assetsBarcodes_id",
+    "scanned_at",
+    "locations_id",
+    "location_assets_id",
+    "custom_location",
+)
+
+
+def rebuild(connection: Connection) -> int:
+    """Replace the projection with the latest scan of every asset; return the row count."""
+
+    scans = AssetsBarcodesScans
+    ranked = (
+        select(
+            AssetsBarcodes.assets_id,
+            scans.assetsBarcodes_id,
+            scans.assetsBarcodesScans_timestamp.label("scanned_at"),
+            LocationsBarcodes.locations_id,
+            scans.location_assets_id,
+            scans.assetsBarcodes_customLocation.label("custom_location"),
+            func.row_number()
+            .over(
+                partition_by=AssetsBarcodes.assets_id,
+                order_by=(scans.assetsBarcodesScans_timestamp.desc(), scans.assetsBarcodesScans_id.desc()),
+            )
+            .label("position"),
+        )
+        .join(AssetsBarcodes, AssetsBarcodes.assetsBarcodes_id == scans.assetsBarcodes_id)
+        .outerjoin(LocationsBarcodes, LocationsBarcodes.locationsBarcodes_id == scans.locationsBarcodes_id)
+        .where(AssetsBarcodes.assets_id.is_not(None))
+        .subquery("ranked")
+    )
+    connection.execute(delete(AssetCurrentLocation))
+    result = connection.execute(
+        insert(AssetCurrentLocation).from_select(
+            list(PROJECTED_COLUMNS),
+            select(*(ranked.c[name] for name in PROJECTED_COLUMNS)).where(ranked.c.position == 1),
+        )
+    )
+    return result.rowcount
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild asset_current_location from barcode scan history.")
+    parser.add_argument(
+        "--database-url",
+        dest="database_url",
+        default=os.environ.get("APP_DATABASE_URL", get_settings().database_url),
+    )
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, future=True)
+    with engine.begin() as connection:
+        rows = rebuild(connection)
+    print(f"Rebuilt asset_current_location with {rows} rows")
+
+
+__all__ = ["PROJECTED_COLUMNS", "rebuild", "main"]
+
+
+if __name__ == "__main__":
+    main()
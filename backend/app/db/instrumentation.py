@@ -0,0 +1,181 @@
+"""Statement timing, per-request query statistics and the slow-query log.
+
+Engine-wide cursor events time every statement on every engine (primary,
+async and replicas). Each statement is added to the current request's
+:class:`app.core.query_stats.QueryStats`. Statements slower than
+``slow_query_threshold_ms`` are appended to the JSONL file at
+``slow_query_log_path`` by a background thread, so the request never waits on
+the file. Bound parameters can hold personal data and are only logged while
+``slow_query_log_parameters`` is on.
+
+With ``slow_query_explain`` on, entries also carry the statement's plan:
+``EXPLAIN QUERY PLAN`` on SQLite, ``EXPLAIN (FORMAT JSON)`` on PostgreSQL. The
+plan comes from a plain ``EXPLAIN`` rather than ``EXPLAIN ANALYZE``, so the
+slow statement is not run a second time, but it is still an extra round trip
+on the request path. It is captured on the statement's own connection, so it
+sees the same transaction. Both settings are off by default.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import structlog
+from sqlalchemy import Connection, event
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+from app.core.query_stats import QueryStats, current_query_stats
+from app.monitoring.metrics import record_slow_query
+
+logger = structlog.get_logger(__name__)
+
+_STARTED = "_instrumentation_started"
+_EXPLAIN_PREFIXES = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN (FORMAT JSON) "}
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+_EXPLAIN_SAVEPOINT = "slow_query_explain"
+
+
+def explain(connection: Connection, statement: str, parameters: Any) -> Any:
+    """Return the plan of *statement*, or ``None`` when it has none or EXPLAIN fails.
+
+    The raw DBAPI cursor keeps EXPLAIN out of the statement events. On
+    PostgreSQL it runs inside a savepoint, so a failure cannot abort the
+    caller's transaction.
+    """
+
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    prefix = _EXPLAIN_PREFIXES.get(connection.dialect.name, "EXPLAIN ")
+    savepoint = connection.dialect.name == "postgresql"
+    dbapi_connection = connection.connection.dbapi_connection
+    if dbapi_connection is None:
+        return None
+    cursor = dbapi_connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+        if savepoint:
+            cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+    except Exception as exc:  # noqa: BLE001 - a missing plan must never fail the request
+        if savepoint:
+            try:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            except Exception:  # noqa: BLE001
+                pass
+        logger.warning("slow_query_explain_failed", error=str(exc))
+        return None
+    finally:
+        cursor.close()
+    # PostgreSQL returns the JSON plan as a single value; SQLite returns one row per plan step.
+    if len(rows) == 1 and len(rows[0]) == 1:
+        return rows[0][0]
+    return [list(row) for row in rows]
+
+
+class _SlowQueryWriter:
+    """Appends slow-query lines from one daemon thread, started on first use."""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[tuple[Path, str]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, path: Path, line: str) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="slow-query-log", daemon=True)
+                self._thread.start()
+        self._queue.put((path, line))
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            path, line = self._queue.get()
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with path.open("a", encoding="utf-8") as handle:
+                    handle.write(line + "\n")
+            except OSError as exc:
+                logger.warning("slow_query_log_failed", error=str(exc))
+            finally:
+                self._queue.task_done()
+
+
+_writer = _SlowQueryWriter()
+
+
+def flush_slow_query_log() -> None:
+    """Block until every queued slow-query entry has been written."""
+
+    _writer.flush()
+
+
+def _log_slow_query(
+    connection: Connection,
+    statement: str,
+    parameters: Any,
+    duration_seconds: float,
+    *,
+    executemany: bool,
+    stats: QueryStats | None,
+) -> None:
+    settings = get_settings()
+    record_slow_query()
+    plan = None if executemany or not settings.slow_query_explain else explain(connection, statement, parameters)
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": round(duration_seconds * 1000, 3),
+        "route": stats.route if stats is not None else None,
+        "dialect": connection.dialect.name,
+        "statement": statement,
+        "parameters": parameters if settings.slow_query_log_parameters else None,
+        "plan": plan,
+    }
+    # Serialized here so the writer never sees parameters the caller mutates later.
+    _writer.submit(Path(settings.slow_query_log_path), json.dumps(entry, default=str))
+
+
+def _start_timer(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    if context is not None:
+        setattr(context, _STARTED, time.perf_counter())
+
+
+def _stop_timer(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    started = getattr(context, _STARTED, None)
+    if started is None:
+        return
+    duration = time.perf_counter() - started
+    stats = current_query_stats()
+    if stats is not None:
+        stats.record(statement, duration)
+    threshold_ms = get_settings().slow_query_threshold_ms
+    if threshold_ms > 0 and duration * 1000 >= threshold_ms:
+        _log_slow_query(conn, statement, parameters, duration, executemany=executemany, stats=stats)
+
+
+def watch() -> None:
+    """Time every statement run by any engine."""
+
+    event.listen(Engine, "before_cursor_execute", _start_timer)
+    event.listen(Engine, "after_cursor_execute", _stop_timer)
+
+
+watch()
+
+
+__all__ = ["explain", "flush_slow_query_log", "watch"]
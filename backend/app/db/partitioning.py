@@ -0,0 +1,139 @@
+"""Opt-in PostgreSQL LIST partitioning of ``assets`` by ``instances_id``.
+
+The largest instances each get a partition of their own and every other
+instance shares ``assets_default``, so a small instance's scans, vacuums and
+index pages are not sized by the biggest one. It is a one-off conversion
+rather than a migration because it is only worth it at scale and has a cost:
+
+* PostgreSQL requires the partition key in every unique constraint, so the
+  primary key becomes ``(assets_id, instances_id)`` and foreign keys that
+  reference ``assets.assets_id`` alone (including ``assets_linkedTo``) are
+  dropped.
+* The table is rewritten, holding an exclusive lock while rows are copied.
+
+``assetsAssignments`` and ``auditLog`` have no ``instances_id`` and are left
+alone; tenants reach assignments through ``ix_assetsAssignments_project_live``.
+Print the plan with ``python -m app.db.partitioning --dedicated 7`` and run it
+by adding ``--apply``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from typing import Iterable, Sequence
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import AddConstraint, CreateIndex
+
+from app.core.config import get_settings
+from app.models.generated import Assets
+from app.models.search import POSTGRES_CREATE_STATEMENTS
+
+PARTITIONED_TABLE = "assets"
+_LEGACY_TABLE = "assets_unpartitioned"
+
+
+def _partition_name(instance_id: int) -> str:
+    return f"{PARTITIONED_TABLE}_instance_{instance_id}"
+
+
+def _rebuilt_schema_statements() -> list[str]:
+    """Indexes and outgoing foreign keys of ``assets``, which ``LIKE`` does not copy."""
+
+    dialect = postgresql.dialect()  # type: ignore[no-untyped-call]
+    table = Assets.metadata.tables[PARTITIONED_TABLE]
+    indexes = [
+        str(CreateIndex(index).compile(dialect=dialect))
+        for index in sorted(table.indexes, key=lambda index: str(index.name))
+    ]
+    search = [statement for statement in POSTGRES_CREATE_STATEMENTS if " ON assets " in statement]
+    foreign_keys = [
+        str(AddConstraint(constraint).compile(dialect=dialect))
+        for constraint in sorted(table.foreign_key_constraints, key=lambda constraint: str(constraint.name or ""))
+        # A self-reference would need the partition key too, like the incoming ones.
+        if constraint.referred_table is not table
+    ]
+    return indexes + search + foreign_keys
+
+
+def partition_statements(dedicated: Iterable[int]) -> list[str]:
+    """Return the DDL converting ``assets`` into a partitioned table, in order.
+
+    *dedicated* are the instances that get their own partition.
+    """
+
+    instance_ids = sorted(set(dedicated))
+    if any(instance_id < 1 for instance_id in instance_ids):
+        raise ValueError("Instance ids must be positive")
+    statements = [
+        f"LOCK TABLE {PARTITIONED_TABLE} IN ACCESS EXCLUSIVE MODE",
+        f"ALTER TABLE {PARTITIONED_TABLE} RENAME TO {_LEGACY_TABLE}",
+        f"CREATE TABLE {PARTITIONED_TABLE} (LIKE {_LEGACY_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY LIST (instances_id)",
+        f"ALTER TABLE {PARTITIONED_TABLE} ADD PRIMARY KEY (assets_id, instances_id)",
+        *(
+            f"CREATE TABLE {_partition_name(instance_id)} PARTITION OF {PARTITIONED_TABLE} "
+            f"FOR VALUES IN ({instance_id})"
+            for instance_id in instance_ids
+        ),
+        f"CREATE TABLE {PARTITIONED_TABLE}_default PARTITION OF {PARTITIONED_TABLE} DEFAULT",
+        f"INSERT INTO {PARTITIONED_TABLE} SELECT * FROM {_LEGACY_TABLE}",
+        # The id sequence is owned by the old table and would be dropped with it.
+        "DO $$ BEGIN EXECUTE format('ALTER SEQUENCE %s OWNED BY "
+        f"{PARTITIONED_TABLE}.assets_id', pg_get_serial_sequence('{_LEGACY_TABLE}', 'assets_id')); END $$",
+        "DO $$ DECLARE fk record; BEGIN "
+        "FOR fk IN SELECT conrelid::regclass AS child, conname FROM pg_constraint "
+        f"WHERE contype = 'f' AND confrelid = '{_LEGACY_TABLE}'::regclass LOOP "
+        "EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', fk.child, fk.conname); "
+        "END LOOP; END $$",
+        f"DROP TABLE {_LEGACY_TABLE}",
+        *_rebuilt_schema_statements(),
+        f"ANALYZE {PARTITIONED_TABLE}",
+    ]
+    return statements
+
+
+def apply(database_url: str, statements: Sequence[str]) -> None:
+    """Run *statements* in one transaction; PostgreSQL DDL rolls back as a whole on failure."""
+
+    engine = create_engine(database_url, future=True)
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Partitioning is only supported on PostgreSQL")
+    with engine.begin() as connection:
+        for statement in statements:
+            connection.exec_driver_sql(statement)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Partition assets by instance on PostgreSQL.")
+    parser.add_argument(
+        "--database-url",
+        dest="database_url",
+        default=os.environ.get("APP_DATABASE_URL", get_settings().database_url),
+    )
+    parser.add_argument(
+        "--dedicated",
+        type=int,
+        action="append",
+        default=[],
+        metavar="INSTANCE_ID",
+        help="Give this instance its own partition; repeat for several",
+    )
+    parser.add_argument("--apply", action="store_true", help="Run the plan instead of printing it")
+    args = parser.parse_args()
+
+    statements = partition_statements(args.dedicated)
+    if not args.apply:
+        print(";\n".join(statements) + ";")
+        return
+    apply(args.database_url, statements)
+    print(f"Partitioned {PARTITIONED_TABLE} with {len(set(args.dedicated))} dedicated partitions")
+
+
+__all__ = ["PARTITIONED_TABLE", "apply", "partition_statements", "main"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Routing of read-only sessions to database replicas.
+
+Sessions opened with ``info={REPLICA_READS: True}`` (the ones
+:func:`app.db.async_session.get_async_db` hands to GET requests) send their
+``SELECT`` statements to a replica chosen by :class:`ReplicaRouter`; every
+other session, and every flush or DML statement, uses the primary. A session
+that has written reads from the primary from then on, and after a write is
+committed the same tenant's reads stay on the primary for
+``replica_read_your_writes_seconds`` so replica lag never hides the write from
+the next request.
+
+A replica is taken out of rotation when a connection to it fails and put back
+by the next successful health check; with no healthy replica, reads fall back
+to the primary.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Literal, Sequence
+
+import structlog
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from app.core.tenancy import current_instance_id
+
+logger = structlog.get_logger(__name__)
+
+REPLICA_READS = "replica_reads"
+_WROTE = "replica_wrote"
+_REPLICA = "replica"
+
+ReplicaSelection = Literal["round_robin", "least_connections"]
+
+
+@dataclass(eq=False)
+class Replica:
+    name: str
+    engine: AsyncEngine
+    healthy: bool = True
+    in_use: int = 0
+
+    @property
+    def sync_engine(self) -> Engine:
+        return self.engine.sync_engine
+
+
+@dataclass(eq=False)
+class ReplicaRouter:
+    """Picks the replica for a read-only session and tracks replica health and recent writes."""
+
+    replicas: Sequence[Replica]
+    selection: ReplicaSelection = "round_robin"
+    read_your_writes_seconds: float = 5.0
+    health_check_interval_seconds: float = 10.0
+    health_check_timeout_seconds: float = 2.0
+    _turn: itertools.count[int] = field(default_factory=itertools.count, repr=False)
+    _last_writes: dict[int | None, float] = field(default_factory=dict, repr=False)
+    _checked_at: float = field(default=float("-inf"), repr=False)
+    _checking: bool = field(default=False, repr=False)
+
+    def __post_init__(self) -> None:
+        for replica in self.replicas:
+            self._watch(replica)
+
+    def _watch(self, replica: Replica) -> None:
+        def checkout(*_: Any) -> None:
+            replica.in_use += 1
+
+        def checkin(*_: Any) -> None:
+            replica.in_use -= 1
+
+        def handle_error(context: Any) -> None:
+            # A failed connect has no connection yet; a dropped one is flagged as a disconnect.
+            if context.connection is None or context.is_disconnect:
+                self.mark_down(replica)
+
+        event.listen(replica.sync_engine, "checkout", checkout)
+        event.listen(replica.sync_engine, "checkin", checkin)
+        event.listen(replica.sync_engine, "handle_error", handle_error)
+
+    def choose(self) -> Replica | None:
+        """Return the replica for the next read-only session, ``None`` to use the primary."""
+
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.selection == "least_connections":
+            return min(healthy, key=lambda replica: replica.in_use)
+        return healthy[next(self._turn) % len(healthy)]
+
+    def mark_down(self, replica: Replica) -> None:
+        if replica.healthy:
+            logger.warning("replica_unhealthy", replica=replica.name)
+        replica.healthy = False
+
+    def record_write(self, instance_id: int | None) -> None:
+        self._last_writes[instance_id] = time.monotonic()
+
+    def recently_wrote(self, instance_id: int | None) -> bool:
+        """Whether *instance_id* (or an unscoped write, which may touch any tenant) is inside the stickiness window."""
+
+        horizon = time.monotonic() - self.read_your_writes_seconds
+        return any(
+            self._last_writes.get(key, float("-inf")) > horizon for key in {instance_id, None}
+        )
+
+    async def check_health(self) -> dict[str, bool]:
+        """Probe every replica with ``SELECT 1`` and update its rotation status."""
+
+        async def probe(replica: Replica) -> None:
+            try:
+                async with replica.engine.connect() as connection:
+                    await asyncio.wait_for(
+                        connection.execute(text("SELECT 1")), self.health_check_timeout_seconds
+                    )
+            except Exception as exc:  # noqa: BLE001 - any failure takes the replica out of rotation
+                logger.warning("replica_health_check_failed", replica=replica.name, error=str(exc))
+                self.mark_down(replica)
+            else:
+                if not replica.healthy:
+                    logger.info("replica_recovered", replica=replica.name)
+                replica.healthy = True
+
+        self._checked_at = time.monotonic()
+        await asyncio.gather(*(probe(replica) for replica in self.replicas))
+        return {replica.name: replica.healthy for replica in self.replicas}
+
+    async def maybe_check_health(self) -> None:
+        """Run :meth:`check_health` when the interval has elapsed; concurrent callers don't wait for it."""
+
+        if not self.replicas or self._checking:
+            return
+        if time.monotonic() - self._checked_at < self.health_check_interval_seconds:
+            return
+        self._checking = True
+        try:
+            await self.check_health()
+        finally:
+            self._checking = False
+
+
+class RoutingSession(Session):
+    """Session that sends reads of a read-only session to a replica picked by *router*."""
+
+    def __init__(self, *args: Any, router: ReplicaRouter | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.router = router
+
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, **kwargs: Any) -> Any:
+        primary = super().get_bind(mapper, clause=clause, **kwargs)
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info[_WROTE] = True
+            return primary
+        if self.router is None or not self.info.get(REPLICA_READS) or self.info.get(_WROTE):
+            return primary
+        if _REPLICA not in self.info:
+            # Decided once per session so its reads share one connection and snapshot.
+            replica = None if self.router.recently_wrote(current_instance_id()) else self.router.choose()
+            self.info[_REPLICA] = replica
+        replica = self.info[_REPLICA]
+        return primary if replica is None else replica.sync_engine
+
+
+def _record_write(session: Session) -> None:
+    if session.info.get(_WROTE) and isinstance(session, RoutingSession) and session.router is not None:
+        session.router.record_write(current_instance_id())
+
+
+event.listen(RoutingSession, "after_commit", _record_write)
+
+
+__all__ = [
+    "REPLICA_READS",
+    "Replica",
+    "ReplicaRouter",
+    "ReplicaSelection",
+    "RoutingSession",
+]
@@ -0,0 +1,245 @@
+"""Maintenance of the ``search_documents`` table behind ``GET /api/search``.
+
+Every asset, asset type, project, client and user becomes one document: a
+title plus a body of its other searchable text. A flush listener rewrites the
+documents of ORM-changed rows within the same transaction, dropping those that
+are deleted or no longer live. Bulk statements and the legacy PHP application
+are not seen; run ``python -m app.db.search_index`` to rebuild.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Callable, Iterator, Mapping, Sequence
+
+from sqlalchemy import Connection, Insert, create_engine, delete, event, insert, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, UOWTransaction
+
+from app.core.config import get_settings
+from app.models.derived import SearchDocument
+from app.models.generated import Assets, AssetTypes, Clients, Projects, Users
+
+_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """How one table's rows become search documents."""
+
+    entity: str
+    model: type[Any]
+    columns: tuple[str, ...]
+    title: Callable[[Mapping[str, Any]], str]
+    body: tuple[str, ...]
+    live: Callable[[Mapping[str, Any]], bool] = lambda values: True
+    instance_column: str | None = "instances_id"
+
+    @property
+    def id_column(self) -> str:
+        name: str = inspect(self.model).primary_key[0].name
+        return name
+
+    def document(self, values: Mapping[str, Any]) -> dict[str, Any] | None:
+        """Return the ``search_documents`` row for *values*, or ``None`` if not searchable."""
+
+        if not self.live(values):
+            return None
+        return {
+            "entity": self.entity,
+            "entity_id": values[self.id_column],
+            "instances_id": values[self.instance_column] if self.instance_column else None,
+            "title": self.title(values)[:500],
+            "body": " ".join(str(values[name]) for name in self.body if values[name]),
+        }
+
+
+def _user_title(values: Mapping[str, Any]) -> str:
+    name = " ".join(part for part in (values["users_name1"], values["users_name2"]) if part)
+    return name or values["users_username"] or f"User {values['users_userid']}"
+
+
+SEARCH_SOURCES: tuple[SearchSource, ...] = (
+    SearchSource(
+        entity="asset",
+        model=Assets,
+        columns=(
+            "assets_id",
+            "instances_id",
+            "assets_tag",
+            "assets_notes",
+            "assets_deleted",
+            *(f"asset_definableFields_{index}" for index in range(1, 11)),
+        ),
+        title=lambda values: values["assets_tag"] or f"Asset {values['assets_id']}",
+        body=("assets_notes", *(f"asset_definableFields_{index}" for index in range(1, 11))),
+        live=lambda values: not values["assets_deleted"],
+    ),
+    SearchSource(
+        entity="asset_type",
+        model=AssetTypes,
+        columns=("assetTypes_id", "instances_id", "assetTypes_name", "assetTypes_description"),
+        title=lambda values: values["assetTypes_name"],
+        body=("assetTypes_description",),
+    ),
+    SearchSource(
+        entity="project",
+        model=Projects,
+        columns=("projects_id", "instances_id", "projects_name", "projects_description", "projects_deleted"),
+        title=lambda values: values["projects_name"],
+        body=("projects_description",),
+        live=lambda values: not values["projects_deleted"],
+    ),
+    SearchSource(
+        entity="client",
+        model=Clients,
+        columns=(
+            "clients_id",
+            "instances_id",
+            "clients_name",
+            "clients_email",
+            "clients_website",
+            "clients_phone",
+            "clients_address",
+            "clients_notes",
+            "clients_deleted",
+        ),
+        title=lambda values: values["clients_name"],
+        body=("clients_email", "clients_website", "clients_phone", "clients_address", "clients_notes"),
+        live=lambda values: not values["clients_deleted"],
+    ),
+    SearchSource(
+        # Users belong to instances through positions; searches check membership at query time.
+        entity="user",
+        model=Users,
+        columns=("users_userid", "users_username", "users_name1", "users_name2", "users_deleted", "users_suspended"),
+        title=_user_title,
+        body=("users_username",),
+        live=lambda values: not values["users_deleted"] and not values["users_suspended"],
+        instance_column=None,
+    ),
+)
+SEARCH_ENTITIES: tuple[str, ...] = tuple(source.entity for source in SEARCH_SOURCES)
+_SOURCES_BY_MODEL = {source.model: source for source in SEARCH_SOURCES}
+
+
+def _upsert_arguments(excluded: Any) -> dict[str, Any]:
+    return {
+        "index_elements": [SearchDocument.entity, SearchDocument.entity_id],
+        "set_": {name: excluded[name] for name in ("instances_id", "title", "body")},
+    }
+
+
+def _upsert(dialect_name: str) -> Insert | None:
+    """Upsert into ``search_documents`` keyed on ``(entity, entity_id)``.
+
+    Returns ``None`` for dialects without ``ON CONFLICT``; :func:`write` then
+    deletes the documents' previous rows before inserting them.
+    """
+
+    if dialect_name == "postgresql":
+        pg_stmt = postgresql.insert(SearchDocument)
+        return pg_stmt.on_conflict_do_update(**_upsert_arguments(pg_stmt.excluded))
+    if dialect_name == "sqlite":
+        sqlite_stmt = sqlite.insert(SearchDocument)
+        return sqlite_stmt.on_conflict_do_update(**_upsert_arguments(sqlite_stmt.excluded))
+    return None
+
+
+def write(connection: Connection, documents: Sequence[Mapping[str, Any]], removed: Sequence[tuple[str, int]]) -> None:
+    """Upsert *documents* and delete the ``(entity, entity_id)`` pairs in *removed*."""
+
+    upsert = _upsert(connection.dialect.name) if documents else None
+    by_entity: defaultdict[str, list[int]] = defaultdict(list)
+    for entity, entity_id in removed:
+        by_entity[entity].append(entity_id)
+    if documents and upsert is None:
+        for document in documents:
+            by_entity[document["entity"]].append(document["entity_id"])
+    for entity, ids in by_entity.items():
+        connection.execute(
+            delete(SearchDocument).where(SearchDocument.entity == entity, SearchDocument.entity_id.in_(ids))
+        )
+    if documents:
+        connection.execute(insert(SearchDocument) if upsert is None else upsert, list(documents))
+
+
+def _source_documents(connection: Connection, source: SearchSource) -> Iterator[list[dict[str, Any]]]:
+    table = source.model.__table__
+    stmt = select(*(table.c[name] for name in source.columns)).execution_options(yield_per=_BATCH_SIZE)
+    for rows in connection.execute(stmt).mappings().partitions():
+        documents = [source.document(dict(row)) for row in rows]
+        yield [document for document in documents if document is not None]
+
+
+def rebuild(connection: Connection) -> int:
+    """Recreate every document from the source tables; return the document count."""
+
+    connection.execute(delete(SearchDocument))
+    count = 0
+    for source in SEARCH_SOURCES:
+        for documents in _source_documents(connection, source):
+            if documents:
+                connection.execute(insert(SearchDocument), documents)
+                count += len(documents)
+    return count
+
+
+def _after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    if not get_settings().search_index_enabled:
+        return
+    documents: list[dict[str, Any]] = []
+    removed: list[tuple[str, int]] = []
+    for obj in chain(session.new, session.dirty, session.deleted):
+        source = _SOURCES_BY_MODEL.get(type(obj))
+        if source is None:
+            continue
+        state = inspect(obj)
+        if obj in session.deleted:
+            removed.append((source.entity, state.identity[0]))
+            continue
+        if obj in session.dirty and not any(state.attrs[name].history.has_changes() for name in source.columns):
+            continue
+        values = {name: getattr(obj, name) for name in source.columns}
+        document = source.document(values)
+        if document is None:
+            removed.append((source.entity, values[source.id_column]))
+        else:
+            documents.append(document)
+    if documents or removed:
+        write(session.connection(), documents, removed)
+
+
+def watch() -> None:
+    """Register the flush listener; it is a no-op while the index is disabled."""
+
+    event.listen(Session, "after_flush", _after_flush)
+
+
+watch()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild search_documents from the searchable tables.")
+    parser.add_argument(
+        "--database-url",
+        dest="database_url",
+        default=os.environ.get("APP_DATABASE_URL", get_settings().database_url),
+    )
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, future=True)
+    with engine.begin() as connection:
+        documents = rebuild(connection)
+    print(f"Rebuilt search_documents with {documents} documents")
+
+
+__all__ = ["SEARCH_ENTITIES", "SEARCH_SOURCES", "SearchSource", "rebuild", "write", "watch", "main"]
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,32 @@
+"""Engine construction and the request-scoped session.
+
+:func:`build_engine` turns the ``db_*`` and ``sqlite_*`` settings into pool
+options. Server databases get a bounded queue pool with pre-ping and recycle
+and, when ``db_statement_timeout_ms`` is set, a server-side statement timeout.
+File-backed SQLite databases are opened in WAL mode with ``synchronous``,
+``mmap_size`` and a busy timeout applied to every new connection, so readers
+never block the writer and a briefly locked database is waited on instead of
+failing with "database is locked". ``sqlite_connection_strategy=per_thread``
+keeps one connection per thread instead of pooling them. Pool activity is
+exported through :func:`app.monitoring.metrics.record_pool_event`.
+"""
+
 from __future__ import annotations
 
+import time
 from pathlib import Path
-from typing import Generator
+from typing import Any, Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import SingletonThreadPool
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.db import instrumentation as _instrumentation  # noqa: F401  (registers statement timing)
+from app.db import tenancy as _tenancy  # noqa: F401  (registers tenant scoping of ORM statements)
 from app.db.base import Base
+from app.monitoring.metrics import record_pool_event
 
 settings = get_settings()
 
@@ -18,7 +37,115 @@ if default_database_url.startswith("sqlite"):
     if database_path:
         Path(database_path).parent.mkdir(parents=True, exist_ok=True)
 
-engine = create_engine(default_database_url, future=True)
+_POOL_EVENTS = ("connect", "checkout", "checkin", "invalidate", "close", "close_detached")
+_STATEMENT_DEADLINE = "statement_deadline"
+# SQLite calls the progress handler every this many virtual machine instructions.
+_PROGRESS_INTERVAL = 10_000
+
+
+def _is_sqlite_memory(url: URL) -> bool:
+    return not url.database or url.database == ":memory:" or url.query.get("mode") == "memory"
+
+
+def engine_options(database_url: str, settings: Settings, *, is_async: bool = False) -> dict[str, Any]:
+    """Return the ``create_engine`` pool and connect arguments for *database_url*."""
+
+    url = make_url(database_url)
+    options: dict[str, Any] = {"pool_pre_ping": settings.db_pool_pre_ping}
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        if _is_sqlite_memory(url):
+            # SQLAlchemy picks the pool that keeps an in-memory database alive.
+            return options
+        if settings.sqlite_connection_strategy == "per_thread" and not is_async:
+            options.update(
+                poolclass=SingletonThreadPool,
+                pool_size=settings.db_pool_size,
+                pool_recycle=settings.db_pool_recycle_seconds,
+            )
+            return options
+    elif backend == "postgresql" and settings.db_statement_timeout_ms > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+    )
+    return options
+
+
+def sqlite_pragmas(settings: Settings, *, in_memory: bool = False) -> list[str]:
+    """PRAGMAs run on every new SQLite connection; busy_timeout first so the WAL switch can wait."""
+
+    pragmas = [f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}"]
+    if not in_memory:
+        pragmas += [
+            f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+            f"PRAGMA synchronous={settings.sqlite_synchronous}",
+            f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        ]
+    return pragmas
+
+
+def _configure_sqlite(engine: Engine, settings: Settings) -> None:
+    pragmas = sqlite_pragmas(settings, in_memory=_is_sqlite_memory(engine.url))
+    timeout = settings.db_statement_timeout_ms / 1000
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+        # Only the pysqlite connection exposes the progress handler used to interrupt long statements.
+        if timeout > 0 and hasattr(dbapi_connection, "set_progress_handler"):
+            deadline = [float("inf")]
+            connection_record.info[_STATEMENT_DEADLINE] = deadline
+            dbapi_connection.set_progress_handler(lambda: time.monotonic() > deadline[0], _PROGRESS_INTERVAL)
+
+    if timeout <= 0:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_deadline(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        deadline = conn.info.get(_STATEMENT_DEADLINE)
+        if deadline is not None:
+            deadline[0] = time.monotonic() + timeout
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _clear_deadline(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        # Cleared once the statement returns so fetching rows and COMMIT are never interrupted.
+        deadline = conn.info.get(_STATEMENT_DEADLINE)
+        if deadline is not None:
+            deadline[0] = float("inf")
+
+
+def instrument_pool(engine: Engine, name: str) -> None:
+    """Report *engine*'s pool events to the metrics registry under ``engine=name``."""
+
+    for pool_event in _POOL_EVENTS:
+        event.listen(engine, pool_event, lambda *args, _event=pool_event: record_pool_event(name, _event))
+
+
+def configure_engine(engine: Engine, settings: Settings, *, name: str) -> Engine:
+    """Attach the SQLite connection setup and pool metrics to a freshly created *engine*."""
+
+    if engine.dialect.name == "sqlite":
+        _configure_sqlite(engine, settings)
+    instrument_pool(engine, name)
+    return engine
+
+
+def build_engine(database_url: str, settings: Settings | None = None, *, name: str = "sync") -> Engine:
+    """Create a sync engine for *database_url* configured from *settings*."""
+
+    settings = settings or get_settings()
+    engine = create_engine(database_url, future=True, **engine_options(database_url, settings))
+    return configure_engine(engine, settings, name=name)
+
+
+engine = build_engine(default_database_url, settings)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 
@@ -30,4 +157,14 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-__all__ = ["Base", "engine", "SessionLocal", "get_db"]
+__all__ = [
+    "Base",
+    "engine",
+    "SessionLocal",
+    "build_engine",
+    "configure_engine",
+    "engine_options",
+    "get_db",
+    "instrument_pool",
+    "sqlite_pragmas",
+]
@@ -0,0 +1,76 @@
+"""Automatic tenant scoping of ORM statements.
+
+While :func:`app.core.tenancy.current_instance_id` is set, every ORM
+``SELECT``, ``UPDATE`` and ``DELETE`` run through a session gets
+``instances_id = :id`` criteria for each tenant-owned entity it touches,
+including joined and aliased ones. Where ``instances_id`` is nullable a NULL
+marks a row shared by every instance (stock asset types, manufacturers), so
+those rows stay visible. Pass ``execution_options(all_tenants=True)`` to run a
+statement across tenants; Core statements against ``Table`` objects are never
+rewritten.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import event, or_
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+
+from app.core.tenancy import current_instance_id
+from app.db.base import Base
+
+ALL_TENANTS_OPTION = "all_tenants"
+
+
+def tenant_models() -> tuple[type[Any], ...]:
+    """Return every mapped class owned by an instance, i.e. carrying ``instances_id``."""
+
+    return tuple(
+        mapper.class_
+        for mapper in Base.registry.mappers
+        if "instances_id" in mapper.columns
+    )
+
+
+def _criteria(instance_id: int, nullable: bool) -> Any:
+    if nullable:
+        return lambda cls: or_(cls.instances_id == instance_id, cls.instances_id.is_(None))
+    return lambda cls: cls.instances_id == instance_id
+
+
+def tenant_options(instance_id: int) -> list[Any]:
+    """Loader criteria restricting every tenant-owned entity to *instance_id*."""
+
+    return [
+        with_loader_criteria(
+            model,
+            _criteria(instance_id, model.__table__.c.instances_id.nullable),
+            include_aliases=True,
+        )
+        for model in tenant_models()
+    ]
+
+
+def _scope_statement(state: ORMExecuteState) -> None:
+    instance_id = current_instance_id()
+    if instance_id is None or state.execution_options.get(ALL_TENANTS_OPTION, False):
+        return
+    if not (state.is_select or state.is_update or state.is_delete):
+        return
+    # Relationship and column lazy loads inherit the criteria of the statement that loaded the parent.
+    if state.is_column_load or state.is_relationship_load:
+        return
+    state.statement = state.statement.options(*tenant_options(instance_id))
+
+
+def watch() -> None:
+    """Register the statement hook; it is a no-op outside a tenant scope."""
+
+    event.listen(Session, "do_orm_execute", _scope_statement)
+
+
+watch()
+
+
+__all__ = ["ALL_TENANTS_OPTION", "tenant_models", "tenant_options", "watch"]
@@ -5,11 +5,17 @@ from typing import Any, Dict
 
 from sqlalchemy.engine import Engine
 
+from app.core.config import get_settings
+
 from . import extract, load, transform
 
 
-def run_pipeline(source: Path, engine: Engine) -> Dict[str, Any]:
-    """Run the ETL pipeline and return statistics."""
-    raw = extract.extract_from_json(source)
-    transformed = transform.transform_raw(raw)
-    return load.load_into_database(engine, transformed)
+def run_pipeline(source: Path, engine: Engine, *, batch_size: int | None = None) -> Dict[str, Any]:
+    """Run the ETL pipeline and return statistics.
+
+    Rows stream from the dump through validation into the database in batches
+    of *batch_size* (``etl_batch_size`` by default), so memory use does not
+    grow with the size of the dump.
+    """
+    batches = extract.extract_batches(source, batch_size or get_settings().etl_batch_size)
+    return load.load_batches(engine, transform.transform_batches(batches))
@@ -2,23 +2,146 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, Iterator, List, Tuple
 
+_CHUNK_SIZE = 1 << 16
+# Longest single JSON value (one row, or a table name) held in memory at once.
+_MAX_VALUE_SIZE = 64 << 20
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+_decoder = json.JSONDecoder()
 
-def extract_from_json(source: Path) -> Dict[str, List[Dict[str, Any]]]:
-    """Extract data from a JSON dump produced from MySQL."""
+Batch = Tuple[str, List[Dict[str, Any]]]
+
+
+class _JsonReader:
+    """Decode JSON values one at a time from a text stream, holding about one chunk in memory."""
+
+    def __init__(self, handle: IO[str], chunk_size: int = _CHUNK_SIZE, max_value_size: int = _MAX_VALUE_SIZE) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._max_value_size = max_value_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it, ``""`` at end of input."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def take(self, expected: str, error: str) -> None:
+        if self.peek() != expected:
+            raise ValueError(error)
+        self._pos += 1
+
+    def _truncated(self, err: json.JSONDecodeError) -> bool:
+        """Whether *err* comes from the value running past the end of the buffer."""
+        tail = self._buffer[err.pos :]
+        # A number cut after "1." or "1e" fails where its next digit would be.
+        if set(tail) <= _NUMBER_CHARS or err.msg.startswith("Unterminated string"):
+            return True
+        if err.msg.startswith("Invalid \\uXXXX escape"):
+            return len(tail) < 6
+        return err.msg == "Expecting value" and any(literal.startswith(tail) for literal in _LITERALS)
+
+    def _fill_value(self) -> bool:
+        if len(self._buffer) - self._pos >= self._max_value_size:
+            raise ValueError(f"JSON value exceeds {self._max_value_size} characters")
+        return self._fill()
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as err:
+                # Malformed input fails at once; only a value cut off by the chunk is read further.
+                if not self._truncated(err) or not self._fill_value():
+                    raise
+                continue
+            # A number running to the end of the buffer may have more digits to come.
+            if not self._eof and set(self._buffer[end:]) <= _NUMBER_CHARS and self._fill_value():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_rows(
+    source: Path, *, chunk_size: int = _CHUNK_SIZE, max_value_size: int = _MAX_VALUE_SIZE
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(table, row)`` pairs from a MySQL JSON dump without loading it whole.
+
+    The dump is a top-level object mapping table names to arrays of row
+    objects; rows are yielded in file order. A row longer than
+    *max_value_size* characters is rejected with ``ValueError``.
+    """
     with source.open("r", encoding="utf-8") as handle:
-        payload = json.load(handle)
-    if not isinstance(payload, dict):
-        raise ValueError("Expected top-level object with table arrays")
+        reader = _JsonReader(handle, chunk_size, max_value_size)
+        reader.take("{", "Expected top-level object with table arrays")
+        if reader.peek() == "}":
+            reader.take("}", "")
+            return
+        while True:
+            table = reader.value()
+            if not isinstance(table, str):
+                raise ValueError("Expected top-level object with table arrays")
+            reader.take(":", f"Expected ':' after table {table}")
+            reader.take("[", f"Table {table} must contain a list of rows")
+            if reader.peek() == "]":
+                reader.take("]", "")
+            else:
+                while True:
+                    row = reader.value()
+                    if not isinstance(row, dict):
+                        raise ValueError(f"Row for {table} must be an object")
+                    yield table, row
+                    if reader.peek() == "]":
+                        reader.take("]", "")
+                        break
+                    reader.take(",", f"Expected ',' or ']' in rows of table {table}")
+            if reader.peek() == "}":
+                reader.take("}", "")
+                break
+            reader.take(",", "Expected ',' or '}' between tables")
+        if reader.peek():
+            raise ValueError("Unexpected data after the top-level object")
+
+
+def extract_batches(source: Path, batch_size: int) -> Iterator[Batch]:
+    """Yield ``(table, rows)`` batches of at most *batch_size* consecutive rows of one table."""
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    current: Batch | None = None
+    for table, row in iter_rows(source):
+        if current is not None and (table != current[0] or len(current[1]) >= batch_size):
+            yield current
+            current = None
+        if current is None:
+            current = (table, [])
+        current[1].append(row)
+    if current is not None:
+        yield current
+
+
+def extract_from_json(source: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """Extract a whole JSON dump into memory; prefer :func:`extract_batches` for large dumps."""
     result: Dict[str, List[Dict[str, Any]]] = {}
-    for table, rows in payload.items():
-        if not isinstance(rows, list):
-            raise ValueError(f"Table {table} must contain a list of rows")
-        normalised: List[Dict[str, Any]] = []
-        for row in rows:
-            if not isinstance(row, dict):
-                raise ValueError(f"Row for {table} must be an object")
-            normalised.append(row)
-        result[table] = normalised
+    for table, row in iter_rows(source):
+        result.setdefault(table, []).append(row)
     return result
@@ -1,29 +1,40 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
+from app.etl.extract import Batch
 from app.models import MODEL_REGISTRY
 from sqlalchemy import text
 
 
-def load_into_database(engine: Engine, transformed: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
-    """Load validated rows into the target database."""
+def load_batches(engine: Engine, batches: Iterable[Batch]) -> Dict[str, Any]:
+    """Load validated ``(table, rows)`` batches into the target database in one transaction.
+
+    Each batch is flushed and then expunged, so the session never holds more
+    than one batch of objects.
+    """
     stats: Dict[str, Any] = {"tables": {}, "total_rows": 0}
     if engine.dialect.name == "sqlite":
         with engine.begin() as connection:
             connection.execute(text("PRAGMA foreign_keys=ON"))
     with Session(engine) as session:
-        for table, rows in transformed.items():
+        for table, rows in batches:
             model = MODEL_REGISTRY.get(table)
             if model is None or not rows:
                 continue
             for row in rows:
                 session.merge(model(**row))
             session.flush()
-            stats["tables"][table] = len(rows)
+            session.expunge_all()
+            stats["tables"][table] = stats["tables"].get(table, 0) + len(rows)
             stats["total_rows"] += len(rows)
         session.commit()
     return stats
+
+
+def load_into_database(engine: Engine, transformed: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Load validated rows into the target database."""
+    return load_batches(engine, transformed.items())
@@ -15,11 +15,12 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Run the stage03 ETL pipeline.")
     parser.add_argument("--input", type=Path, default=Path("backend/tests/etl/fixtures/sample_dump.json"), help="Path to JSON dump")
     parser.add_argument("--database-url", dest="database_url", default=os.environ.get("DATABASE_URL", "sqlite+pysqlite:///:memory:"))
+    parser.add_argument("--batch-size", dest="batch_size", type=int, default=None, help="Rows per extract/load batch (default: APP_ETL_BATCH_SIZE)")
     args = parser.parse_args()
 
     engine = create_engine(args.database_url, future=True)
     Base.metadata.create_all(engine)
-    stats = run_pipeline(args.input, engine)
+    stats = run_pipeline(args.input, engine, batch_size=args.batch_size)
     print(f"Loaded {stats['total_rows']} rows across {len(stats['tables'])} tables")
 
 
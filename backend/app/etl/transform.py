@@ -1,20 +1,27 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
 
+from app.etl.extract import Batch
 from app.schemas import SCHEMA_REGISTRY
 
 
+def transform_rows(table: str, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]] | None:
+    """Validate and coerce *rows* of *table*; ``None`` when the table has no schema."""
+    schema = SCHEMA_REGISTRY.get(table)
+    if schema is None:
+        return None
+    return [schema.model_validate(row).model_dump(mode="python", exclude_none=True) for row in rows]
+
+
+def transform_batches(batches: Iterable[Batch]) -> Iterator[Batch]:
+    """Transform ``(table, rows)`` batches lazily, dropping tables without a schema."""
+    for table, rows in batches:
+        transformed = transform_rows(table, rows)
+        if transformed is not None:
+            yield table, transformed
+
+
 def transform_raw(raw: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
     """Validate and coerce raw rows using the generated Pydantic schemas."""
-    transformed: Dict[str, List[Dict[str, Any]]] = {}
-    for table, rows in raw.items():
-        schema = SCHEMA_REGISTRY.get(table)
-        if schema is None:
-            continue
-        transformed_rows: List[Dict[str, Any]] = []
-        for row in rows:
-            model = schema.model_validate(row)
-            transformed_rows.append(model.model_dump(mode="python", exclude_none=True))
-        transformed[table] = transformed_rows
-    return transformed
+    return dict(transform_batches(raw.items()))
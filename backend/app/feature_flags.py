@@ -15,6 +15,9 @@ class FeatureFlagState(BaseModel):
     model_config = ConfigDict(extra="allow")
 
     assets_api: bool = True
+    barcodes_api: bool = True
+    search_api: bool = True
+    batch_api: bool = True
 
     def is_enabled(self, flag: str) -> bool:
         return bool(getattr(self, flag, False))
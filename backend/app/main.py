@@ -1,5 +1,6 @@
 from __future__ import annotations
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from app.api import api_router
 from app.core.config import get_settings
@@ -17,6 +18,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
 )
 
 register_middleware(app, settings)
@@ -5,9 +5,17 @@ from typing import Dict, Type
 from app.db.base import Base
 
 generated = importlib.import_module('.generated', __name__)
+# Registers search-index DDL on the assets table; import for side effects.
+importlib.import_module('.search', __name__)
+# Attaches the composite filter indexes to the assets table.
+importlib.import_module('.indexes', __name__)
+derived = importlib.import_module('.derived', __name__)
 MODEL_REGISTRY: Dict[str, Type[Base]] = generated.MODEL_REGISTRY
 __all__ = list(generated.__all__)
 for name in __all__:
     globals()[name] = getattr(generated, name)
+for name in derived.__all__:
+    globals()[name] = getattr(derived, name)
+__all__ += list(derived.__all__)
 
 METADATA = Base.metadata
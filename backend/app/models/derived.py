@@ -0,0 +1,78 @@
+"""Tables derived from the legacy schema and maintained by this backend.
+
+They hold no source-of-truth data: every row can be rebuilt from the tables in
+:mod:`app.models.generated`.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class AssetsClosure(Base):
+    """Transitive closure of ``assets.assets_linkedTo`` (case → kit → item).
+
+    One row per ancestor/descendant pair, including each asset paired with
+    itself at depth 0, so both subtree and "which case is this in?" lookups are
+    single indexed reads.
+    """
+
+    __tablename__ = "assetsClosure"
+
+    ancestor_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    descendant_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_assetsClosure_descendant", "descendant_id", "depth"),)
+
+
+class AssetCurrentLocation(Base):
+    """Latest barcode scan per asset, so "where is it now?" never sorts scan history.
+
+    Upserted by scan ingestion, which only lets a newer scan replace an older
+    one; ``python -m app.db.current_location`` rebuilds it from
+    ``assetsBarcodesScans``.
+    """
+
+    __tablename__ = "asset_current_location"
+
+    assets_id = Column(Integer, primary_key=True)
+    assetsBarcodes_id = Column(Integer, nullable=False)
+    scanned_at = Column(DateTime, nullable=False)
+    locations_id = Column(Integer)
+    location_assets_id = Column(Integer)
+    custom_location = Column(String(500))
+
+    __table_args__ = (
+        Index("ix_asset_current_location_location", "locations_id"),
+        Index("ix_asset_current_location_container", "location_assets_id"),
+    )
+
+
+class SearchDocument(Base):
+    """One searchable document per asset, asset type, project, client or user.
+
+    Kept current by the flush listener in :mod:`app.db.search_index`; the
+    full-text index over ``title`` and ``body`` is dialect-specific DDL from
+    :mod:`app.models.search`.
+    """
+
+    __tablename__ = "search_documents"
+
+    search_documents_id = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String(32), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    instances_id = Column(Integer)
+    title = Column(String(500), nullable=False)
+    body = Column(Text, nullable=False, default="")
+
+    __table_args__ = (
+        UniqueConstraint("entity", "entity_id", name="uq_search_documents_entity"),
+        Index("ix_search_documents_instance", "instances_id"),
+    )
+
+
+__all__ = ["AssetsClosure", "AssetCurrentLocation", "SearchDocument"]
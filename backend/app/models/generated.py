@@ -485,6 +485,8 @@ class Projects(Base):
     projects_dates_use_end = Column(DateTime)
     projects_dates_deliver_start = Column(DateTime)
     projects_dates_deliver_end = Column(DateTime)
+    projects_dates_finances_days = Column(SmallInteger)
+    projects_dates_finances_weeks = Column(SmallInteger)
     projects_status = Column(SmallInteger, nullable=False)
     locations_id = Column(Integer, ForeignKey("locations.locations_id", ondelete="SET NULL", onupdate="CASCADE"))
     projects_invoiceNotes = Column(Text)
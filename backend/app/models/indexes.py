@@ -0,0 +1,68 @@
+"""Secondary indexes for the asset list filters, facet counts and barcode lookups.
+
+Every list query is scoped to one instance and almost always excludes deleted
+rows, so both columns lead; the trailing column serves the filter or group-by
+being applied. Migrations ``0004_asset_filter_indexes`` and
+``0005_barcode_value_index`` create the same set.
+
+:data:`TENANT_INDEXES` (migration ``0009_tenant_indexes``) extend the same
+layout to the other tenant-scoped tables. The partial ones cover live rows
+only, so a small instance's lookups walk an index sized by its own live data
+rather than every instance's history.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Index, false
+
+from app.models.generated import Assets, AssetsAssignments, AssetsBarcodes, AssetTypes, Clients, Locations, Projects
+
+ASSET_FILTER_INDEXES: tuple[Index, ...] = (
+    Index("ix_assets_instance_deleted_id", Assets.instances_id, Assets.assets_deleted, Assets.assets_id),
+    Index("ix_assets_instance_deleted_type", Assets.instances_id, Assets.assets_deleted, Assets.assetTypes_id),
+    Index(
+        "ix_assets_instance_deleted_location",
+        Assets.instances_id,
+        Assets.assets_deleted,
+        Assets.assets_storageLocation,
+    ),
+)
+
+# Barcode lookups are exact matches on the scanned value.
+BARCODE_VALUE_INDEX = Index("ix_assetsBarcodes_value", AssetsBarcodes.assetsBarcodes_value)
+
+
+
+def _live(column: Any) -> dict[str, Any]:
+    """Partial-index predicate for rows whose soft-delete flag is unset."""
+
+    predicate = column == false()
+    return {"postgresql_where": predicate, "sqlite_where": predicate}
+
+
+TENANT_INDEXES: tuple[Index, ...] = (
+    Index("ix_assets_instance_live", Assets.instances_id, Assets.assets_id, **_live(Assets.assets_deleted)),
+    Index(
+        "ix_projects_instance_live", Projects.instances_id, Projects.projects_id, **_live(Projects.projects_deleted)
+    ),
+    Index("ix_clients_instance_live", Clients.instances_id, Clients.clients_name, **_live(Clients.clients_deleted)),
+    Index(
+        "ix_locations_instance_live",
+        Locations.instances_id,
+        Locations.locations_id,
+        **_live(Locations.locations_deleted),
+    ),
+    # Shared types have a NULL instance, so this one keeps every row.
+    Index("ix_assetTypes_instance", AssetTypes.instances_id, AssetTypes.assetTypes_id),
+    # Assignments carry no instance of their own; tenants reach them through their projects.
+    Index(
+        "ix_assetsAssignments_project_live",
+        AssetsAssignments.projects_id,
+        AssetsAssignments.assets_id,
+        **_live(AssetsAssignments.assetsAssignments_deleted),
+    ),
+)
+
+__all__ = ["ASSET_FILTER_INDEXES", "BARCODE_VALUE_INDEX", "TENANT_INDEXES"]
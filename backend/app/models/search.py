@@ -0,0 +1,226 @@
+"""Search-index DDL for the assets table and the global search documents.
+
+SQLite keeps an FTS5 trigram shadow table (``assets_search``) in sync through
+triggers; PostgreSQL uses a pg_trgm GIN index over the same document
+expression, so no extra bookkeeping is needed there.
+
+``search_documents`` is indexed the same way per dialect: an external-content
+FTS5 table fed by triggers on SQLite, a GIN index over a ``tsvector``
+expression on PostgreSQL.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from functools import lru_cache
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import Connection, event, func, literal_column
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.derived import SearchDocument
+from app.models.generated import Assets
+
+ASSET_SEARCH_TABLE = "assets_search"
+ASSET_SEARCH_TRGM_INDEX = "ix_assets_search_trgm"
+SEARCH_DOCUMENTS_FTS_TABLE = "search_documents_fts"
+SEARCH_DOCUMENTS_TSV_INDEX = "ix_search_documents_tsv"
+ASSET_SEARCH_COLUMN_NAMES: tuple[str, ...] = (
+    "assets_tag",
+    "assets_notes",
+    *(f"asset_definableFields_{index}" for index in range(1, 11)),
+)
+
+
+@lru_cache(maxsize=1)
+def sqlite_supports_fts5_trigram() -> bool:
+    """Return True when the bundled SQLite can build trigram FTS5 tables."""
+
+    try:
+        with closing(sqlite3.connect(":memory:")) as connection:
+            connection.execute("CREATE VIRTUAL TABLE probe USING fts5(document, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=1)
+def sqlite_supports_fts5() -> bool:
+    """Return True when the bundled SQLite was compiled with FTS5."""
+
+    try:
+        with closing(sqlite3.connect(":memory:")) as connection:
+            connection.execute("CREATE VIRTUAL TABLE probe USING fts5(document)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def search_document_vector() -> ColumnElement[Any]:
+    """Return the ``tsvector`` expression served by ``ix_search_documents_tsv``."""
+
+    table = SearchDocument.__table__
+    text = table.c.title.op("||")(literal_column("' '")).op("||")(table.c.body)
+    return func.to_tsvector(literal_column("'simple'"), text)
+
+
+def asset_search_document() -> ColumnElement[Any]:
+    """Return the lower-cased document expression indexed on PostgreSQL.
+
+    Separators are rendered as literals rather than bound parameters so the
+    planner can match the expression against ``ix_assets_search_trgm``.
+    """
+
+    pieces = [
+        func.coalesce(Assets.__table__.c[name], literal_column("''"))
+        for name in ASSET_SEARCH_COLUMN_NAMES
+    ]
+    document: ColumnElement[Any] = pieces[0]
+    for piece in pieces[1:]:
+        document = document.op("||")(literal_column("' '")).op("||")(piece)
+    return func.lower(document)
+
+
+def _sql_document(alias: str) -> str:
+    return " || ' ' || ".join(
+        f'coalesce({alias}."{name}", \'\')' for name in ASSET_SEARCH_COLUMN_NAMES
+    )
+
+
+_COLUMN_LIST = ", ".join(f'"{name}"' for name in ASSET_SEARCH_COLUMN_NAMES)
+
+SQLITE_CREATE_STATEMENTS: tuple[str, ...] = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {ASSET_SEARCH_TABLE} "
+    "USING fts5(document, tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {ASSET_SEARCH_TABLE}_ai AFTER INSERT ON assets BEGIN "
+    f"INSERT INTO {ASSET_SEARCH_TABLE}(rowid, document) VALUES (new.assets_id, {_sql_document('new')}); "
+    "END",
+    f"CREATE TRIGGER IF NOT EXISTS {ASSET_SEARCH_TABLE}_ad AFTER DELETE ON assets BEGIN "
+    f"DELETE FROM {ASSET_SEARCH_TABLE} WHERE rowid = old.assets_id; "
+    "END",
+    f"CREATE TRIGGER IF NOT EXISTS {ASSET_SEARCH_TABLE}_au AFTER UPDATE OF assets_id, {_COLUMN_LIST} "
+    "ON assets BEGIN "
+    f"DELETE FROM {ASSET_SEARCH_TABLE} WHERE rowid = old.assets_id; "
+    f"INSERT INTO {ASSET_SEARCH_TABLE}(rowid, document) VALUES (new.assets_id, {_sql_document('new')}); "
+    "END",
+    f"INSERT INTO {ASSET_SEARCH_TABLE}(rowid, document) "
+    f"SELECT assets.assets_id, {_sql_document('assets')} FROM assets",
+)
+SQLITE_DROP_STATEMENTS: tuple[str, ...] = (
+    f"DROP TRIGGER IF EXISTS {ASSET_SEARCH_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {ASSET_SEARCH_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {ASSET_SEARCH_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {ASSET_SEARCH_TABLE}",
+)
+POSTGRES_CREATE_STATEMENTS: tuple[str, ...] = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS {ASSET_SEARCH_TRGM_INDEX} ON assets "
+    f"USING gin ((lower({_sql_document('assets')})) gin_trgm_ops)",
+)
+POSTGRES_DROP_STATEMENTS: tuple[str, ...] = (
+    f"DROP INDEX IF EXISTS {ASSET_SEARCH_TRGM_INDEX}",
+)
+
+
+_FTS = SEARCH_DOCUMENTS_FTS_TABLE
+SQLITE_DOCUMENTS_CREATE_STATEMENTS: tuple[str, ...] = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS} USING fts5(title, body, "
+    "content='search_documents', content_rowid='search_documents_id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS {_FTS}_ai AFTER INSERT ON search_documents BEGIN "
+    f"INSERT INTO {_FTS}(rowid, title, body) VALUES (new.search_documents_id, new.title, new.body); "
+    "END",
+    f"CREATE TRIGGER IF NOT EXISTS {_FTS}_ad AFTER DELETE ON search_documents BEGIN "
+    f"INSERT INTO {_FTS}({_FTS}, rowid, title, body) "
+    "VALUES ('delete', old.search_documents_id, old.title, old.body); "
+    "END",
+    f"CREATE TRIGGER IF NOT EXISTS {_FTS}_au AFTER UPDATE ON search_documents BEGIN "
+    f"INSERT INTO {_FTS}({_FTS}, rowid, title, body) "
+    "VALUES ('delete', old.search_documents_id, old.title, old.body); "
+    f"INSERT INTO {_FTS}(rowid, title, body) VALUES (new.search_documents_id, new.title, new.body); "
+    "END",
+)
+SQLITE_DOCUMENTS_DROP_STATEMENTS: tuple[str, ...] = (
+    f"DROP TRIGGER IF EXISTS {_FTS}_au",
+    f"DROP TRIGGER IF EXISTS {_FTS}_ad",
+    f"DROP TRIGGER IF EXISTS {_FTS}_ai",
+    f"DROP TABLE IF EXISTS {_FTS}",
+)
+POSTGRES_DOCUMENTS_CREATE_STATEMENTS: tuple[str, ...] = (
+    f"CREATE INDEX IF NOT EXISTS {SEARCH_DOCUMENTS_TSV_INDEX} ON search_documents "
+    "USING gin (to_tsvector('simple', title || ' ' || body))",
+)
+POSTGRES_DOCUMENTS_DROP_STATEMENTS: tuple[str, ...] = (
+    f"DROP INDEX IF EXISTS {SEARCH_DOCUMENTS_TSV_INDEX}",
+)
+
+
+def _listen_ddl(
+    table: Any, create: Sequence[str], drop: Sequence[str], applies: Callable[[Connection], bool]
+) -> None:
+    """Run *create* after ``create_all`` builds *table* and *drop* before ``drop_all`` drops it.
+
+    Both only run on connections for which *applies* is true.
+    """
+
+    def after_create(target: Any, connection: Connection, **kw: Any) -> None:
+        if applies(connection):
+            for statement in create:
+                connection.exec_driver_sql(statement)
+
+    def before_drop(target: Any, connection: Connection, **kw: Any) -> None:
+        if applies(connection):
+            for statement in drop:
+                connection.exec_driver_sql(statement)
+
+    event.listen(table, "after_create", after_create)
+    event.listen(table, "before_drop", before_drop)
+
+
+def _is_postgresql(connection: Connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+
+def _is_sqlite_with_fts5(connection: Connection) -> bool:
+    return connection.dialect.name == "sqlite" and sqlite_supports_fts5_trigram()
+
+
+_listen_ddl(Assets.__table__, SQLITE_CREATE_STATEMENTS, SQLITE_DROP_STATEMENTS, _is_sqlite_with_fts5)
+_listen_ddl(Assets.__table__, POSTGRES_CREATE_STATEMENTS, POSTGRES_DROP_STATEMENTS, _is_postgresql)
+
+
+def _is_sqlite_with_plain_fts5(connection: Connection) -> bool:
+    return connection.dialect.name == "sqlite" and sqlite_supports_fts5()
+
+
+def search_documents_ddl(dialect_name: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Return the ``(create, drop)`` index statements for ``search_documents`` on *dialect_name*.
+
+    Shared by ``create_all`` and migration ``0008_search_documents``.
+    """
+
+    if dialect_name == "postgresql":
+        return POSTGRES_DOCUMENTS_CREATE_STATEMENTS, POSTGRES_DOCUMENTS_DROP_STATEMENTS
+    if dialect_name == "sqlite" and sqlite_supports_fts5():
+        return SQLITE_DOCUMENTS_CREATE_STATEMENTS, SQLITE_DOCUMENTS_DROP_STATEMENTS
+    return (), ()
+
+
+_documents = SearchDocument.__table__
+_listen_ddl(_documents, SQLITE_DOCUMENTS_CREATE_STATEMENTS, SQLITE_DOCUMENTS_DROP_STATEMENTS, _is_sqlite_with_plain_fts5)
+_listen_ddl(_documents, POSTGRES_DOCUMENTS_CREATE_STATEMENTS, POSTGRES_DOCUMENTS_DROP_STATEMENTS, _is_postgresql)
+
+
+__all__ = [
+    "ASSET_SEARCH_TABLE",
+    "ASSET_SEARCH_TRGM_INDEX",
+    "ASSET_SEARCH_COLUMN_NAMES",
+    "SEARCH_DOCUMENTS_FTS_TABLE",
+    "SEARCH_DOCUMENTS_TSV_INDEX",
+    "asset_search_document",
+    "search_document_vector",
+    "search_documents_ddl",
+    "sqlite_supports_fts5",
+    "sqlite_supports_fts5_trigram",
+]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Any, Iterable
 
 HAS_PROMETHEUS = True
 
@@ -11,6 +11,9 @@ except ModuleNotFoundError:  # pragma: no cover - fallback for lightweight envir
     CollectorRegistry = dict  # type: ignore[misc,assignment]
 
     class _Counter(dict):  # type: ignore[override]
+        def inc(self, amount: float = 1.0) -> None:
+            self["value"] = self.get("value", 0) + amount
+
         def labels(self, **kwargs):
             key = tuple(sorted(kwargs.items()))
             self.setdefault(key, 0)
@@ -44,10 +47,30 @@ except ModuleNotFoundError:  # pragma: no cover - fallback for lightweight envir
         def set(self, value: float) -> None:
             self["value"] = value
 
+        def labels(self, **kwargs: str) -> _GaugeRecorder:
+            key = tuple(sorted(kwargs.items()))
+            self.setdefault(key, 0)
+            return _GaugeRecorder(self, key)
+
+    class _GaugeRecorder:
+        def __init__(self, store: dict[Any, Any], store_key: tuple[tuple[str, str], ...]) -> None:
+            self._store = store
+            self._key = store_key
+
+        def inc(self, amount: float = 1.0) -> None:
+            self._store[self._key] = self._store.get(self._key, 0) + amount
+
     _fallback_metric_names = [
         "integration_runs_total",
         "integration_duration_seconds",
         "integration_queue_depth",
+        "db_pool_events_total",
+        "db_pool_checked_out",
+        "db_pool_connections",
+        "statement_cache_lookups_total",
+        "db_queries_per_request",
+        "db_time_per_request_seconds",
+        "db_slow_queries_total",
     ]
 
     def generate_latest(registry: CollectorRegistry) -> bytes:  # type: ignore[override]
@@ -82,6 +105,55 @@ _queue_depth = Gauge(
     "Approximate depth of the integration queue",
     registry=_registry,
 )
+_db_pool_events = Counter(
+    "db_pool_events_total",
+    "Connection pool events (connect, checkout, checkin, invalidate, close)",
+    labelnames=("engine", "event"),
+    registry=_registry,
+)
+_db_pool_checked_out = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    labelnames=("engine",),
+    registry=_registry,
+)
+_db_pool_connections = Gauge(
+    "db_pool_connections",
+    "Open DBAPI connections owned by the pool",
+    labelnames=("engine",),
+    registry=_registry,
+)
+_statement_cache_lookups = Counter(
+    "statement_cache_lookups_total",
+    "Repository statement template lookups by outcome (hit or miss)",
+    labelnames=("statement", "result"),
+    registry=_registry,
+)
+_request_queries = Histogram(
+    "db_queries_per_request",
+    "Database statements issued while serving one request",
+    labelnames=("method",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+    registry=_registry,
+)
+_request_db_time = Histogram(
+    "db_time_per_request_seconds",
+    "Total time one request spent executing database statements",
+    labelnames=("method",),
+    registry=_registry,
+)
+_slow_queries = Counter(
+    "db_slow_queries_total",
+    "Statements slower than the slow-query threshold",
+    registry=_registry,
+)
+_POOL_GAUGE_DELTAS = {
+    "checkout": (_db_pool_checked_out, 1),
+    "checkin": (_db_pool_checked_out, -1),
+    "connect": (_db_pool_connections, 1),
+    "close": (_db_pool_connections, -1),
+    "close_detached": (_db_pool_connections, -1),
+}
 
 
 def record_integration_result(result: IntegrationResult, duration_seconds: float | None = None) -> None:
@@ -94,6 +166,29 @@ def set_queue_depth(depth: int) -> None:
     _queue_depth.set(depth)
 
 
+def record_pool_event(engine: str, event: str) -> None:
+    """Count a pool event for *engine* and keep the connection gauges in step."""
+
+    _db_pool_events.labels(engine=engine, event=event).inc()
+    gauge_delta = _POOL_GAUGE_DELTAS.get(event)
+    if gauge_delta is not None:
+        gauge, delta = gauge_delta
+        gauge.labels(engine=engine).inc(delta)
+
+
+def record_statement_cache(statement: str, *, hit: bool) -> None:
+    _statement_cache_lookups.labels(statement=statement, result="hit" if hit else "miss").inc()
+
+
+def record_request_queries(method: str, count: int, duration_seconds: float) -> None:
+    _request_queries.labels(method=method).observe(count)
+    _request_db_time.labels(method=method).observe(duration_seconds)
+
+
+def record_slow_query() -> None:
+    _slow_queries.inc()
+
+
 def get_registry() -> CollectorRegistry:
     return _registry
 
@@ -110,6 +205,13 @@ def metrics_summary() -> dict[str, object]:
             "integration_runs_total",
             "integration_duration_seconds",
             "integration_queue_depth",
+            "db_pool_events_total",
+            "db_pool_checked_out",
+            "db_pool_connections",
+            "statement_cache_lookups_total",
+            "db_queries_per_request",
+            "db_time_per_request_seconds",
+            "db_slow_queries_total",
         ]
     }
 
@@ -117,6 +219,10 @@ def metrics_summary() -> dict[str, object]:
 __all__ = [
     "record_integration_result",
     "set_queue_depth",
+    "record_pool_event",
+    "record_statement_cache",
+    "record_request_queries",
+    "record_slow_query",
     "get_registry",
     "render_metrics",
     "metrics_summary",
@@ -1,5 +1,17 @@
 """Repository layer for database access abstractions."""
 
-from app.repositories.assets import AssetsRepository
+from app.repositories.assets import AsyncAssetsRepository
+from app.repositories.availability import AsyncAvailabilityRepository
+from app.repositories.barcodes import AsyncBarcodesRepository, BarcodesRepository
+from app.repositories.finance import FinanceRepository
+from app.repositories.search import AsyncSearchRepository, SearchRepository
 
-__all__ = ["AssetsRepository"]
+__all__ = [
+    "AsyncAssetsRepository",
+    "AsyncAvailabilityRepository",
+    "BarcodesRepository",
+    "AsyncBarcodesRepository",
+    "FinanceRepository",
+    "SearchRepository",
+    "AsyncSearchRepository",
+]
@@ -1,45 +1,469 @@
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Any, AsyncIterator, Iterable, Iterator, Sequence
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import BindParameter, ColumnElement, CompoundSelect, Select, bindparam, case, func, literal, select, text, union_all
+from sqlalchemy.engine import Dialect, RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.generated import Assets
+from app.core.tenancy import current_instance_id
+from app.models.derived import AssetCurrentLocation, AssetsClosure
+from app.models.generated import Assets, AssetTypes
+from app.repositories.search import AssetSearchBackend, resolve_search_backend
+from app.repositories.statements import statement_cache
+from app.schemas.assets import AssetFilters
 
+_TABLE_ESTIMATE = text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'assets'::regclass")
 
-class AssetsRepository:
-    """Data-access helpers for the assets domain."""
+_FILTER_COLUMNS: dict[str, Any] = {
+    "instance_id": Assets.instances_id,
+    "asset_type_id": Assets.assetTypes_id,
+    "storage_location_id": Assets.assets_storageLocation,
+    "deleted": Assets.assets_deleted,
+}
+_LOCATION_COLUMNS: tuple[Any, ...] = (
+    AssetCurrentLocation.assets_id,
+    AssetCurrentLocation.locations_id,
+    AssetCurrentLocation.location_assets_id,
+    AssetCurrentLocation.custom_location,
+    AssetCurrentLocation.scanned_at,
+)
+# Rates, value and mass left unset on an asset come from its type; these are
+# selected under their own names next to plain ``assets`` columns.
+EFFECTIVE_COLUMNS: dict[str, Any] = {
+    "effective_dayRate": func.coalesce(Assets.assets_dayRate, AssetTypes.assetTypes_dayRate),
+    "effective_weekRate": func.coalesce(Assets.assets_weekRate, AssetTypes.assetTypes_weekRate),
+    "effective_value": func.coalesce(Assets.assets_value, AssetTypes.assetTypes_value),
+    "effective_mass": func.coalesce(Assets.assets_mass, AssetTypes.assetTypes_mass),
+}
+_FACET_COLUMNS: dict[str, Any] = {
+    "type": Assets.assetTypes_id,
+    "location": Assets.assets_storageLocation,
+    "category": AssetTypes.assetCategories_id,
+}
 
-    def __init__(self, session: Session) -> None:
+
+def _filter_values(filters: AssetFilters | None) -> dict[str, Any]:
+    return {} if filters is None else filters.model_dump(exclude_none=True)
+
+
+def _filter_params(values: dict[str, Any]) -> dict[str, Any]:
+    # ``archived`` picks IS NULL or IS NOT NULL, so it is part of the shape instead.
+    return {f"filter_{name}": value for name, value in values.items() if name != "archived"}
+
+
+def _filter_shape(values: dict[str, Any]) -> tuple[tuple[str, Any], ...]:
+    return tuple(sorted((name, value if name == "archived" else None) for name, value in values.items()))
+
+
+def asset_columns(names: Iterable[str]) -> list[Any]:
+    """Select list for *names*: ``assets`` columns or :data:`EFFECTIVE_COLUMNS`."""
+
+    table = Assets.__table__
+    return [EFFECTIVE_COLUMNS[name].label(name) if name in EFFECTIVE_COLUMNS else table.c[name] for name in names]
+
+
+def join_asset_types(stmt: Select[Any], names: Iterable[str], *, outer: bool = False) -> Select[Any]:
+    """Join ``assetTypes`` onto *stmt* when any of *names* is an effective column."""
+
+    if not any(name in EFFECTIVE_COLUMNS for name in names):
+        return stmt
+    onclause: ColumnElement[bool] = AssetTypes.assetTypes_id == Assets.assetTypes_id
+    return stmt.outerjoin(AssetTypes, onclause) if outer else stmt.join(AssetTypes, onclause)
+
+
+class _AssetsQueries:
+    """Statement builders for :class:`AsyncAssetsRepository`."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        search_backend: AssetSearchBackend | None = None,
+    ) -> None:
         self._session = session
+        self._search_backend = search_backend
+
+    @property
+    def dialect(self) -> Dialect:
+        return self._session.get_bind().dialect
+
+    @property
+    def search_backend(self) -> AssetSearchBackend:
+        if self._search_backend is None:
+            self._search_backend = resolve_search_backend(self.dialect.name)
+        return self._search_backend
+
+    def _filter(
+        self,
+        stmt: Select[Any],
+        *,
+        search: str | None,
+        ranked: bool = False,
+        filters: AssetFilters | None = None,
+    ) -> Select[Any]:
+        for name, value in _filter_values(filters).items():
+            if name == "archived":
+                archived: ColumnElement[Any] = Assets.assets_archived
+                stmt = stmt.where(archived.is_not(None) if value else archived.is_(None))
+                continue
+            param: BindParameter[Any] = bindparam(f"filter_{name}", value)
+            if name == "current_location_id":
+                located: Select[int] = select(AssetCurrentLocation.assets_id).where(AssetCurrentLocation.locations_id == param)
+                stmt = stmt.where(Assets.assets_id.in_(located))
+            else:
+                stmt = stmt.where(_FILTER_COLUMNS[name] == param)
+        if search:
+            stmt = self.search_backend.apply(stmt, search, ranked=ranked)
+        return stmt
 
-    def list_assets(
+    def _list_statement(
         self,
         *,
         limit: int,
         offset: int,
-        search: str | None = None,
-    ) -> Sequence[Assets]:
-        stmt = select(Assets).order_by(Assets.assets_id).limit(limit).offset(offset)
-        if search:
-            pattern = f"%{search.lower()}%"
-            stmt = stmt.where(
-                func.lower(func.coalesce(Assets.assets_tag, "")).like(pattern)
-            )
-        return list(self._session.execute(stmt).scalars())
+        search: str | None,
+        after_id: int | None,
+        sort: str,
+        columns: Sequence[str],
+        filters: AssetFilters | None = None,
+    ) -> Select[Any]:
+        stmt = self._select(columns).order_by(Assets.assets_id).limit(bindparam("limit", limit))
+        if after_id is not None:
+            stmt = stmt.where(Assets.assets_id > bindparam("after_id", after_id))
+        elif offset:
+            stmt = stmt.offset(bindparam("offset", offset))
+        return self._filter(stmt, search=search, ranked=sort == "relevance", filters=filters)
 
-    def count_assets(self, *, search: str | None = None) -> int:
-        stmt = select(func.count()).select_from(Assets)
-        if search:
-            pattern = f"%{search.lower()}%"
-            stmt = stmt.where(
-                func.lower(func.coalesce(Assets.assets_tag, "")).like(pattern)
+    def _search_params(self, search: str | None) -> tuple[Any, dict[str, Any]]:
+        """Return the search part of a template shape and its parameters."""
+
+        if not search:
+            return None, {}
+        backend = self.search_backend
+        return (backend.name, backend.shape(search)), backend.params(search)
+
+    def _list_query(
+        self,
+        *,
+        limit: int,
+        offset: int,
+        search: str | None,
+        after_id: int | None,
+        sort: str,
+        columns: Sequence[str],
+        filters: AssetFilters | None = None,
+    ) -> tuple[Select[Any], dict[str, Any]]:
+        """Return the cached list template for this request's shape and its parameters."""
+
+        values = _filter_values(filters)
+        search_shape, params = self._search_params(search)
+        shape = (
+            tuple(columns),
+            after_id is not None,
+            after_id is None and bool(offset),
+            bool(search) and sort == "relevance",
+            _filter_shape(values),
+            search_shape,
+        )
+        stmt = statement_cache.get_or_build(
+            "list_assets",
+            shape,
+            lambda: self._list_statement(
+                limit=limit,
+                offset=offset,
+                search=search,
+                after_id=after_id,
+                sort=sort,
+                columns=columns,
+                filters=filters,
+            ),
+        )
+        params.update(_filter_params(values), limit=limit, offset=offset, after_id=after_id)
+        return stmt, params
+
+    @staticmethod
+    def _select(columns: Sequence[str]) -> Select[Any]:
+        # Core column selects skip ORM identity-map hydration entirely.
+        names = dict.fromkeys(("assets_id", *columns))
+        return join_asset_types(select(*asset_columns(names)).select_from(Assets), names)
+
+    def _export_statement(
+        self,
+        *,
+        columns: Sequence[str],
+        search: str | None,
+        after_id: int | None,
+        batch_size: int,
+    ) -> Select[Any]:
+        stmt = self._select(columns).order_by(Assets.assets_id)
+        if after_id is not None:
+            stmt = stmt.where(Assets.assets_id > bindparam("after_id", after_id))
+        # yield_per implies stream_results, i.e. a server-side cursor where supported.
+        return self._filter(stmt, search=search).execution_options(yield_per=batch_size)
+
+    @staticmethod
+    def _tree_nodes(asset_id: int, *, max_depth: int, use_closure: bool) -> Any:
+        """Return ``(node_id, depth)`` rows: the subtree at depth >= 0, containers below 0."""
+
+        if use_closure:
+            closure = AssetsClosure
+            return union_all(
+                select(closure.descendant_id.label("node_id"), closure.depth.label("depth")).where(
+                    closure.ancestor_id == asset_id, closure.depth <= max_depth
+                ),
+                select(closure.ancestor_id, -closure.depth).where(
+                    closure.descendant_id == asset_id, closure.depth > 0, closure.depth <= max_depth
+                ),
+            ).subquery("nodes")
+        table = Assets.__table__
+        down = (
+            select(table.c.assets_id.label("node_id"), literal(0).label("depth"))
+            .where(table.c.assets_id == asset_id)
+            .cte("descendants", recursive=True)
+        )
+        down = down.union_all(
+            select(table.c.assets_id, down.c.depth + 1)
+            .join_from(table, down, table.c.assets_linkedTo == down.c.node_id)
+            .where(down.c.depth < max_depth)
+        )
+        up = (
+            select(table.c.assets_linkedTo.label("node_id"), literal(-1).label("depth"))
+            .where(table.c.assets_id == asset_id, table.c.assets_linkedTo.is_not(None))
+            .cte("ancestors", recursive=True)
+        )
+        # The depth bound also stops the recursion if legacy data contains a cycle.
+        up = up.union_all(
+            select(table.c.assets_linkedTo, up.c.depth - 1)
+            .join_from(table, up, table.c.assets_id == up.c.node_id)
+            .where(table.c.assets_linkedTo.is_not(None), up.c.depth > -max_depth)
+        )
+        return union_all(select(down.c.node_id, down.c.depth), select(up.c.node_id, up.c.depth)).subquery("nodes")
+
+    def _tree_statement(
+        self, asset_id: int, *, columns: Sequence[str], max_depth: int, use_closure: bool
+    ) -> Select[Any]:
+        nodes = self._tree_nodes(asset_id, max_depth=max_depth, use_closure=use_closure)
+        table = Assets.__table__
+        names = dict.fromkeys(("assets_id", "assets_linkedTo", *columns))
+        stmt = select(nodes.c.depth, *asset_columns(names)).join_from(
+            nodes, table, table.c.assets_id == nodes.c.node_id
+        )
+        return join_asset_types(stmt, names).order_by(nodes.c.depth, table.c.assets_id)
+
+    def _row_statement(self, asset_id: int, columns: Sequence[str]) -> Select[Any]:
+        return self._select(columns).where(Assets.assets_id == asset_id)
+
+    def _count_statement(self, *, search: str | None, filters: AssetFilters | None = None) -> Select[Any]:
+        return self._filter(select(func.count()).select_from(Assets), search=search, filters=filters)
+
+    def _count_query(
+        self, *, search: str | None, filters: AssetFilters | None = None
+    ) -> tuple[Select[Any], dict[str, Any]]:
+        values = _filter_values(filters)
+        search_shape, params = self._search_params(search)
+        stmt = statement_cache.get_or_build(
+            "count_assets",
+            (_filter_shape(values), search_shape),
+            lambda: self._count_statement(search=search, filters=filters),
+        )
+        params.update(_filter_params(values))
+        return stmt, params
+
+    def _facet_statement(
+        self,
+        facets: Sequence[str],
+        *,
+        search: str | None,
+        filters: AssetFilters | None = None,
+    ) -> Select[Any] | CompoundSelect[Any]:
+        """Count matches per facet value as ``(facet, value, count)`` rows in one query."""
+
+        columns = {name: _FACET_COLUMNS[name] for name in facets}
+
+        def source(stmt: Select[Any]) -> Select[Any]:
+            stmt = stmt.select_from(Assets)
+            if "category" in columns:
+                stmt = stmt.join(AssetTypes, AssetTypes.assetTypes_id == Assets.assetTypes_id)
+            return self._filter(stmt, search=search, filters=filters)
+
+        if self.dialect.name == "postgresql":
+            # GROUPING(col) is 0 for the grouping set that column belongs to.
+            grouped = [(name, func.grouping(column) == 0, column) for name, column in columns.items()]
+            stmt = select(
+                case(*((is_grouped, literal(name)) for name, is_grouped, _ in grouped)).label("facet"),
+                case(*((is_grouped, column) for _, is_grouped, column in grouped)).label("value"),
+                func.count().label("count"),
+            )
+            return source(stmt).group_by(func.grouping_sets(*columns.values()))
+        return union_all(
+            *(
+                source(
+                    select(
+                        literal(name).label("facet"),
+                        column.label("value"),
+                        func.count().label("count"),
+                    )
+                ).group_by(column)
+                for name, column in columns.items()
             )
-        return int(self._session.execute(stmt).scalar_one())
+        )
+
+    def _batch_statement(self, ids: Iterable[int], columns: Sequence[str]) -> Select[Any]:
+        return self._select(columns).where(Assets.assets_id.in_(list(ids)))
+
+    def _locations_statement(self, ids: Iterable[int]) -> Select[Any]:
+        return select(*_LOCATION_COLUMNS).where(AssetCurrentLocation.assets_id.in_(list(ids)))
+
+    def _explain_statement(
+        self, *, search: str | None, filters: AssetFilters | None = None
+    ) -> tuple[str, dict[str, Any]]:
+        stmt = self._filter(select(Assets.assets_id), search=search, filters=filters)
+        instance_id = current_instance_id()
+        if instance_id is not None:
+            # Compiled for EXPLAIN outside the session, so the tenant criteria must be explicit.
+            stmt = stmt.where(Assets.instances_id == instance_id)
+        compiled = stmt.compile(dialect=self.dialect)
+        return f"EXPLAIN (FORMAT JSON) {compiled}", dict(compiled.params)
+
+
+def _chunked(ids: Sequence[int], size: int) -> Iterator[Sequence[int]]:
+    for start in range(0, len(ids), size):
+        yield ids[start : start + size]
+
+
+def _estimate_from_reltuples(estimate: Any) -> int | None:
+    # reltuples is -1 until the table has been vacuumed or analysed.
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+
+def _estimate_from_plan(plan: Any) -> int:
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class AsyncAssetsRepository(_AssetsQueries):
+    """Data-access helpers for the assets domain on an ``AsyncSession``."""
+
+    _session: AsyncSession
+
+    def __init__(
+        self, session: AsyncSession, *, search_backend: AssetSearchBackend | None = None
+    ) -> None:
+        super().__init__(session, search_backend=search_backend)
+
+    async def list_asset_rows(
+        self,
+        *,
+        columns: Sequence[str],
+        limit: int,
+        offset: int = 0,
+        search: str | None = None,
+        after_id: int | None = None,
+        sort: str = "id",
+        filters: AssetFilters | None = None,
+    ) -> Sequence[RowMapping]:
+        """Return one page of *columns* (plus ``assets_id``) as row mappings."""
+
+        stmt, params = self._list_query(
+            limit=limit,
+            offset=offset,
+            search=search,
+            after_id=after_id,
+            sort=sort,
+            columns=columns,
+            filters=filters,
+        )
+        return list((await self._session.execute(stmt, params)).mappings())
+
+    async def count_assets(
+        self, *, search: str | None = None, filters: AssetFilters | None = None
+    ) -> int:
+        stmt, params = self._count_query(search=search, filters=filters)
+        return int((await self._session.execute(stmt, params)).scalar_one())
+
+    async def estimate_assets(
+        self, *, search: str | None = None, filters: AssetFilters | None = None
+    ) -> int | None:
+        """Return a planner-statistics row estimate, or ``None`` when unsupported."""
+
+        if self.dialect.name != "postgresql":
+            return None
+        if not search and filters is None and current_instance_id() is None:
+            result = await self._session.execute(_TABLE_ESTIMATE)
+            return _estimate_from_reltuples(result.scalar_one_or_none())
+        sql, params = self._explain_statement(search=search, filters=filters)
+        connection = await self._session.connection()
+        plan = (await connection.exec_driver_sql(sql, params)).scalar_one()
+        return _estimate_from_plan(plan)
+
+    async def get_asset_tree(
+        self, asset_id: int, *, columns: Sequence[str], max_depth: int, use_closure: bool = False
+    ) -> Sequence[RowMapping]:
+        """Return the subtree and containers of *asset_id* in one query, ordered by depth."""
+
+        stmt = self._tree_statement(asset_id, columns=columns, max_depth=max_depth, use_closure=use_closure)
+        return list((await self._session.execute(stmt)).mappings())
+
+    async def list_asset_ids(self, *, filters: AssetFilters | None = None) -> list[int]:
+        stmt = self._filter(select(Assets.assets_id).order_by(Assets.assets_id), search=None, filters=filters)
+        return list((await self._session.execute(stmt)).scalars())
+
+    async def facet_counts(
+        self,
+        facets: Sequence[str],
+        *,
+        search: str | None = None,
+        filters: AssetFilters | None = None,
+    ) -> Sequence[RowMapping]:
+        stmt = self._facet_statement(facets, search=search, filters=filters)
+        return list((await self._session.execute(stmt)).mappings())
+
+    async def get_asset_row(self, asset_id: int, columns: Sequence[str]) -> RowMapping | None:
+        result = await self._session.execute(self._row_statement(asset_id, columns))
+        row: RowMapping | None = result.mappings().one_or_none()
+        return row
+
+    async def stream_asset_rows(
+        self,
+        *,
+        columns: Sequence[str],
+        search: str | None = None,
+        after_id: int | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """Yield batches of at most *batch_size* rows ordered by ``assets_id``."""
+
+        stmt = self._export_statement(
+            columns=columns, search=search, after_id=after_id, batch_size=batch_size
+        )
+        result = await self._session.stream(stmt)
+        async for partition in result.mappings().partitions():
+            yield partition
+
+    async def current_locations(
+        self, asset_ids: Sequence[int], *, chunk_size: int = 100
+    ) -> dict[int, RowMapping]:
+        """Return the latest scanned location of each asset that has one."""
+
+        locations: dict[int, RowMapping] = {}
+        for chunk in _chunked(asset_ids, chunk_size):
+            for row in (await self._session.execute(self._locations_statement(chunk))).mappings():
+                locations[row["assets_id"]] = row
+        return locations
 
-    def get_asset(self, asset_id: int) -> Assets | None:
-        return self._session.get(Assets, asset_id)
+    async def get_asset_rows(
+        self, asset_ids: Sequence[int], columns: Sequence[str], *, chunk_size: int = 100
+    ) -> list[RowMapping]:
+        rows: list[RowMapping] = []
+        for chunk in _chunked(asset_ids, chunk_size):
+            result = await self._session.execute(self._batch_statement(chunk, columns))
+            rows.extend(result.mappings())
+        return rows
 
 
-__all__ = ["AssetsRepository"]
+__all__ = [
+    "AsyncAssetsRepository",
+    "EFFECTIVE_COLUMNS",
+    "asset_columns",
+    "join_asset_types",
+]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import ColumnElement, Select, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.tenancy import ALL_TENANTS_OPTION
+from app.models.generated import AssetsAssignments, Projects
+
+# The availability index is shared by every tenant, so it is loaded across all of them;
+# callers narrow the answer to the request's own assets.
+_ALL_TENANTS = {ALL_TENANTS_OPTION: True}
+
+
+def _project_windows_statement() -> Select[int, datetime, datetime]:
+    return (
+        select(
+            Projects.projects_id,
+            Projects.projects_dates_deliver_start,
+            Projects.projects_dates_deliver_end,
+        )
+        .where(
+            Projects.projects_deleted.is_(False),
+            Projects.projects_dates_deliver_start.is_not(None),
+            Projects.projects_dates_deliver_end.is_not(None),
+        )
+        .execution_options(**_ALL_TENANTS)
+    )
+
+
+def _assignments_statement() -> Select[int, int, int]:
+    return (
+        select(
+            AssetsAssignments.assetsAssignments_id,
+            AssetsAssignments.assets_id,
+            AssetsAssignments.projects_id,
+        )
+        .where(AssetsAssignments.assetsAssignments_deleted.is_(False))
+        .execution_options(**_ALL_TENANTS)
+    )
+
+
+def _fingerprint_statement() -> Select[int, int, int, int]:
+    live_assignments: ColumnElement[bool] = AssetsAssignments.assetsAssignments_deleted.is_(False)
+    live_projects: ColumnElement[bool] = Projects.projects_deleted.is_(False)
+    return select(
+        select(func.count()).select_from(AssetsAssignments).where(live_assignments).scalar_subquery(),
+        select(func.max(AssetsAssignments.assetsAssignments_id)).where(live_assignments).scalar_subquery(),
+        select(func.count()).select_from(Projects).where(live_projects).scalar_subquery(),
+        select(func.max(Projects.projects_id)).where(live_projects).scalar_subquery(),
+    ).execution_options(**_ALL_TENANTS)
+
+
+class AsyncAvailabilityRepository:
+    """Reads the project delivery windows and live assignments behind availability."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def project_windows(self) -> Sequence[Row[Any]]:
+        """Return ``(projects_id, deliver_start, deliver_end)`` for live, dated projects."""
+
+        return list(await self._session.execute(_project_windows_statement()))
+
+    async def assignments(self) -> Sequence[Row[Any]]:
+        """Return ``(assetsAssignments_id, assets_id, projects_id)`` for live assignments."""
+
+        return list(await self._session.execute(_assignments_statement()))
+
+    async def fingerprint(self) -> tuple[Any, ...]:
+        """Return live-row counts and highest ids of projects and assignments.
+
+        Cheap enough to run every few seconds; it moves whenever rows are
+        added, hard- or soft-deleted, but not when a project's dates change.
+        """
+
+        return tuple((await self._session.execute(_fingerprint_statement())).one())
+
+
+__all__ = ["AsyncAvailabilityRepository"]
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable, Mapping, Sequence
+
+from sqlalchemy import Insert, Select, Update, bindparam, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.derived import AssetCurrentLocation
+from app.models.generated import Assets, AssetsBarcodes, AssetsBarcodesScans, LocationsBarcodes
+from app.repositories.assets import asset_columns as select_asset_columns
+from app.repositories.assets import join_asset_types
+
+_LOCATION_UPDATE_COLUMNS = (
+    "assetsBarcodes_id",
+    "scanned_at",
+    "locations_id",
+    "location_assets_id",
+    "custom_location",
+)
+
+
+def _lookup_statement(
+    values: Iterable[str], asset_columns: Sequence[str], instance_id: int | None = None
+) -> Select[Any]:
+    names = dict.fromkeys(("assets_id", *asset_columns))
+    stmt = select(AssetsBarcodes, *select_asset_columns(names)).outerjoin(
+        Assets, Assets.assets_id == AssetsBarcodes.assets_id
+    )
+    stmt = (
+        join_asset_types(stmt, names, outer=True)
+        .where(
+            AssetsBarcodes.assetsBarcodes_value.in_(list(values)),
+            or_(AssetsBarcodes.assetsBarcodes_deleted.is_(None), AssetsBarcodes.assetsBarcodes_deleted.is_(False)),
+        )
+        .order_by(AssetsBarcodes.assetsBarcodes_id)
+    )
+    if instance_id is not None:
+        # Barcodes carry no instance and the tenant criteria only narrow the outer join,
+        # so a scoped lookup keeps just the barcodes of the instance's own assets.
+        stmt = stmt.where(Assets.instances_id == bindparam("lookup_instance_id", instance_id))
+    return stmt
+
+
+def _scans_statement() -> Insert:
+    return insert(AssetsBarcodesScans)
+
+
+def _location_ids_statement(location_barcode_ids: Iterable[int]) -> Select[int, int]:
+    return select(LocationsBarcodes.locationsBarcodes_id, LocationsBarcodes.locations_id).where(
+        LocationsBarcodes.locationsBarcodes_id.in_(list(location_barcode_ids))
+    )
+
+
+def _upsert_arguments(excluded: Any) -> dict[str, Any]:
+    return {
+        "index_elements": [AssetCurrentLocation.assets_id],
+        "set_": {name: excluded[name] for name in _LOCATION_UPDATE_COLUMNS},
+        "where": excluded.scanned_at >= AssetCurrentLocation.scanned_at,
+    }
+
+
+def _current_location_upsert(dialect_name: str) -> Insert | None:
+    """Upsert into ``asset_current_location`` that never lets an older scan win.
+
+    Returns ``None`` for dialects without ``ON CONFLICT``; callers then fall
+    back to :func:`_split_current_locations`.
+    """
+
+    if dialect_name == "postgresql":
+        pg_stmt = postgresql.insert(AssetCurrentLocation)
+        return pg_stmt.on_conflict_do_update(**_upsert_arguments(pg_stmt.excluded))
+    if dialect_name == "sqlite":
+        sqlite_stmt = sqlite.insert(AssetCurrentLocation)
+        return sqlite_stmt.on_conflict_do_update(**_upsert_arguments(sqlite_stmt.excluded))
+    return None
+
+
+def _current_scans_statement(asset_ids: Iterable[int]) -> Select[int, datetime]:
+    return select(AssetCurrentLocation.assets_id, AssetCurrentLocation.scanned_at).where(
+        AssetCurrentLocation.assets_id.in_(list(asset_ids))
+    )
+
+
+def _current_location_update() -> Update:
+    # core_only runs one executemany UPDATE with this WHERE clause instead of the
+    # ORM's bulk update by primary key, while change tracking still sees the entity.
+    return (
+        update(AssetCurrentLocation)
+        .where(
+            AssetCurrentLocation.assets_id == bindparam("current_assets_id"),
+            AssetCurrentLocation.scanned_at <= bindparam("current_scanned_at"),
+        )
+        .execution_options(dml_strategy="core_only")
+    )
+
+
+def _split_current_locations(
+    rows: Sequence[Mapping[str, Any]], stored: Mapping[int, datetime]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Split *rows* into inserts and updates given the stored scan time per asset.
+
+    Rows older than the stored scan are dropped; the update's WHERE clause
+    repeats that check in case another writer got there first.
+    """
+
+    inserts: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
+    for row in rows:
+        scanned_at = stored.get(row["assets_id"])
+        if scanned_at is None:
+            inserts.append(dict(row))
+        elif row["scanned_at"] >= scanned_at:
+            values = {name: row[name] for name in _LOCATION_UPDATE_COLUMNS}
+            updates.append({**values, "current_assets_id": row["assets_id"], "current_scanned_at": row["scanned_at"]})
+    return inserts, updates
+
+
+class BarcodesRepository:
+    """Data-access helpers for asset barcodes and their scans."""
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def find_by_values(
+        self, values: Iterable[str], asset_columns: Sequence[str], *, instance_id: int | None = None
+    ) -> Sequence[Row[Any]]:
+        """Return ``(AssetsBarcodes, *asset_columns)`` rows for live barcodes matching *values*.
+
+        Asset columns are ``None`` for barcodes not attached to an asset. With
+        *instance_id*, only barcodes of that instance's assets are returned.
+        """
+
+        return self._session.execute(_lookup_statement(values, asset_columns, instance_id)).all()
+
+    def insert_scans(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Insert scan rows in one executemany round trip."""
+
+        self._session.execute(_scans_statement(), list(rows))
+
+    def location_ids(self, location_barcode_ids: Iterable[int]) -> dict[int, int]:
+        """Map location barcode ids to the locations they label."""
+
+        result = self._session.execute(_location_ids_statement(location_barcode_ids))
+        return {barcode_id: location_id for barcode_id, location_id in result}
+
+    def upsert_current_locations(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        stmt = _current_location_upsert(self._session.get_bind().dialect.name)
+        if stmt is not None:
+            self._session.execute(stmt, list(rows))
+            return
+        stored = self._session.execute(_current_scans_statement(row["assets_id"] for row in rows))
+        inserts, updates = _split_current_locations(rows, {asset_id: scanned_at for asset_id, scanned_at in stored})
+        if inserts:
+            self._session.execute(insert(AssetCurrentLocation), inserts)
+        if updates:
+            self._session.execute(_current_location_update(), updates)
+
+    def commit(self) -> None:
+        self._session.commit()
+
+
+class AsyncBarcodesRepository:
+    """Async counterpart of :class:`BarcodesRepository`."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def find_by_values(
+        self, values: Iterable[str], asset_columns: Sequence[str], *, instance_id: int | None = None
+    ) -> Sequence[Row[Any]]:
+        return list(await self._session.execute(_lookup_statement(values, asset_columns, instance_id)))
+
+    async def insert_scans(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        await self._session.execute(_scans_statement(), list(rows))
+
+    async def location_ids(self, location_barcode_ids: Iterable[int]) -> dict[int, int]:
+        result = await self._session.execute(_location_ids_statement(location_barcode_ids))
+        return {barcode_id: location_id for barcode_id, location_id in result}
+
+    async def upsert_current_locations(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        stmt = _current_location_upsert(self._session.get_bind().dialect.name)
+        if stmt is not None:
+            await self._session.execute(stmt, list(rows))
+            return
+        stored = await self._session.execute(_current_scans_statement(row["assets_id"] for row in rows))
+        inserts, updates = _split_current_locations(rows, {asset_id: scanned_at for asset_id, scanned_at in stored})
+        if inserts:
+            await self._session.execute(insert(AssetCurrentLocation), inserts)
+        if updates:
+            await self._session.execute(_current_location_update(), updates)
+
+    async def commit(self) -> None:
+        await self._session.commit()
+
+
+__all__ = ["BarcodesRepository", "AsyncBarcodesRepository"]
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import Select, Update, bindparam, func, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core.finance import ProjectTotals
+from app.models.generated import Assets, AssetsAssignments, AssetTypes, Projects, ProjectsFinanceCache
+
+
+def _periods_statement(project_ids: Sequence[int]) -> Select[int, datetime, datetime, int, int]:
+    return select(
+        Projects.projects_id,
+        Projects.projects_dates_deliver_start,
+        Projects.projects_dates_deliver_end,
+        Projects.projects_dates_finances_days,
+        Projects.projects_dates_finances_weeks,
+    ).where(Projects.projects_id.in_(project_ids), Projects.projects_deleted.is_(False))
+
+
+def _lines_statement(project_ids: Sequence[int]) -> Select[int, Any, Any, Any, Any, int, float]:
+    # Rates, value and mass fall back to the asset type when the asset leaves them unset.
+    return (
+        select(
+            AssetsAssignments.projects_id,
+            func.coalesce(Assets.assets_dayRate, AssetTypes.assetTypes_dayRate),
+            func.coalesce(Assets.assets_weekRate, AssetTypes.assetTypes_weekRate),
+            func.coalesce(Assets.assets_value, AssetTypes.assetTypes_value),
+            func.coalesce(Assets.assets_mass, AssetTypes.assetTypes_mass, 0),
+            AssetsAssignments.assetsAssignments_customPrice,
+            AssetsAssignments.assetsAssignments_discount,
+        )
+        .join(Assets, Assets.assets_id == AssetsAssignments.assets_id)
+        .join(AssetTypes, AssetTypes.assetTypes_id == Assets.assetTypes_id)
+        .where(
+            AssetsAssignments.projects_id.in_(project_ids),
+            AssetsAssignments.assetsAssignments_deleted.is_(False),
+        )
+    )
+
+
+def _cache_update() -> Update:
+    """Overwrite the equipment columns of one cache row and re-derive its grand total.
+
+    ``projectFinanceCacher::save()`` keeps ``grandTotal`` equal to the
+    equipment total plus sales, staff and external hires, less payments
+    received; those other columns are maintained by the PHP payment screens.
+    """
+
+    cache = ProjectsFinanceCache
+    return (
+        update(cache)
+        .where(cache.projectsFinanceCache_id == bindparam("cache_id"))
+        .values(
+            projectsFinanceCache_grandTotal=bindparam("equipment_total")
+            + func.coalesce(cache.projectsFinanceCache_salesTotal, 0)
+            + func.coalesce(cache.projectsFinanceCache_staffTotal, 0)
+            + func.coalesce(cache.projectsFinanceCache_externalHiresTotal, 0)
+            - func.coalesce(cache.projectsFinanceCache_paymentsReceived, 0)
+        )
+        # One executemany UPDATE with the expression above, not the ORM's bulk update by primary key.
+        .execution_options(dml_strategy="core_only")
+    )
+
+
+def _cache_row(totals: ProjectTotals, now: datetime) -> dict[str, Any]:
+    return {
+        "projects_id": totals.projects_id,
+        "projectsFinanceCache_timestampUpdated": now,
+        "projectsFinanceCache_equipmentSubTotal": totals.subtotal,
+        "projectsFinanceCache_equiptmentDiscounts": totals.discounts,
+        "projectsFinanceCache_equiptmentTotal": totals.total,
+        "projectsFinanceCache_value": totals.value,
+        "projectsFinanceCache_mass": totals.mass,
+    }
+
+
+class FinanceRepository:
+    """Reads assignment lines and writes ``projectsFinanceCache`` rows.
+
+    Used from inside session commit hooks, so it only runs statements on the
+    session it is given and never flushes or commits it.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def project_periods(self, project_ids: Sequence[int]) -> Sequence[Row[int, datetime, datetime, int, int]]:
+        """Return ``(projects_id, deliver_start, deliver_end, finance_days, finance_weeks)`` for live projects."""
+
+        return list(self._session.execute(_periods_statement(project_ids)))
+
+    def equipment_lines(self, project_ids: Sequence[int]) -> Sequence[Row[Any]]:
+        """Return one priced line per live assignment; see :mod:`app.core.finance`."""
+
+        return self._session.execute(_lines_statement(project_ids)).all()
+
+    def live_project_ids(self) -> list[int]:
+        stmt: Select[int] = select(Projects.projects_id).where(Projects.projects_deleted.is_(False))
+        return list(self._session.execute(stmt).scalars())
+
+    def project_ids_for_assets(self, asset_ids: Iterable[int]) -> set[int]:
+        stmt: Select[int] = (
+            select(AssetsAssignments.projects_id)
+            .where(AssetsAssignments.assets_id.in_(list(asset_ids)))
+            .distinct()
+        )
+        return set(self._session.execute(stmt).scalars())
+
+    def write_totals(self, totals: Sequence[ProjectTotals], now: datetime) -> None:
+        """Update each project's newest cache row, inserting one where none exists."""
+
+        if not totals:
+            return
+        latest: Iterable[tuple[int, int]] = self._session.execute(
+            select(ProjectsFinanceCache.projects_id, func.max(ProjectsFinanceCache.projectsFinanceCache_id))
+            .where(ProjectsFinanceCache.projects_id.in_([item.projects_id for item in totals]))
+            .group_by(ProjectsFinanceCache.projects_id)
+        )
+        cache_ids = {project_id: cache_id for project_id, cache_id in latest}
+        updates = [
+            {"cache_id": cache_ids[item.projects_id], "equipment_total": item.total, **_cache_row(item, now)}
+            for item in totals
+            if item.projects_id in cache_ids
+        ]
+        # A new row has no sales, staff, hires or payments yet.
+        inserts = [
+            {
+                "projectsFinanceCache_timestamp": now,
+                "projectsFinanceCache_grandTotal": item.total,
+                **_cache_row(item, now),
+            }
+            for item in totals
+            if item.projects_id not in cache_ids
+        ]
+        if updates:
+            self._session.execute(_cache_update(), updates)
+        if inserts:
+            self._session.execute(insert(ProjectsFinanceCache), inserts)
+
+
+__all__ = ["FinanceRepository"]
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime, timezone
+from typing import Any, Hashable, Protocol, Sequence
+
+from sqlalchemy import BindParameter, ColumnElement, Integer, Select, and_, bindparam, case, column, exists, func, literal, literal_column, or_, select, table
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.tenancy import current_instance_id
+from app.models.derived import SearchDocument
+from app.models.generated import Assets, InstancePositions, UserInstances
+from app.models.search import (
+    ASSET_SEARCH_TABLE,
+    SEARCH_DOCUMENTS_FTS_TABLE,
+    asset_search_document,
+    search_document_vector,
+    sqlite_supports_fts5,
+    sqlite_supports_fts5_trigram,
+)
+
+
+class AssetSearchBackend(Protocol):
+    """Strategy that narrows an assets query to rows matching a search term.
+
+    The term reaches the statement only through the bound parameters named in
+    :meth:`params`, so a statement built for one term can be re-executed for
+    another term of the same :meth:`shape` by passing that term's parameters.
+    """
+
+    name: str
+
+    def apply(self, stmt: Select[Any], term: str, *, ranked: bool = False) -> Select[Any]:
+        """Return *stmt* filtered by *term*, ordered by relevance when *ranked*."""
+
+    def params(self, term: str) -> dict[str, Any]:
+        """Bound parameter values :meth:`apply` uses for *term*."""
+
+    def shape(self, term: str) -> Hashable:
+        """Part of *term* that changes the statement's structure rather than its parameters."""
+
+
+class LikeSearchBackend:
+    """Portable fallback scanning the search document with ``LIKE``."""
+
+    name = "like"
+
+    def params(self, term: str) -> dict[str, Any]:
+        needle = term.lower()
+        return {"search_pattern": f"%{needle}%", "search_prefix": f"{needle}%"}
+
+    def shape(self, term: str) -> Hashable:
+        return None
+
+    def apply(self, stmt: Select[Any], term: str, *, ranked: bool = False) -> Select[Any]:
+        params = self.params(term)
+        stmt = stmt.where(asset_search_document().like(bindparam("search_pattern", params["search_pattern"])))
+        if ranked:
+            tag = func.lower(func.coalesce(Assets.assets_tag, ""))
+            tag_first = case((tag.like(bindparam("search_prefix", params["search_prefix"])), 0), else_=1)
+            stmt = stmt.order_by(None).order_by(tag_first, Assets.assets_id)
+        return stmt
+
+
+class TrigramSearchBackend:
+    """PostgreSQL pg_trgm backend served by ``ix_assets_search_trgm``."""
+
+    name = "trigram"
+
+    def params(self, term: str) -> dict[str, Any]:
+        needle = term.lower()
+        return {"search_pattern": f"%{needle}%", "search_term": needle}
+
+    def shape(self, term: str) -> Hashable:
+        return None
+
+    def apply(self, stmt: Select[Any], term: str, *, ranked: bool = False) -> Select[Any]:
+        params = self.params(term)
+        document = asset_search_document()
+        stmt = stmt.where(document.like(bindparam("search_pattern", params["search_pattern"])))
+        if ranked:
+            stmt = stmt.order_by(None).order_by(
+                func.similarity(document, bindparam("search_term", params["search_term"])).desc(),
+                Assets.assets_id,
+            )
+        return stmt
+
+
+_fts = table(ASSET_SEARCH_TABLE, column("rowid", Integer), column("document"))
+
+
+class Fts5SearchBackend:
+    """SQLite backend querying the trigram FTS5 shadow table ``assets_search``."""
+
+    name = "fts5"
+
+    # Trigram MATCH needs at least three characters; shorter terms fall back to
+    # LIKE against the shadow table, which is still far narrower than assets.
+    min_match_length = 3
+
+    def params(self, term: str) -> dict[str, Any]:
+        if self.shape(term):
+            return {"search_phrase": '"' + term.replace('"', '""') + '"'}
+        return {"search_pattern": f"%{term}%"}
+
+    def shape(self, term: str) -> Hashable:
+        return len(term) >= self.min_match_length
+
+    def apply(self, stmt: Select[Any], term: str, *, ranked: bool = False) -> Select[Any]:
+        use_match = self.shape(term)
+        params = self.params(term)
+        if use_match:
+            phrase: BindParameter[str] = bindparam("search_phrase", params["search_phrase"])
+            condition = literal_column(ASSET_SEARCH_TABLE).op("MATCH")(phrase)
+        else:
+            condition = _fts.c.document.like(bindparam("search_pattern", params["search_pattern"]))
+        if not ranked:
+            return stmt.where(Assets.assets_id.in_(select(_fts.c.rowid).where(condition)))
+        rank = func.bm25(literal_column(ASSET_SEARCH_TABLE)) if use_match else literal(0)
+        hits = select(_fts.c.rowid.label("rowid"), rank.label("rank")).where(condition).subquery()
+        return (
+            stmt.join(hits, Assets.assets_id == hits.c.rowid)
+            .order_by(None)
+            .order_by(hits.c.rank, Assets.assets_id)
+        )
+
+
+SEARCH_BACKENDS: dict[str, AssetSearchBackend] = {
+    "like": LikeSearchBackend(),
+    "trigram": TrigramSearchBackend(),
+    "fts5": Fts5SearchBackend(),
+}
+
+
+def resolve_search_backend(dialect_name: str, preference: str | None = None) -> AssetSearchBackend:
+    """Return the configured backend, picking one for *dialect_name* on ``auto``."""
+
+    choice = preference or get_settings().asset_search_backend
+    if choice != "auto":
+        try:
+            return SEARCH_BACKENDS[choice]
+        except KeyError as exc:
+            raise ValueError(f"Unknown asset search backend {choice!r}") from exc
+    if dialect_name == "postgresql":
+        return SEARCH_BACKENDS["trigram"]
+    if dialect_name == "sqlite" and sqlite_supports_fts5_trigram():
+        return SEARCH_BACKENDS["fts5"]
+    return SEARCH_BACKENDS["like"]
+
+
+_TOKEN = re.compile(r"\w+")
+_MAX_TOKENS = 8
+# bm25 weights for the title and body columns of search_documents_fts.
+_TITLE_WEIGHT, _BODY_WEIGHT = 10.0, 1.0
+_documents = SearchDocument.__table__
+_documents_fts = table(SEARCH_DOCUMENTS_FTS_TABLE, column("rowid", Integer))
+
+
+def search_tokens(term: str) -> list[str]:
+    """Split *term* into at most eight lower-cased word tokens, all of which must match."""
+
+    return _TOKEN.findall(term.lower())[:_MAX_TOKENS]
+
+
+def _visible_in(instance_id: int) -> ColumnElement[bool]:
+    """Documents of *instance_id*, the shared ones, and users holding a live position in it.
+
+    User documents carry no instance. As in the PHP user search, a user only
+    belongs to an instance through an undeleted, unexpired ``userInstances``
+    row whose position is in that instance.
+    """
+
+    docs = _documents
+    now: BindParameter[datetime] = bindparam("membership_now", datetime.now(timezone.utc).replace(tzinfo=None))
+    member = exists().where(
+        UserInstances.users_userid == docs.c.entity_id,
+        UserInstances.instancePositions_id == InstancePositions.instancePositions_id,
+        InstancePositions.instances_id == instance_id,
+        UserInstances.userInstances_deleted.is_(False),
+        or_(UserInstances.userInstances_archived.is_(None), UserInstances.userInstances_archived >= now),
+    )
+    return or_(
+        docs.c.instances_id == instance_id,
+        and_(docs.c.instances_id.is_(None), docs.c.entity != "user"),
+        and_(docs.c.entity == "user", member),
+    )
+
+
+def _documents_statement(
+    dialect_name: str,
+    tokens: Sequence[str],
+    *,
+    limit: int,
+    entities: Sequence[str] | None = None,
+    instance_id: int | None = None,
+) -> Select[Any]:
+    """Rank documents matching every token (each as a prefix) in one statement."""
+
+    docs = _documents
+    columns = (docs.c.entity, docs.c.entity_id, docs.c.instances_id, docs.c.title, docs.c.body)
+    if dialect_name == "sqlite" and sqlite_supports_fts5():
+        # Tokens are word characters only, so quoting each as a prefix phrase is safe.
+        match = " ".join(f'"{token}"*' for token in tokens)
+        fts: ColumnElement[Any] = literal_column(SEARCH_DOCUMENTS_FTS_TABLE)
+        hits = (
+            select(_documents_fts.c.rowid.label("rowid"), func.bm25(fts, _TITLE_WEIGHT, _BODY_WEIGHT).label("rank"))
+            .where(fts.op("MATCH")(match))
+            .subquery()
+        )
+        stmt = (
+            select(*columns, (-hits.c.rank).label("score"))
+            .join_from(docs, hits, docs.c.search_documents_id == hits.c.rowid)
+            .order_by(hits.c.rank, docs.c.search_documents_id)
+        )
+    elif dialect_name == "postgresql":
+        vector = search_document_vector()
+        query = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{token}:*" for token in tokens))
+        score: ColumnElement[Any] = func.ts_rank(vector, query)
+        stmt = (
+            select(*columns, score.label("score"))
+            .where(vector.op("@@")(query))
+            .order_by(score.desc(), docs.c.search_documents_id)
+        )
+    else:
+        document = func.lower(docs.c.title.op("||")(literal(" ")).op("||")(docs.c.body))
+        score = case((func.lower(docs.c.title).like(f"{tokens[0]}%"), 1.0), else_=0.5)
+        stmt = (
+            select(*columns, score.label("score"))
+            .where(*(document.like(f"%{token}%") for token in tokens))
+            .order_by(score.desc(), docs.c.search_documents_id)
+        )
+    if entities:
+        stmt = stmt.where(docs.c.entity.in_(list(entities)))
+    # The table is read through Core, so the request's tenant scope is applied here too.
+    for scope_id in (instance_id, current_instance_id()):
+        if scope_id is not None:
+            stmt = stmt.where(_visible_in(scope_id))
+    return stmt.limit(limit)
+
+
+class SearchRepository:
+    """Reads ranked hits from ``search_documents``."""
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def search(
+        self,
+        tokens: Sequence[str],
+        *,
+        limit: int,
+        entities: Sequence[str] | None = None,
+        instance_id: int | None = None,
+    ) -> Sequence[RowMapping]:
+        dialect_name = self._session.get_bind().dialect.name
+        stmt = _documents_statement(dialect_name, tokens, limit=limit, entities=entities, instance_id=instance_id)
+        return self._session.execute(stmt).mappings().all()
+
+
+class AsyncSearchRepository:
+    """Async counterpart of :class:`SearchRepository`."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def search(
+        self,
+        tokens: Sequence[str],
+        *,
+        limit: int,
+        entities: Sequence[str] | None = None,
+        instance_id: int | None = None,
+    ) -> Sequence[RowMapping]:
+        dialect_name = self._session.get_bind().dialect.name
+        stmt = _documents_statement(dialect_name, tokens, limit=limit, entities=entities, instance_id=instance_id)
+        rows: Sequence[RowMapping] = (await self._session.execute(stmt)).mappings().all()
+        return rows
+
+
+__all__ = [
+    "SearchRepository",
+    "AsyncSearchRepository",
+    "search_tokens",
+    "AssetSearchBackend",
+    "LikeSearchBackend",
+    "TrigramSearchBackend",
+    "Fts5SearchBackend",
+    "SEARCH_BACKENDS",
+    "resolve_search_backend",
+]
@@ -0,0 +1,51 @@
+"""Reusable statement templates for hot repository queries.
+
+Building a ``select()`` and deriving its cache key costs more per request than
+SQLAlchemy's compiled-SQL cache saves on queries this small. Repositories
+therefore build one template per query *shape* (which columns, filters and
+search mode it uses) with every per-request value behind a named
+``bindparam``, keep it here, and execute it with that request's parameters.
+The template's cache key is memoized on the object, so a hit skips both
+construction and key generation.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Hashable, TypeVar
+
+from sqlalchemy.sql import Executable
+
+from app.core.caching import TTLCache
+from app.core.config import get_settings
+from app.monitoring.metrics import record_statement_cache
+
+S = TypeVar("S", bound=Executable)
+
+
+class StatementCache:
+    """LRU of statement templates keyed by query name and shape."""
+
+    def __init__(self, *, max_entries: int) -> None:
+        # Templates never go stale; the bound only caps how many shapes are kept.
+        self._templates: TTLCache[Executable] = TTLCache(ttl_seconds=math.inf, max_entries=max_entries)
+
+    def get_or_build(self, name: str, shape: Hashable, build: Callable[[], S]) -> S:
+        """Return the template for *shape* of query *name*, building it on a miss."""
+
+        key = (name, shape)
+        template = self._templates.get(key)
+        record_statement_cache(name, hit=template is not None)
+        if template is None:
+            template = build()
+            self._templates.set(key, template)
+        return template  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        self._templates.clear()
+
+
+statement_cache = StatementCache(max_entries=get_settings().statement_cache_max_entries)
+
+
+__all__ = ["StatementCache", "statement_cache"]
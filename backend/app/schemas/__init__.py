@@ -5,19 +5,30 @@ from typing import Dict, Type
 from pydantic import BaseModel
 
 from . import assets as _assets
+from . import barcodes as _barcodes
+from . import batch as _batch
 from . import generated as _generated
 from . import integrations as _integrations
+from . import search as _search
 
 _COMBINED_SCHEMA_REGISTRY: Dict[str, Type[BaseModel]] = {
     **_generated.SCHEMA_REGISTRY,
     **_assets.SCHEMA_REGISTRY,
+    **_barcodes.SCHEMA_REGISTRY,
+    **_batch.SCHEMA_REGISTRY,
+    **_search.SCHEMA_REGISTRY,
     **getattr(_integrations, "SCHEMA_REGISTRY", {}),
 }
 
 SCHEMA_REGISTRY: Dict[str, Type[BaseModel]] = dict(_COMBINED_SCHEMA_REGISTRY)
 
 __all__ = list(
-    dict.fromkeys(list(_generated.__all__) + list(_assets.__all__) + list(_integrations.__all__))
+    dict.fromkeys(list(_generated.__all__)
+    + list(_assets.__all__)
+    + list(_barcodes.__all__)
+    + list(_batch.__all__)
+    + list(_search.__all__)
+    + list(_integrations.__all__))
 )
 
 for name in _generated.__all__:
@@ -26,6 +37,15 @@ for name in _generated.__all__:
 for name in _assets.__all__:
     globals()[name] = getattr(_assets, name)
 
+for name in _barcodes.__all__:
+    globals()[name] = getattr(_barcodes, name)
+
+for name in _batch.__all__:
+    globals()[name] = getattr(_batch, name)
+
+for name in _search.__all__:
+    globals()[name] = getattr(_search, name)
+
 for name in _integrations.__all__:
     globals()[name] = getattr(_integrations, name)
 
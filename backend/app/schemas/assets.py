@@ -1,12 +1,32 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from datetime import datetime
-from typing import Any
+from functools import lru_cache
+from typing import Any, Literal, get_args
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model, model_validator
 
 from app.models.generated import Assets
 
+TotalMode = Literal["exact", "estimated", "none"]
+AssetSort = Literal["id", "relevance"]
+AssetFacet = Literal["type", "location", "category"]
+ASSET_FACETS: tuple[str, ...] = get_args(AssetFacet)
+CUSTOM_FIELD_COLUMNS: tuple[str, ...] = tuple(
+    f"asset_definableFields_{index}" for index in range(1, 11)
+)
+
+
+def _with_custom_fields(source: dict[str, Any]) -> dict[str, Any]:
+    custom_fields: dict[str, str] = {}
+    for index, column in enumerate(CUSTOM_FIELD_COLUMNS, start=1):
+        value = source.get(column)
+        if value:
+            custom_fields[f"field_{index}"] = value
+    source.setdefault("custom_fields", custom_fields)
+    return source
+
 
 class AssetBase(BaseModel):
     """Common fields shared by asset representations."""
@@ -29,6 +49,29 @@ class AssetSummary(AssetBase):
     day_rate: int | None = Field(validation_alias="assets_dayRate")
     week_rate: int | None = Field(validation_alias="assets_weekRate")
     value: int | None = Field(validation_alias="assets_value")
+    effective_day_rate: int | None = Field(
+        validation_alias="effective_dayRate", description="Day rate, falling back to the asset type's"
+    )
+    effective_week_rate: int | None = Field(
+        validation_alias="effective_weekRate", description="Week rate, falling back to the asset type's"
+    )
+    effective_value: int | None = Field(
+        validation_alias="effective_value", description="Value, falling back to the asset type's"
+    )
+    effective_mass: float | None = Field(
+        validation_alias="effective_mass", description="Mass, falling back to the asset type's"
+    )
+
+
+class AssetLocation(BaseModel):
+    """Where an asset was last scanned, from the ``asset_current_location`` projection."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    location_id: int | None = Field(validation_alias="locations_id")
+    location_asset_id: int | None = Field(validation_alias="location_assets_id", description="Container asset")
+    custom_location: str | None = None
+    scanned_at: datetime
 
 
 class AssetDetails(AssetSummary):
@@ -36,6 +79,7 @@ class AssetDetails(AssetSummary):
 
     notes: str | None = Field(validation_alias="assets_notes")
     custom_fields: dict[str, str] = Field(default_factory=dict)
+    current_location: AssetLocation | None = Field(default=None, description="Latest scanned location")
 
     @model_validator(mode="before")
     @classmethod
@@ -46,18 +90,111 @@ class AssetDetails(AssetSummary):
                 for key, value in vars(data).items()
                 if not key.startswith("_")
             }
-        elif isinstance(data, dict):
+        elif isinstance(data, Mapping):
             source = dict(data)
         else:
             return data
+        return _with_custom_fields(source)
+
+
+class AssetProjection(BaseModel):
+    """Base for the sparse-fieldset models built by :func:`projection_model`."""
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def populate_custom_fields(cls, data: Any) -> Any:
+        if "custom_fields" in cls.model_fields and isinstance(data, Mapping):
+            return _with_custom_fields(dict(data))
+        return data
+
+
+def field_columns(model: type[BaseModel]) -> dict[str, tuple[str, ...]]:
+    """Map each public field of *model* to the ``assets`` columns backing it.
+
+    ``effective_*`` names are not ``assets`` columns; the repository resolves
+    them against the asset type (see ``app.repositories.assets.EFFECTIVE_COLUMNS``).
+    """
+
+    columns: dict[str, tuple[str, ...]] = {}
+    for name, info in model.model_fields.items():
+        if name == "custom_fields":
+            columns[name] = CUSTOM_FIELD_COLUMNS
+        elif name == "current_location":
+            # Read from asset_current_location by the service, not from assets.
+            columns[name] = ()
+        elif isinstance(info.validation_alias, str):
+            columns[name] = (info.validation_alias,)
+    return columns
+
+
+def parse_fields(raw: str, model: type[BaseModel]) -> frozenset[str]:
+    """Parse a ``fields=id,tag`` selector, raising ``ValueError`` on unknown names."""
+
+    requested = frozenset(part.strip() for part in raw.split(",") if part.strip())
+    if not requested:
+        raise ValueError("fields must name at least one field")
+    unknown = requested - model.model_fields.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested
+
+
+def parse_facets(raw: str) -> tuple[str, ...]:
+    """Parse a ``facets=type,location`` selector into canonical order."""
+
+    requested = {part.strip() for part in raw.split(",") if part.strip()}
+    if not requested:
+        raise ValueError("facets must name at least one facet")
+    unknown = requested.difference(ASSET_FACETS)
+    if unknown:
+        raise ValueError(f"Unknown facets: {', '.join(sorted(unknown))}")
+    return tuple(name for name in ASSET_FACETS if name in requested)
+
 
-        custom_fields: dict[str, str] = {}
-        for index in range(1, 11):
-            value = source.get(f"asset_definableFields_{index}")
-            if value:
-                custom_fields[f"field_{index}"] = value
-        source.setdefault("custom_fields", custom_fields)
-        return source
+@lru_cache(maxsize=128)
+def projection_model(model: type[BaseModel], fields: frozenset[str]) -> type[AssetProjection]:
+    """Return a response model exposing only *fields* of *model*."""
+
+    definitions: dict[str, Any] = {
+        name: (info.annotation, info)
+        for name, info in model.model_fields.items()
+        if name in fields
+    }
+    suffix = "_".join(sorted(fields))
+    return create_model(f"{model.__name__}_{suffix}", __base__=AssetProjection, **definitions)
+
+
+@lru_cache(maxsize=256)
+def list_adapter(model: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    """Return a cached adapter that validates a whole page of *model* rows in one call."""
+
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+class AssetFilters(BaseModel):
+    """Optional equality filters for the list endpoint, bound from query parameters."""
+
+    model_config = ConfigDict(frozen=True)
+
+    instance_id: int | None = Field(None, ge=1, description="Only assets of this instance")
+    asset_type_id: int | None = Field(None, ge=1, description="Only assets of this asset type")
+    storage_location_id: int | None = Field(None, ge=1, description="Only assets stored at this location")
+    deleted: bool | None = Field(None, description="Only deleted (true) or live (false) assets")
+    archived: bool | None = Field(None, description="Only archived (true) or unarchived (false) assets")
+    current_location_id: int | None = Field(None, ge=1, description="Only assets last scanned at this location")
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.model_dump(exclude_none=True)
+
+
+class FacetCount(BaseModel):
+    """Number of matching assets sharing one facet value."""
+
+    value: int | None = Field(description="Asset type, storage location or category identifier")
+    count: int
 
 
 class AssetListResponse(BaseModel):
@@ -66,22 +203,103 @@ class AssetListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     items: list[AssetSummary]
-    total: int
+    total: int | None = Field(description="Matching rows; approximate or omitted depending on total_mode")
+    total_mode: TotalMode = "exact"
+    has_more: bool = False
     limit: int
     offset: int
     search: str | None = None
+    cursor: str | None = Field(default=None, description="Cursor the page was fetched with")
+    next_cursor: str | None = Field(
+        default=None, description="Opaque cursor for the next page, absent on the last page"
+    )
+    facets: dict[str, list[FacetCount]] | None = Field(
+        default=None, description="Counts per requested facet over all matching assets, largest first"
+    )
+
+
+@lru_cache(maxsize=128)
+def projection_list_model(fields: frozenset[str]) -> type[AssetListResponse]:
+    """Return a list envelope whose items carry only *fields*."""
+
+    item_model = projection_model(AssetSummary, fields)
+    return create_model(
+        f"AssetListResponse_{item_model.__name__}",
+        __base__=AssetListResponse,
+        items=(list[item_model], ...),  # type: ignore[valid-type]
+    )
+
+
+class AssetBatchResponse(BaseModel):
+    """Envelope returned by the batch lookup endpoint."""
+
+    items: dict[int, AssetDetails] = Field(description="Found assets keyed by identifier")
+    missing: list[int] = Field(default_factory=list, description="Requested identifiers that do not exist")
+
+
+class AssetTreeNode(AssetSummary):
+    """Asset within a case/kit hierarchy, with the assets linked to it."""
+
+    parent_id: int | None = Field(validation_alias="assets_linkedTo", description="Case or kit this asset sits in")
+    depth: int = Field(description="Levels below the requested asset; negative for its containers")
+    children: list[AssetTreeNode] = Field(default_factory=list)
+
+
+class AssetTreeResponse(BaseModel):
+    """Subtree of an asset together with the chain of cases containing it."""
+
+    root: AssetTreeNode
+    ancestors: list[AssetTreeNode] = Field(
+        default_factory=list, description="Containing cases and kits, outermost first"
+    )
+
+
+class AssetAvailabilityResponse(BaseModel):
+    """Assets free or booked for a delivery window."""
+
+    start: datetime
+    end: datetime
+    asset_type_id: int | None = None
+    available: list[int] = Field(description="Assets with no assignment overlapping the window")
+    unavailable: list[int] = Field(description="Assets assigned to a project whose delivery dates overlap")
 
 
 SCHEMA_REGISTRY = {
     "AssetSummary": AssetSummary,
+    "AssetFilters": AssetFilters,
+    "FacetCount": FacetCount,
     "AssetDetails": AssetDetails,
+    "AssetLocation": AssetLocation,
     "AssetListResponse": AssetListResponse,
+    "AssetBatchResponse": AssetBatchResponse,
+    "AssetAvailabilityResponse": AssetAvailabilityResponse,
+    "AssetTreeNode": AssetTreeNode,
+    "AssetTreeResponse": AssetTreeResponse,
 }
 
 __all__ = [
     "AssetBase",
     "AssetSummary",
     "AssetDetails",
+    "AssetLocation",
     "AssetListResponse",
+    "AssetBatchResponse",
+    "AssetAvailabilityResponse",
+    "AssetTreeNode",
+    "AssetTreeResponse",
+    "AssetProjection",
+    "AssetFilters",
+    "FacetCount",
+    "TotalMode",
+    "AssetSort",
+    "AssetFacet",
+    "ASSET_FACETS",
+    "CUSTOM_FIELD_COLUMNS",
+    "field_columns",
+    "parse_fields",
+    "parse_facets",
+    "projection_model",
+    "projection_list_model",
+    "list_adapter",
     "SCHEMA_REGISTRY",
 ]
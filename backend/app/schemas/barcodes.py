@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.assets import AssetSummary
+
+
+class BarcodeDetails(BaseModel):
+    """Asset barcode resolved by value, with the asset it is attached to."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int = Field(validation_alias="assetsBarcodes_id")
+    value: str = Field(validation_alias="assetsBarcodes_value")
+    type: str = Field(validation_alias="assetsBarcodes_type")
+    asset_id: int | None = Field(validation_alias="assets_id")
+    asset: AssetSummary | None = None
+
+
+class BarcodeScanIn(BaseModel):
+    """One scan captured by a handheld scanner."""
+
+    value: str = Field(min_length=1, max_length=500, description="Scanned barcode value")
+    scanned_at: datetime = Field(description="When the scan happened on the device")
+    user_id: int | None = Field(None, ge=1)
+    location_barcode_id: int | None = Field(None, ge=1, description="Location barcode scanned alongside")
+    location_asset_id: int | None = Field(None, ge=1, description="Container asset the item was scanned into")
+    custom_location: str | None = Field(None, max_length=500)
+
+
+class BarcodeScansBulkRequest(BaseModel):
+    scans: list[BarcodeScanIn] = Field(min_length=1)
+
+
+class BarcodeScansBulkResponse(BaseModel):
+    inserted: int
+    unknown: list[str] = Field(
+        default_factory=list, description="Scanned values that match no live barcode; not stored"
+    )
+
+
+__all__ = [
+    "BarcodeDetails",
+    "BarcodeScanIn",
+    "BarcodeScansBulkRequest",
+    "BarcodeScansBulkResponse",
+]
+
+SCHEMA_REGISTRY: dict[str, type[BaseModel]] = {
+    "BarcodeDetails": BarcodeDetails,
+    "BarcodeScanIn": BarcodeScanIn,
+    "BarcodeScansBulkRequest": BarcodeScansBulkRequest,
+    "BarcodeScansBulkResponse": BarcodeScansBulkResponse,
+}
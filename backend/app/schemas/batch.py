@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Any
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel, Field, field_validator
+
+BATCH_PATH = "/api/batch"
+
+
+class BatchRequestItem(BaseModel):
+    """One GET to run inside a batch."""
+
+    id: str | None = Field(None, max_length=100, description="Echoed on the result; defaults to the item's position")
+    path: str = Field(..., max_length=2000, description="Path and query of a GET route, e.g. /api/assets?limit=5")
+
+    @field_validator("path")
+    @classmethod
+    def _api_path(cls, value: str) -> str:
+        parts = urlsplit(value)
+        if parts.scheme or parts.netloc or parts.fragment or not parts.path.startswith("/api/"):
+            raise ValueError("path must be a path under /api/, without scheme, host or fragment")
+        if parts.path.rstrip("/") == BATCH_PATH:
+            raise ValueError("batches cannot be nested")
+        return value
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchRequestItem] = Field(..., min_length=1)
+
+
+class BatchItemResult(BaseModel):
+    id: str
+    status: int
+    headers: dict[str, str] = Field(description="Content-Type and ETag of the sub-response, when set")
+    body: Any = Field(None, description="Decoded JSON body, text for other media types, null when empty")
+
+
+class BatchResponse(BaseModel):
+    items: list[BatchItemResult]
+
+
+__all__ = ["BATCH_PATH", "BatchRequestItem", "BatchRequest", "BatchItemResult", "BatchResponse"]
+
+SCHEMA_REGISTRY: dict[str, type[BaseModel]] = {
+    "BatchRequestItem": BatchRequestItem,
+    "BatchRequest": BatchRequest,
+    "BatchItemResult": BatchItemResult,
+    "BatchResponse": BatchResponse,
+}
@@ -445,6 +445,8 @@ class ProjectsSchema(BaseModel):
     projects_dates_use_end: datetime | None = None
     projects_dates_deliver_start: datetime | None = None
     projects_dates_deliver_end: datetime | None = None
+    projects_dates_finances_days: int | None = None
+    projects_dates_finances_weeks: int | None = None
     projects_status: int
     locations_id: int | None = None
     projects_invoiceNotes: str | None = None
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Literal, get_args
+
+from pydantic import BaseModel, ConfigDict, Field
+
+SearchEntity = Literal["asset", "asset_type", "project", "client", "user"]
+SEARCH_ENTITY_TYPES: tuple[str, ...] = get_args(SearchEntity)
+
+
+class SearchHit(BaseModel):
+    """One ranked match from the global search index."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    type: SearchEntity = Field(validation_alias="entity")
+    id: int = Field(validation_alias="entity_id")
+    instance_id: int | None = Field(validation_alias="instances_id")
+    title: str
+    excerpt: str | None = Field(None, description="Start of the matched document's body")
+    score: float = Field(description="Relevance; higher is better, comparable within one response only")
+
+
+class SearchResponse(BaseModel):
+    query: str
+    hits: list[SearchHit]
+
+
+def parse_search_types(raw: str) -> tuple[str, ...]:
+    """Parse a ``types=asset,project`` selector, raising ``ValueError`` on unknown names."""
+
+    requested = {part.strip() for part in raw.split(",") if part.strip()}
+    unknown = requested.difference(SEARCH_ENTITY_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown types: {', '.join(sorted(unknown))}")
+    return tuple(name for name in SEARCH_ENTITY_TYPES if name in requested)
+
+
+__all__ = [
+    "SearchEntity",
+    "SEARCH_ENTITY_TYPES",
+    "SearchHit",
+    "SearchResponse",
+    "parse_search_types",
+]
+
+SCHEMA_REGISTRY: dict[str, type[BaseModel]] = {
+    "SearchHit": SearchHit,
+    "SearchResponse": SearchResponse,
+}
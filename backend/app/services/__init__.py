@@ -1,6 +1,19 @@
 """Service layer entry point for reusable business logic."""
 
-from app.services.assets import AssetsService
+from app.services.assets import AsyncAssetsService
+from app.services.availability import AsyncAvailabilityService
+from app.services.barcodes import AsyncBarcodesService
+from app.services.batch import BatchService
+from app.services.finance import ProjectFinanceService
 from app.services.health import get_health_status
+from app.services.search import AsyncSearchService
 
-__all__ = ["AssetsService", "get_health_status"]
+__all__ = [
+    "AsyncAssetsService",
+    "AsyncAvailabilityService",
+    "AsyncBarcodesService",
+    "BatchService",
+    "ProjectFinanceService",
+    "AsyncSearchService",
+    "get_health_status",
+]
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import csv
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Literal, Sequence
+
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.async_session import ReadSessionLocal
+from app.repositories.assets import AsyncAssetsRepository
+from app.schemas.assets import CUSTOM_FIELD_COLUMNS, AssetDetails, field_columns
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Flat column layout shared by the CSV header and the Core select; fields not
+# stored on assets (current_location) are left out of exports.
+_FIELD_COLUMNS = {name: columns for name, columns in field_columns(AssetDetails).items() if columns}
+CSV_HEADER: tuple[str, ...] = (
+    *(name for name in _FIELD_COLUMNS if name != "custom_fields"),
+    *(f"field_{index}" for index in range(1, len(CUSTOM_FIELD_COLUMNS) + 1)),
+)
+EXPORT_COLUMNS: tuple[str, ...] = tuple(
+    column for columns in _FIELD_COLUMNS.values() for column in columns
+)
+_CSV_SOURCES: tuple[str, ...] = (
+    *(columns[0] for name, columns in _FIELD_COLUMNS.items() if name != "custom_fields"),
+    *CUSTOM_FIELD_COLUMNS,
+)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(rows: Sequence[RowMapping], *, header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(CSV_HEADER)
+    writer.writerows([_csv_value(row[column]) for column in _CSV_SOURCES] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson(rows: Sequence[RowMapping], *, header: bool) -> bytes:
+    return b"".join(
+        AssetDetails.model_validate(row).model_dump_json(exclude={"current_location"}).encode("utf-8") + b"\n" for row in rows
+    )
+
+
+ENCODERS: dict[str, Callable[..., bytes]] = {
+    "csv": encode_csv,
+    "ndjson": encode_ndjson,
+}
+
+
+async def stream_export(
+    export_format: ExportFormat,
+    *,
+    search: str | None = None,
+    after_id: int | None = None,
+    session_factory: Callable[[], AsyncSession] = ReadSessionLocal,
+) -> AsyncIterator[bytes]:
+    """Yield the export body one batch at a time.
+
+    The generator owns its session because it outlives the request's
+    dependencies; memory stays bounded by ``assets_export_batch_size`` rows.
+    """
+
+    encode = ENCODERS[export_format]
+    batch_size = get_settings().assets_export_batch_size
+    header = True
+    async with session_factory() as session:
+        repository = AsyncAssetsRepository(session)
+        async for rows in repository.stream_asset_rows(
+            columns=EXPORT_COLUMNS, search=search, after_id=after_id, batch_size=batch_size
+        ):
+            yield encode(rows, header=header)
+            header = False
+    if header and export_format == "csv":
+        yield encode([], header=True)
+
+
+__all__ = [
+    "ExportFormat",
+    "EXPORT_MEDIA_TYPES",
+    "CSV_HEADER",
+    "EXPORT_COLUMNS",
+    "encode_csv",
+    "encode_ndjson",
+    "stream_export",
+]
@@ -1,41 +1,290 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
 
-from sqlalchemy.orm import Session
+from pydantic import BaseModel
 
-from app.repositories.assets import AssetsRepository
-from app.schemas.assets import AssetDetails, AssetListResponse, AssetSummary
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.caching import CachedResponse, TTLCache
+from app.core.config import get_settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.tenancy import current_instance_id
+from app.db import closure as _closure  # noqa: F401  (registers the closure flush listener)
+from app.db.changes import asset_changes, asset_type_changes
+from app.repositories.assets import AsyncAssetsRepository
+from app.schemas.assets import (
+    AssetBatchResponse,
+    AssetDetails,
+    AssetFilters,
+    AssetListResponse,
+    AssetLocation,
+    AssetSort,
+    AssetSummary,
+    AssetTreeNode,
+    AssetTreeResponse,
+    FacetCount,
+    TotalMode,
+    field_columns,
+    list_adapter,
+    projection_list_model,
+    projection_model,
+)
+
+
+def _build_count_cache() -> TTLCache[int]:
+    settings = get_settings()
+    return TTLCache(
+        ttl_seconds=settings.assets_count_cache_ttl_seconds,
+        max_entries=settings.assets_count_cache_max_entries,
+    )
+
+
+def _build_response_cache() -> TTLCache[CachedResponse]:
+    settings = get_settings()
+    return TTLCache(
+        ttl_seconds=settings.assets_response_cache_ttl_seconds,
+        max_entries=settings.assets_response_cache_max_entries,
+    )
+
+
+# Shared across requests so repeated searches reuse the same approximate total.
+count_cache: TTLCache[int] = _build_count_cache()
+# Serialized GET bodies keyed by URL and asset change version; emptied on writes.
+response_cache: TTLCache[CachedResponse] = _build_response_cache()
+asset_changes.subscribe(response_cache.clear)
+asset_type_changes.subscribe(response_cache.clear)
+
+
+def _count_cache_key(
+    search: str | None, filters: AssetFilters | None
+) -> tuple[str, int | None, str | None, AssetFilters | None]:
+    return ("assets", current_instance_id(), search, filters)
+
+
+def _active_filters(filters: AssetFilters | None) -> AssetFilters | None:
+    return None if filters is None or filters.is_empty else filters
+
+
+def _facet_response(
+    facets: Sequence[str], rows: Sequence[RowMapping]
+) -> dict[str, list[FacetCount]] | None:
+    if not facets:
+        return None
+    counts: dict[str, list[FacetCount]] = {name: [] for name in facets}
+    for row in rows:
+        counts[row["facet"]].append(FacetCount(value=row["value"], count=row["count"]))
+    for items in counts.values():
+        items.sort(key=lambda item: (-item.count, item.value is None, item.value or 0))
+    return counts
+
+
+def _wants_location(fields: frozenset[str] | None) -> bool:
+    return fields is None or "current_location" in fields
+
+
+def _location(record: Any, locations: Mapping[int, Any]) -> AssetLocation | None:
+    location = locations.get(_record_id(record))
+    return None if location is None else AssetLocation.model_validate(location)
+
+
+def _full_detail(record: Any, locations: Mapping[int, Any]) -> AssetDetails:
+    result = AssetDetails.model_validate(record)
+    result.current_location = _location(record, locations)
+    return result
+
+
+def _asset_detail(
+    record: Any, fields: frozenset[str] | None, locations: Mapping[int, Any]
+) -> BaseModel:
+    if fields is None:
+        return _full_detail(record, locations)
+    result = projection_model(AssetDetails, fields).model_validate(record)
+    if _wants_location(fields):
+        # Projection models are built at runtime, so the field is set through model_copy.
+        return result.model_copy(update={"current_location": _location(record, locations)})
+    return result
+
+
+def _batch_response(
+    asset_ids: Sequence[int], records: Sequence[Any], locations: Mapping[int, Any]
+) -> AssetBatchResponse:
+    found = {_record_id(record): _full_detail(record, locations) for record in records}
+    items = {asset_id: found[asset_id] for asset_id in asset_ids if asset_id in found}
+    missing = [asset_id for asset_id in asset_ids if asset_id not in found]
+    return AssetBatchResponse(items=items, missing=missing)
+
+
+def _columns_for(model: type[BaseModel], fields: frozenset[str]) -> list[str]:
+    mapping = field_columns(model)
+    return [column for name in sorted(fields) for column in mapping[name]]
+
+
+def _record_id(record: Any) -> int:
+    return int(record["assets_id"])
+
+
+def _summary_columns(fields: frozenset[str] | None) -> list[str]:
+    return _columns_for(AssetSummary, fields or frozenset(AssetSummary.model_fields))
+
+
+def _details_columns(fields: frozenset[str] | None) -> list[str]:
+    return _columns_for(AssetDetails, fields or frozenset(AssetDetails.model_fields))
+
+
+def _list_response(
+    records: Sequence[Any],
+    *,
+    fields: frozenset[str] | None,
+    total: int | None,
+    total_mode: TotalMode,
+    limit: int,
+    offset: int,
+    search: str | None,
+    cursor: str | None,
+    sort: AssetSort,
+    facets: dict[str, list[FacetCount]] | None = None,
+) -> AssetListResponse:
+    # Repositories are asked for limit + 1 rows; the extra one only signals has_more.
+    has_more = len(records) > limit
+    page = records[:limit]
+    envelope = AssetListResponse if fields is None else projection_list_model(fields)
+    item_model = AssetSummary if fields is None else projection_model(AssetSummary, fields)
+    # One adapter call validates the page; the envelope is then built without
+    # re-validating items that were just produced.
+    payload = list_adapter(item_model).validate_python(page)
+    # Relevance order is not keyed on assets_id, so it cannot be resumed by cursor.
+    next_cursor = encode_cursor(_record_id(page[-1])) if has_more and sort == "id" else None
+    return envelope.model_construct(
+        items=payload,
+        total=total,
+        total_mode=total_mode,
+        has_more=has_more,
+        limit=limit,
+        offset=offset,
+        search=search,
+        cursor=cursor,
+        next_cursor=next_cursor,
+        facets=facets,
+    )
+
+
+def _tree_response(asset_id: int, rows: Sequence[Any]) -> AssetTreeResponse | None:
+    nodes = list_adapter(AssetTreeNode).validate_python(rows)
+    by_id = {node.id: node for node in nodes}
+    if asset_id not in by_id:
+        return None
+    for node in nodes:
+        # Rows arrive ordered by depth, so every parent precedes its children.
+        if node.depth > 0 and node.parent_id in by_id:
+            by_id[node.parent_id].children.append(node)
+    return AssetTreeResponse(
+        root=by_id[asset_id], ancestors=[node for node in nodes if node.depth < 0]
+    )
+
+
+def _tree_options() -> dict[str, Any]:
+    settings = get_settings()
+    return {
+        "columns": _summary_columns(None),
+        "max_depth": settings.assets_tree_max_depth,
+        "use_closure": settings.assets_closure_enabled,
+    }
 
 
 @dataclass
-class AssetsService:
+class AsyncAssetsService:
     """Business logic orchestrator for assets endpoints."""
 
-    repository: AssetsRepository
+    repository: AsyncAssetsRepository
+    count_cache: TTLCache[int] = field(default_factory=lambda: count_cache)
 
     @classmethod
-    def from_session(cls, session: Session) -> "AssetsService":
-        return cls(repository=AssetsRepository(session))
+    def from_session(cls, session: AsyncSession) -> "AsyncAssetsService":
+        return cls(repository=AsyncAssetsRepository(session))
 
-    def list_assets(
+    async def list_assets(
         self,
         *,
         limit: int,
-        offset: int,
+        offset: int = 0,
         search: str | None = None,
+        cursor: str | None = None,
+        total_mode: TotalMode = "exact",
+        sort: AssetSort = "id",
+        fields: frozenset[str] | None = None,
+        filters: AssetFilters | None = None,
+        facets: Sequence[str] = (),
     ) -> AssetListResponse:
-        records = self.repository.list_assets(limit=limit, offset=offset, search=search)
-        total = self.repository.count_assets(search=search)
-        payload = [AssetSummary.model_validate(record) for record in records]
-        return AssetListResponse(items=payload, total=total, limit=limit, offset=offset, search=search)
+        after_id = decode_cursor(cursor) if cursor is not None else None
+        filters = _active_filters(filters)
+        # Core row mappings rather than ORM entities: list pages never need the identity map.
+        records = await self.repository.list_asset_rows(
+            columns=_summary_columns(fields),
+            limit=limit + 1,
+            offset=offset,
+            search=search,
+            after_id=after_id,
+            sort=sort,
+            filters=filters,
+        )
+        facet_rows = (
+            await self.repository.facet_counts(facets, search=search, filters=filters) if facets else ()
+        )
+        return _list_response(
+            records,
+            fields=fields,
+            total=await self._total(total_mode, search=search, filters=filters),
+            total_mode=total_mode,
+            limit=limit,
+            offset=offset,
+            search=search,
+            cursor=cursor,
+            sort=sort,
+            facets=_facet_response(facets, facet_rows),
+        )
+
+    async def _total(
+        self, total_mode: TotalMode, *, search: str | None, filters: AssetFilters | None
+    ) -> int | None:
+        if total_mode == "none":
+            return None
+        if total_mode == "estimated":
+            estimate = await self.repository.estimate_assets(search=search, filters=filters)
+            if estimate is not None:
+                return estimate
+            key = _count_cache_key(search, filters)
+            cached = self.count_cache.get(key)
+            if cached is None:
+                cached = await self.repository.count_assets(search=search, filters=filters)
+                self.count_cache.set(key, cached)
+            return cached
+        return await self.repository.count_assets(search=search, filters=filters)
 
-    def get_asset(self, asset_id: int) -> Optional[AssetDetails]:
-        record = self.repository.get_asset(asset_id)
+    async def get_asset(
+        self, asset_id: int, *, fields: frozenset[str] | None = None
+    ) -> Optional[BaseModel]:
+        record = await self.repository.get_asset_row(asset_id, _details_columns(fields))
         if record is None:
             return None
-        return AssetDetails.model_validate(record)
+        locations = await self.repository.current_locations([asset_id]) if _wants_location(fields) else {}
+        return _asset_detail(record, fields, locations)
+
+    async def get_asset_tree(self, asset_id: int) -> AssetTreeResponse | None:
+        rows = await self.repository.get_asset_tree(asset_id, **_tree_options())
+        return _tree_response(asset_id, rows)
+
+    async def get_assets(self, asset_ids: Sequence[int]) -> AssetBatchResponse:
+        unique_ids = list(dict.fromkeys(asset_ids))
+        chunk_size = get_settings().assets_batch_chunk_size
+        records = await self.repository.get_asset_rows(unique_ids, _details_columns(None), chunk_size=chunk_size)
+        locations = await self.repository.current_locations(
+            [_record_id(record) for record in records], chunk_size=chunk_size
+        )
+        return _batch_response(unique_ids, records, locations)
 
 
-__all__ = ["AssetsService"]
+__all__ = ["AsyncAssetsService", "count_cache", "response_cache"]
@@ -0,0 +1,337 @@
+"""Asset availability over project delivery windows.
+
+:class:`AvailabilityIndex` keeps every live assignment's delivery window in
+memory, grouped per asset into :class:`~app.core.intervals.SortedIntervals`.
+It loads lazily from the database, then follows committed ORM writes to
+assignments and projects, so answering "which assets of this type are free
+between these dates" costs one indexed id query plus a binary search per asset.
+
+Writes made by other processes are not seen by those listeners. Every
+``availability_check_interval_seconds`` the index compares a cheap fingerprint
+of the booking tables (live-row counts and highest ids) with the one taken at
+load time and reloads on a mismatch; changes the fingerprint cannot see, such
+as another worker moving a project's dates, are picked up by a full reload
+once the index is ``availability_max_age_seconds`` old.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import chain
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+from app.core.config import get_settings
+from app.core.datetimes import to_naive_utc
+from app.core.intervals import SortedIntervals
+from app.models.generated import AssetsAssignments, Projects
+from app.repositories.assets import AsyncAssetsRepository
+from app.repositories.availability import AsyncAvailabilityRepository
+from app.schemas.assets import AssetAvailabilityResponse, AssetFilters
+
+Window = tuple[datetime, datetime]
+
+_INFO_KEY = "pending_changes:availability"
+_ASSIGNMENT_ATTRS = ("assetsAssignments_id", "assets_id", "projects_id", "assetsAssignments_deleted")
+_PROJECT_ATTRS = (
+    "projects_id",
+    "projects_deleted",
+    "projects_dates_deliver_start",
+    "projects_dates_deliver_end",
+)
+# Pending change records: ("assignment", id, asset_id | None, project_id | None),
+# ("project", id, window | None) and ("stale",) when a write cannot be followed.
+_STALE = ("stale",)
+
+
+def _window(start: datetime | None, end: datetime | None) -> Window | None:
+    if start is None or end is None:
+        return None
+    return (to_naive_utc(start), to_naive_utc(end))
+
+
+def _assignment_change(obj: AssetsAssignments, *, removed: bool = False) -> tuple[Any, ...]:
+    state = vars(obj)
+    if any(attr not in state for attr in _ASSIGNMENT_ATTRS):
+        return _STALE
+    if removed or state["assetsAssignments_deleted"]:
+        return ("assignment", state["assetsAssignments_id"], None, None)
+    return ("assignment", state["assetsAssignments_id"], state["assets_id"], state["projects_id"])
+
+
+def _project_change(obj: Projects, *, removed: bool = False) -> tuple[Any, ...]:
+    state = vars(obj)
+    if any(attr not in state for attr in _PROJECT_ATTRS):
+        return _STALE
+    if removed or state["projects_deleted"]:
+        return ("project", state["projects_id"], None)
+    window = _window(state["projects_dates_deliver_start"], state["projects_dates_deliver_end"])
+    return ("project", state["projects_id"], window)
+
+
+class AvailabilityIndex:
+    """In-process interval index of asset bookings, one per worker."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._generation = 0
+        self._loading = False
+        self._replay: list[tuple[Any, ...]] = []
+        self._fingerprint: tuple[Any, ...] | None = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._windows: dict[int, Window] = {}
+        self._assignments: dict[int, tuple[int, int]] = {}
+        self._by_asset: defaultdict[int, set[int]] = defaultdict(set)
+        self._by_project: defaultdict[int, set[int]] = defaultdict(set)
+        self._intervals: dict[int, SortedIntervals] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def needs_reload(self, *, max_age: float) -> bool:
+        """True until loaded, after a write it could not follow, or once older than *max_age* seconds."""
+
+        return not self._loaded or time.monotonic() - self._loaded_at >= max_age
+
+    def needs_check(self, *, interval: float) -> bool:
+        """True when the fingerprint was last compared at least *interval* seconds ago."""
+
+        return time.monotonic() - self._checked_at >= interval
+
+    def check(self, fingerprint: tuple[Any, ...]) -> bool:
+        """Record a fingerprint check; return whether the tables are unchanged since the load."""
+
+        with self._lock:
+            self._checked_at = time.monotonic()
+            return fingerprint == self._fingerprint
+
+    def begin_load(self) -> int:
+        """Start recording committed changes; pass the token to :meth:`finish_load`."""
+
+        with self._lock:
+            self._generation += 1
+            if not self._loading:
+                self._loading = True
+                self._replay = []
+            return self._generation
+
+    def abort_load(self, token: int) -> None:
+        """Stop recording changes for a load that failed, unless a newer load has started."""
+
+        with self._lock:
+            if token == self._generation:
+                self._loading = False
+                self._replay = []
+
+    def finish_load(
+        self,
+        token: int,
+        windows: Iterable[tuple[int, datetime, datetime]],
+        assignments: Iterable[tuple[int, int, int]],
+        fingerprint: tuple[Any, ...] | None = None,
+    ) -> None:
+        """Replace the index with freshly read rows, then replay writes seen meanwhile.
+
+        *fingerprint* must be read before the rows, so a write landing in
+        between makes the next check reload rather than go unnoticed.
+        """
+
+        with self._lock:
+            if token != self._generation:
+                # A newer load started after this one read its rows; let it win.
+                return
+            self._windows = {project_id: (to_naive_utc(start), to_naive_utc(end)) for project_id, start, end in windows}
+            self._assignments = {}
+            self._by_asset = defaultdict(set)
+            self._by_project = defaultdict(set)
+            self._intervals = {}
+            for assignment_id, asset_id, project_id in assignments:
+                self._add_assignment(assignment_id, asset_id, project_id)
+            self._loaded = True
+            self._loading = False
+            self._fingerprint = fingerprint
+            self._loaded_at = self._checked_at = time.monotonic()
+            replay, self._replay = self._replay, []
+            for change in replay:
+                self._apply(change)
+
+    def apply(self, changes: Iterable[tuple[Any, ...]]) -> None:
+        with self._lock:
+            for change in changes:
+                if self._loading:
+                    self._replay.append(change)
+                if self._loaded:
+                    self._apply(change)
+
+    def busy(self, asset_ids: Iterable[int], start: datetime, end: datetime) -> set[int]:
+        """Return the assets among *asset_ids* booked at any point in ``[start, end)``."""
+
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        with self._lock:
+            return {
+                asset_id
+                for asset_id in asset_ids
+                if asset_id in self._by_asset and self._intervals_for(asset_id).overlaps(start, end)
+            }
+
+    def _intervals_for(self, asset_id: int) -> SortedIntervals:
+        intervals = self._intervals.get(asset_id)
+        if intervals is None:
+            windows = (
+                self._windows.get(self._assignments[assignment_id][1])
+                for assignment_id in self._by_asset[asset_id]
+            )
+            intervals = SortedIntervals(window for window in windows if window is not None)
+            self._intervals[asset_id] = intervals
+        return intervals
+
+    def _add_assignment(self, assignment_id: int, asset_id: int, project_id: int) -> None:
+        self._assignments[assignment_id] = (asset_id, project_id)
+        self._by_asset[asset_id].add(assignment_id)
+        self._by_project[project_id].add(assignment_id)
+        self._intervals.pop(asset_id, None)
+
+    def _remove_assignment(self, assignment_id: int) -> None:
+        existing = self._assignments.pop(assignment_id, None)
+        if existing is None:
+            return
+        asset_id, project_id = existing
+        self._by_asset[asset_id].discard(assignment_id)
+        if not self._by_asset[asset_id]:
+            del self._by_asset[asset_id]
+        self._by_project[project_id].discard(assignment_id)
+        self._intervals.pop(asset_id, None)
+
+    def _apply(self, change: tuple[Any, ...]) -> None:
+        kind = change[0]
+        if kind == "assignment":
+            _, assignment_id, asset_id, project_id = change
+            self._remove_assignment(assignment_id)
+            if asset_id is not None:
+                self._add_assignment(assignment_id, asset_id, project_id)
+        elif kind == "project":
+            _, project_id, window = change
+            if window is None:
+                self._windows.pop(project_id, None)
+            else:
+                self._windows[project_id] = window
+            for assignment_id in self._by_project.get(project_id, ()):
+                self._intervals.pop(self._assignments[assignment_id][0], None)
+        else:
+            self._loaded = False
+
+    def watch(self) -> None:
+        """Register session listeners; affects every ``Session``, sync or async."""
+
+        event.listen(Session, "after_flush", self._after_flush)
+        event.listen(Session, "do_orm_execute", self._do_orm_execute)
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+    @staticmethod
+    def _pending(session: Session) -> list[tuple[Any, ...]]:
+        pending: list[tuple[Any, ...]] = session.info.setdefault(_INFO_KEY, [])
+        return pending
+
+    def _after_flush(self, session: Session, flush_context: UOWTransaction) -> None:
+        for obj in chain(session.new, session.dirty, session.deleted):
+            removed = obj in session.deleted
+            if isinstance(obj, AssetsAssignments):
+                self._pending(session).append(_assignment_change(obj, removed=removed))
+            elif isinstance(obj, Projects):
+                self._pending(session).append(_project_change(obj, removed=removed))
+
+    def _do_orm_execute(self, state: ORMExecuteState) -> None:
+        if not (state.is_insert or state.is_update or state.is_delete):
+            return
+        mapper = state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, (AssetsAssignments, Projects)):
+            self._pending(state.session).append(_STALE)
+
+    def _after_commit(self, session: Session) -> None:
+        pending = session.info.pop(_INFO_KEY, None)
+        if pending:
+            self.apply(pending)
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(_INFO_KEY, None)
+
+
+availability_index = AvailabilityIndex()
+availability_index.watch()
+
+
+@dataclass
+class AsyncAvailabilityService:
+    """Answers availability queries from :data:`availability_index`."""
+
+    assets: AsyncAssetsRepository
+    bookings: AsyncAvailabilityRepository
+    index: AvailabilityIndex = field(default_factory=lambda: availability_index)
+
+    @classmethod
+    def from_session(cls, session: AsyncSession) -> "AsyncAvailabilityService":
+        return cls(assets=AsyncAssetsRepository(session), bookings=AsyncAvailabilityRepository(session))
+
+    async def ensure_loaded(self) -> None:
+        """Load the index if it is missing, too old, or its fingerprint has moved."""
+
+        settings = get_settings()
+        if not self.index.needs_reload(max_age=settings.availability_max_age_seconds):
+            if not self.index.needs_check(interval=settings.availability_check_interval_seconds):
+                return
+            if self.index.check(await self.bookings.fingerprint()):
+                return
+        token = self.index.begin_load()
+        try:
+            fingerprint = await self.bookings.fingerprint()
+            windows: Sequence[Any] = await self.bookings.project_windows()
+            assignments: Sequence[Any] = await self.bookings.assignments()
+        except BaseException:
+            self.index.abort_load(token)
+            raise
+        self.index.finish_load(token, windows, assignments, fingerprint)
+
+    async def check(
+        self,
+        *,
+        start: datetime,
+        end: datetime,
+        asset_type_id: int | None = None,
+        instance_id: int | None = None,
+    ) -> AssetAvailabilityResponse:
+        await self.ensure_loaded()
+        filters = AssetFilters(
+            instance_id=instance_id,
+            asset_type_id=asset_type_id,
+            storage_location_id=None,
+            deleted=False,
+            archived=None,
+            current_location_id=None,
+        )
+        asset_ids = await self.assets.list_asset_ids(filters=filters)
+        busy = self.index.busy(asset_ids, start, end)
+        return AssetAvailabilityResponse(
+            start=start,
+            end=end,
+            asset_type_id=asset_type_id,
+            available=[asset_id for asset_id in asset_ids if asset_id not in busy],
+            unavailable=[asset_id for asset_id in asset_ids if asset_id in busy],
+        )
+
+
+__all__ = [
+    "AvailabilityIndex",
+    "AsyncAvailabilityService",
+    "availability_index",
+]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.caching import TTLCache
+from app.core.config import get_settings
+from app.core.datetimes import to_naive_utc
+from app.core.tenancy import current_instance_id
+from app.db.changes import asset_changes, barcode_changes
+from app.repositories.barcodes import AsyncBarcodesRepository
+from app.schemas.assets import AssetSummary, field_columns
+from app.schemas.barcodes import BarcodeDetails, BarcodeScanIn, BarcodeScansBulkResponse
+
+
+def _build_barcode_cache() -> TTLCache[BarcodeDetails]:
+    settings = get_settings()
+    return TTLCache(
+        ttl_seconds=settings.barcode_cache_ttl_seconds,
+        max_entries=settings.barcode_cache_max_entries,
+    )
+
+
+# Resolved barcodes keyed by value; scanner bursts repeat the same handful of values.
+barcode_cache: TTLCache[BarcodeDetails] = _build_barcode_cache()
+barcode_changes.subscribe(barcode_cache.clear)
+# Cached entries embed the asset summary, so asset writes invalidate them too.
+asset_changes.subscribe(barcode_cache.clear)
+
+
+# Columns backing the embedded AssetSummary, including the effective rates.
+_ASSET_COLUMNS: tuple[str, ...] = tuple(
+    column for columns in field_columns(AssetSummary).values() for column in columns
+)
+
+
+def _barcode_details(row: Any) -> BarcodeDetails:
+    details = BarcodeDetails.model_validate(row[0])
+    if row._mapping["assets_id"] is not None:
+        details.asset = AssetSummary.model_validate(row._mapping)
+    return details
+
+
+def _scan_row(scan: BarcodeScanIn, barcode: BarcodeDetails) -> dict[str, Any]:
+    return {
+        "assetsBarcodes_id": barcode.id,
+        "assetsBarcodesScans_timestamp": to_naive_utc(scan.scanned_at),
+        "users_userid": scan.user_id,
+        "locationsBarcodes_id": scan.location_barcode_id,
+        "location_assets_id": scan.location_asset_id,
+        "assetsBarcodes_customLocation": scan.custom_location,
+    }
+
+
+def _latest_scans(
+    scans: Sequence[BarcodeScanIn], resolved: dict[str, BarcodeDetails]
+) -> dict[int, BarcodeScanIn]:
+    """Pick the newest scan per asset; later entries win ties, as they were sent later."""
+
+    latest: dict[int, BarcodeScanIn] = {}
+    for scan in scans:
+        barcode = resolved.get(scan.value)
+        if barcode is None or barcode.asset_id is None:
+            continue
+        current = latest.get(barcode.asset_id)
+        if current is None or to_naive_utc(scan.scanned_at) >= to_naive_utc(current.scanned_at):
+            latest[barcode.asset_id] = scan
+    return latest
+
+
+def _current_location_row(
+    asset_id: int, scan: BarcodeScanIn, barcode: BarcodeDetails, location_ids: dict[int, int]
+) -> dict[str, Any]:
+    return {
+        "assets_id": asset_id,
+        "assetsBarcodes_id": barcode.id,
+        "scanned_at": to_naive_utc(scan.scanned_at),
+        "locations_id": location_ids.get(scan.location_barcode_id) if scan.location_barcode_id else None,
+        "location_assets_id": scan.location_asset_id,
+        "custom_location": scan.custom_location,
+    }
+
+
+@dataclass
+class AsyncBarcodesService:
+    """Barcode resolution and scan ingestion for handheld scanners."""
+
+    repository: AsyncBarcodesRepository
+    cache: TTLCache[BarcodeDetails] = field(default_factory=lambda: barcode_cache)
+
+    @classmethod
+    def from_session(cls, session: AsyncSession) -> "AsyncBarcodesService":
+        return cls(repository=AsyncBarcodesRepository(session))
+
+    async def resolve(self, values: Iterable[str]) -> dict[str, BarcodeDetails]:
+        """Resolve *values* to live barcodes, querying only those not already cached."""
+
+        resolved: dict[str, BarcodeDetails] = {}
+        misses: list[str] = []
+        # Each tenant resolves values against its own assets, so entries are kept apart.
+        instance_id = current_instance_id()
+        for value in dict.fromkeys(values):
+            cached = self.cache.get((instance_id, value))
+            if cached is None:
+                misses.append(value)
+            else:
+                resolved[value] = cached
+        if misses:
+            for row in await self.repository.find_by_values(misses, _ASSET_COLUMNS, instance_id=instance_id):
+                details = _barcode_details(row)
+                # Rows are ordered by id, so the oldest live barcode wins on duplicates.
+                if details.value not in resolved:
+                    resolved[details.value] = details
+                    self.cache.set((instance_id, details.value), details)
+        return resolved
+
+    async def lookup(self, value: str) -> BarcodeDetails | None:
+        return (await self.resolve([value])).get(value)
+
+    async def ingest_scans(self, scans: Sequence[BarcodeScanIn]) -> BarcodeScansBulkResponse:
+        resolved = await self.resolve(scan.value for scan in scans)
+        rows = [_scan_row(scan, resolved[scan.value]) for scan in scans if scan.value in resolved]
+        if rows:
+            await self.repository.insert_scans(rows)
+            await self._project_current_locations(_latest_scans(scans, resolved), resolved)
+            await self.repository.commit()
+        unknown = [value for value in dict.fromkeys(scan.value for scan in scans) if value not in resolved]
+        return BarcodeScansBulkResponse(inserted=len(rows), unknown=unknown)
+
+    async def _project_current_locations(
+        self, latest: dict[int, BarcodeScanIn], resolved: dict[str, BarcodeDetails]
+    ) -> None:
+        if not latest:
+            return
+        location_barcode_ids = {scan.location_barcode_id for scan in latest.values() if scan.location_barcode_id}
+        location_ids = await self.repository.location_ids(location_barcode_ids) if location_barcode_ids else {}
+        await self.repository.upsert_current_locations(
+            [
+                _current_location_row(asset_id, scan, resolved[scan.value], location_ids)
+                for asset_id, scan in latest.items()
+            ]
+        )
+
+
+__all__ = ["AsyncBarcodesService", "barcode_cache"]
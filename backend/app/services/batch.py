@@ -0,0 +1,218 @@
+"""Runs a batch of GET sub-requests through the application in-process.
+
+Each sub-request is dispatched straight into the ASGI app with a scope derived
+from the batch request, so it passes the same middleware, dependencies and
+tenant scoping as a direct call but skips the network, TLS and HTTP parsing.
+Sub-requests run concurrently up to ``max_concurrency``. Their bodies are
+copied into the envelope as they are: JSON bodies are inlined without being
+decoded and re-encoded.
+
+Bodies are buffered, so each is capped at ``max_item_bytes`` and all of them
+together at ``max_batch_bytes``. A sub-request that outgrows either is told
+the client disconnected, which stops streaming responses such as the export,
+and the rest of its body is dropped. An item over its own cap answers 413 in
+the envelope; a batch over its cap is refused with 413 as a whole.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Sequence
+from urllib.parse import unquote, urlsplit
+
+import structlog
+from fastapi import status
+from starlette.types import ASGIApp, Message, Scope
+
+from app.core.exceptions import ApplicationError
+from app.schemas.batch import BatchRequestItem
+
+logger = structlog.get_logger(__name__)
+
+# Headers that describe the batch request itself rather than each sub-request.
+_DROPPED_REQUEST_HEADERS = frozenset(
+    {
+        b"accept-encoding",
+        b"connection",
+        b"content-length",
+        b"content-type",
+        b"expect",
+        b"if-modified-since",
+        b"if-none-match",
+        b"transfer-encoding",
+    }
+)
+_RESULT_HEADERS = (b"content-type", b"etag")
+_COPIED_SCOPE_KEYS = ("asgi", "http_version", "scheme", "server", "client", "root_path")
+
+
+class BatchTooLargeError(ApplicationError):
+    """Raised when the sub-responses of a batch outgrow its byte cap."""
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(
+            f"Batch responses exceed {max_bytes} bytes",
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SubResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+
+@dataclass
+class _ByteBudget:
+    """Bytes the sub-responses of one batch may still buffer between them."""
+
+    remaining: int
+    exceeded: bool = field(default=False, init=False)
+
+    def spend(self, size: int) -> bool:
+        self.remaining -= size
+        self.exceeded = self.exceeded or self.remaining < 0
+        return not self.exceeded
+
+
+def _too_large(max_bytes: int | None) -> SubResponse:
+    detail = "Batch responses are too large" if max_bytes is None else f"Response exceeds {max_bytes} bytes"
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    return SubResponse(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, {"content-type": "application/json"}, body)
+
+
+def _subrequest_scope(parent: Scope, path: str) -> Scope:
+    parts = urlsplit(path)
+    headers = [(name, value) for name, value in parent["headers"] if name not in _DROPPED_REQUEST_HEADERS]
+    scope: Scope = {key: parent[key] for key in _COPIED_SCOPE_KEYS if key in parent}
+    scope.update(
+        type="http",
+        method="GET",
+        path=unquote(parts.path),
+        raw_path=parts.path.encode("latin-1"),
+        query_string=parts.query.encode("latin-1"),
+        headers=headers,
+    )
+    if "state" in parent:
+        # Lifespan state is shared; each request gets a shallow copy, as Starlette does.
+        scope["state"] = dict(parent["state"])
+    return scope
+
+
+async def dispatch_get(
+    app: ASGIApp,
+    parent: Scope,
+    path: str,
+    *,
+    max_bytes: int | None = None,
+    budget: _ByteBudget | None = None,
+) -> SubResponse:
+    """Run ``GET path`` through *app* and buffer its response.
+
+    A body longer than *max_bytes*, or than what is left of *budget*, is cut
+    short and answered with 413.
+    """
+
+    finished = asyncio.Event()
+    request_sent = False
+    status_code: int | None = None
+    headers: dict[str, str] = {}
+    chunks: list[bytes] = []
+    size = 0
+    overflowed = False
+    item_overflowed = False
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        nonlocal status_code, size, overflowed, item_overflowed
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            for name, value in message.get("headers", ()):
+                if name.lower() in _RESULT_HEADERS:
+                    headers[name.lower().decode("latin-1")] = value.decode("latin-1")
+        elif message["type"] == "http.response.body" and not overflowed:
+            body = message.get("body", b"")
+            size += len(body)
+            item_overflowed = max_bytes is not None and size > max_bytes
+            within_budget = budget is None or budget.spend(len(body))
+            if item_overflowed or not within_budget:
+                # Stop buffering and let streaming responses see a disconnect.
+                overflowed = True
+                chunks.clear()
+                finished.set()
+            else:
+                chunks.append(body)
+
+    try:
+        await app(_subrequest_scope(parent, path), receive, send)
+    except Exception:
+        # The error middleware has usually sent a 500 already before re-raising.
+        logger.exception("batch_subrequest_failed", path=path)
+        if status_code is None:
+            return SubResponse(500, {"content-type": "application/json"}, b'{"detail":"Internal server error"}')
+    finally:
+        finished.set()
+    if overflowed:
+        return _too_large(max_bytes if item_overflowed else None)
+    return SubResponse(status_code or 500, headers, b"".join(chunks))
+
+
+def _encode_item(item_id: str, response: SubResponse) -> bytes:
+    if not response.body:
+        body = b"null"
+    elif response.headers.get("content-type", "").startswith("application/json"):
+        body = response.body
+    else:
+        body = json.dumps(response.body.decode("utf-8", errors="replace")).encode("utf-8")
+    head = json.dumps({"id": item_id, "status": response.status, "headers": response.headers})
+    return head[:-1].encode("utf-8") + b',"body":' + body + b"}"
+
+
+@dataclass
+class BatchService:
+    """Fans a list of GET sub-requests out over one ASGI application."""
+
+    app: ASGIApp
+    parent: Scope
+    max_concurrency: int
+    max_item_bytes: int | None = None
+    max_batch_bytes: int | None = None
+
+    async def run(self, items: Sequence[BatchRequestItem]) -> bytes:
+        """Return the serialized ``BatchResponse`` envelope for *items*, in request order.
+
+        Raises :class:`BatchTooLargeError` when the bodies outgrow ``max_batch_bytes``.
+        """
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        budget = None if self.max_batch_bytes is None else _ByteBudget(self.max_batch_bytes)
+
+        async def run_one(item: BatchRequestItem) -> SubResponse:
+            async with semaphore:
+                if budget is not None and budget.exceeded:
+                    return _too_large(None)
+                return await dispatch_get(
+                    self.app, self.parent, item.path, max_bytes=self.max_item_bytes, budget=budget
+                )
+
+        responses: list[SubResponse] = await asyncio.gather(*(run_one(item) for item in items))
+        if budget is not None and budget.exceeded and self.max_batch_bytes is not None:
+            raise BatchTooLargeError(self.max_batch_bytes)
+        encoded = (
+            _encode_item(item.id if item.id is not None else str(position), response)
+            for position, (item, response) in enumerate(zip(items, responses, strict=True))
+        )
+        return b'{"items":[' + b",".join(encoded) + b"]}"
+
+
+__all__ = ["BatchService", "BatchTooLargeError", "SubResponse", "dispatch_get"]
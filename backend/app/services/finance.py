@@ -0,0 +1,145 @@
+"""Keeps ``projectsFinanceCache`` in step with project assignments.
+
+Committed ORM changes to assignments, projects and asset rates mark the
+projects they affect; just before the transaction commits, only those projects
+are re-totalled by :mod:`app.core.finance` and their cache rows written in
+bulk, so readers never see totals from a different transaction than the lines.
+Bulk statements and the legacy PHP application are not followed; run
+``python -m app.services.finance`` to recompute every live project.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Iterable
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import Session, UOWTransaction
+
+from app.core.config import get_settings
+from app.core.datetimes import to_naive_utc
+from app.core.finance import ProjectTotals, compute_totals, hire_period, totals_for
+from app.models.generated import Assets, AssetsAssignments, Projects
+from app.repositories.finance import FinanceRepository
+
+_PROJECTS_KEY = "pending_changes:finance_projects"
+_ASSETS_KEY = "pending_changes:finance_assets"
+_ASSET_PRICE_ATTRS = ("assets_dayRate", "assets_weekRate", "assets_value", "assets_mass", "assetTypes_id")
+_PROJECT_PRICE_ATTRS = (
+    "projects_dates_deliver_start",
+    "projects_dates_deliver_end",
+    "projects_dates_finances_days",
+    "projects_dates_finances_weeks",
+    "projects_deleted",
+)
+
+
+@dataclass
+class ProjectFinanceService:
+    """Recomputes the cached equipment totals of a set of projects."""
+
+    repository: FinanceRepository
+
+    @classmethod
+    def from_session(cls, session: Session) -> "ProjectFinanceService":
+        return cls(repository=FinanceRepository(session))
+
+    def recompute(self, project_ids: Iterable[int]) -> list[ProjectTotals]:
+        """Re-total the live projects among *project_ids* and write their cache rows."""
+
+        ids = sorted(set(project_ids))
+        if not ids:
+            return []
+        periods = {
+            project_id: hire_period(start, end, finance_days=days, finance_weeks=weeks)
+            for project_id, start, end, days, weeks in self.repository.project_periods(ids)
+        }
+        computed = compute_totals(self.repository.equipment_lines(list(periods)), periods)
+        totals = totals_for(periods, computed)
+        self.repository.write_totals(totals, to_naive_utc(datetime.now(timezone.utc)))
+        return totals
+
+    def recompute_all(self) -> list[ProjectTotals]:
+        return self.recompute(self.repository.live_project_ids())
+
+
+def _changed(obj: object, attrs: Iterable[str]) -> bool:
+    state = inspect(obj, raiseerr=True)
+    return any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+def _after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    projects: set[int] = session.info.setdefault(_PROJECTS_KEY, set())
+    assets: set[int] = session.info.setdefault(_ASSETS_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, AssetsAssignments):
+            attr = inspect(obj).attrs.projects_id
+            history = attr.history
+            if history.empty() and obj not in session.deleted:
+                projects.add(attr.value)
+            # A moved assignment changes both the old project and the new one.
+            projects.update(project_id for project_id in chain(history.sum(), history.deleted) if project_id is not None)
+        elif isinstance(obj, Projects) and obj not in session.deleted:
+            if obj in session.new or _changed(obj, _PROJECT_PRICE_ATTRS):
+                projects.add(inspect(obj).attrs.projects_id.value)
+        elif isinstance(obj, Assets) and obj in session.dirty and _changed(obj, _ASSET_PRICE_ATTRS):
+            assets.add(inspect(obj).attrs.assets_id.value)
+
+
+def _discard(session: Session) -> None:
+    session.info.pop(_PROJECTS_KEY, None)
+    session.info.pop(_ASSETS_KEY, None)
+
+
+def _before_commit(session: Session) -> None:
+    if not get_settings().finance_cache_enabled:
+        _discard(session)
+        return
+    # Commit flushes only after this hook; flush now so the totals see the final lines.
+    session.flush()
+    projects: set[int] = session.info.pop(_PROJECTS_KEY, set())
+    assets: set[int] = session.info.pop(_ASSETS_KEY, set())
+    if not (projects or assets):
+        return
+    service = ProjectFinanceService.from_session(session)
+    if assets:
+        projects |= service.repository.project_ids_for_assets(assets)
+    service.recompute(projects)
+
+
+def watch() -> None:
+    """Register the session listeners; they are no-ops while the cache is disabled."""
+
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "before_commit", _before_commit)
+    event.listen(Session, "after_rollback", _discard)
+
+
+watch()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute projectsFinanceCache for every live project.")
+    parser.add_argument(
+        "--database-url",
+        dest="database_url",
+        default=os.environ.get("APP_DATABASE_URL", get_settings().database_url),
+    )
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, future=True)
+    with Session(engine) as session:
+        totals = ProjectFinanceService.from_session(session).recompute_all()
+        session.commit()
+    print(f"Recomputed finance totals for {len(totals)} projects")
+
+
+__all__ = ["ProjectFinanceService", "watch", "main"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.tenancy import current_instance_id
+from app.db import search_index as _search_index  # noqa: F401  (registers the index flush listener)
+from app.repositories.search import AsyncSearchRepository, search_tokens
+from app.schemas.search import SearchHit, SearchResponse
+
+_EXCERPT_LENGTH = 160
+# Client bodies are contact details (email, phone, address); only tenant-scoped requests see them.
+_CONTACT_ENTITIES = frozenset({"client"})
+
+
+def _hit(row: Any, *, scoped: bool) -> SearchHit:
+    hit = SearchHit.model_validate(row)
+    body = row["body"]
+    if body and (scoped or row["entity"] not in _CONTACT_ENTITIES):
+        hit.excerpt = body if len(body) <= _EXCERPT_LENGTH else body[: _EXCERPT_LENGTH - 1].rstrip() + "…"
+    return hit
+
+
+@dataclass
+class AsyncSearchService:
+    """Global search across assets, asset types, projects, clients and users."""
+
+    repository: AsyncSearchRepository
+
+    @classmethod
+    def from_session(cls, session: AsyncSession) -> "AsyncSearchService":
+        return cls(repository=AsyncSearchRepository(session))
+
+    async def search(
+        self,
+        query: str,
+        *,
+        limit: int,
+        types: Sequence[str] | None = None,
+        instance_id: int | None = None,
+    ) -> SearchResponse:
+        tokens = search_tokens(query)
+        if not tokens:
+            return SearchResponse(query=query, hits=[])
+        rows = await self.repository.search(tokens, limit=limit, entities=types, instance_id=instance_id)
+        scoped = current_instance_id() is not None
+        return SearchResponse(query=query, hits=[_hit(row, scoped=scoped) for row in rows])
+
+
+__all__ = ["AsyncSearchService"]
@@ -0,0 +1,128 @@
+"""Per-item cost of building and serializing an asset list page.
+
+Run from the backend directory::
+
+    python -m benchmarks.asset_serialization --items 100 --rounds 200
+
+``before`` reproduces the previous list path: ORM entities (with the
+effective rates selected alongside), one ``model_validate`` per item, then FastAPI's ``response_model`` pass
+(re-validation, ``jsonable_encoder`` and ``json.dumps``). ``after`` is the
+current service path: Core row mappings, one cached ``TypeAdapter`` call and
+a single pydantic-core JSON dump.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import timeit
+from datetime import datetime, timezone
+
+os.environ.setdefault("APP_DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.models.generated import Assets, AssetTypes  # noqa: E402
+from app.repositories.assets import EFFECTIVE_COLUMNS, AsyncAssetsRepository, asset_columns  # noqa: E402
+from app.schemas.assets import AssetListResponse, AssetSummary  # noqa: E402
+from app.services.assets import AsyncAssetsService  # noqa: E402
+
+
+def _seed(session: Session, items: int) -> None:
+    AssetTypes.__table__.create(session.connection())
+    Assets.__table__.create(session.connection())
+    now = datetime.now(timezone.utc)
+    session.execute(
+        insert(AssetTypes),
+        [
+            {
+                "assetTypes_id": 1,
+                "assetTypes_name": "Benchmark type",
+                "assetCategories_id": 1,
+                "manufacturers_id": 1,
+                "assetTypes_dayRate": 2500,
+                "assetTypes_weekRate": 10000,
+                "assetTypes_value": 35000,
+            }
+        ],
+    )
+    session.execute(
+        insert(Assets),
+        [
+            {
+                "assets_tag": f"AST-{index:05d}",
+                "assetTypes_id": 1,
+                "instances_id": 1,
+                "assets_notes": f"Benchmark asset {index}",
+                "assets_inserted": now,
+                "assets_dayRate": 1000 + index,
+                "assets_weekRate": 4000 + index,
+                "assets_value": 10000 + index,
+                "assets_deleted": False,
+                "assets_showPublic": True,
+            }
+            for index in range(items)
+        ],
+    )
+
+
+def _before(session: Session, items: int) -> bytes:
+    # Start from an empty identity map, as each request's session would.
+    session.expunge_all()
+    stmt = (
+        select(Assets, *asset_columns(EFFECTIVE_COLUMNS))
+        .join(AssetTypes, AssetTypes.assetTypes_id == Assets.assetTypes_id)
+        .order_by(Assets.assets_id)
+        .limit(items + 1)
+    )
+    records = session.execute(stmt).all()
+    response = AssetListResponse(
+        items=[
+            AssetSummary.model_validate({**vars(asset), **dict(zip(EFFECTIVE_COLUMNS, effective, strict=True))})
+            for asset, *effective in records[:items]
+        ],
+        total=items,
+        limit=items,
+        offset=0,
+    )
+    validated = AssetListResponse.model_validate(response.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+
+async def _after(service: AsyncAssetsService, items: int) -> bytes:
+    page = await service.list_assets(limit=items, total_mode="none")
+    return page.model_dump_json().encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100, help="Items per page")
+    parser.add_argument("--rounds", type=int, default=200, help="Pages rendered per timing run")
+    args = parser.parse_args()
+
+    # One shared connection, so every query sees the seeded in-memory database.
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    with asyncio.Runner() as runner:
+        session = AsyncSession(engine)
+        runner.run(session.run_sync(_seed, args.items))
+        service = AsyncAssetsService(repository=AsyncAssetsRepository(session))
+        cases = {
+            "before": lambda: runner.run(session.run_sync(_before, args.items)),
+            "after": lambda: runner.run(_after(service, args.items)),
+        }
+        for name, case in cases.items():
+            best = min(timeit.repeat(case, number=args.rounds, repeat=5))
+            per_item = best / args.rounds / args.items * 1e6
+            print(f"{name:>6}: {per_item:8.2f} µs/item")
+        runner.run(session.close())
+        runner.run(engine.dispose())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Per-request CPU of the asset list and count queries, rebuilt vs cached.
+
+Run from the backend directory::
+
+    python -m benchmarks.asset_statements --items 1000 --rounds 2000
+
+``rebuilt`` builds a fresh ``select()`` for every call, as the repository did
+before statement templates, so SQLAlchemy derives its cache key each time.
+``cached`` goes through :meth:`AsyncAssetsRepository.list_asset_rows`
+and :meth:`AsyncAssetsRepository.count_assets`, which reuse one template per query
+shape and only bind the request's values. Both run against in-memory SQLite
+with a filter and a small page, where statement overhead dominates; times are
+process CPU, not wall clock.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+import timeit
+from datetime import datetime, timezone
+
+os.environ.setdefault("APP_DATABASE_URL", "sqlite://")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.models.generated import Assets, AssetTypes  # noqa: E402
+from app.repositories.assets import AsyncAssetsRepository  # noqa: E402
+from app.schemas.assets import AssetFilters  # noqa: E402
+from app.services.assets import _summary_columns  # noqa: E402
+
+
+def _seed(session: Session, items: int) -> None:
+    AssetTypes.__table__.create(session.connection())
+    Assets.__table__.create(session.connection())
+    now = datetime.now(timezone.utc)
+    session.execute(
+        insert(AssetTypes),
+        [
+            {
+                "assetTypes_id": 1,
+                "assetTypes_name": "Benchmark type",
+                "assetCategories_id": 1,
+                "manufacturers_id": 1,
+                "assetTypes_dayRate": 2500,
+                "assetTypes_weekRate": 10000,
+                "assetTypes_value": 35000,
+            }
+        ],
+    )
+    session.execute(
+        insert(Assets),
+        [
+            {
+                "assets_tag": f"AST-{index:05d}",
+                "assetTypes_id": 1,
+                "instances_id": 1 + index % 2,
+                "assets_inserted": now,
+                "assets_deleted": False,
+                "assets_showPublic": True,
+            }
+            for index in range(items)
+        ],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000, help="Assets in the table")
+    parser.add_argument("--rounds", type=int, default=2000, help="Queries per timing run")
+    args = parser.parse_args()
+
+    # One shared connection, so every query sees the seeded in-memory database.
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    with asyncio.Runner() as runner:
+        session = AsyncSession(engine)
+        runner.run(session.run_sync(_seed, args.items))
+        repository = AsyncAssetsRepository(session)
+        columns = _summary_columns(None)
+        filters = AssetFilters(instance_id=1, deleted=False)
+        page = dict(limit=20, offset=40, search=None, after_id=None, sort="id", filters=filters)
+
+        async def rebuilt_list() -> object:
+            stmt = repository._list_statement(columns=columns, **page)
+            return (await session.execute(stmt)).mappings().all()
+
+        async def rebuilt_count() -> object:
+            return (await session.execute(repository._count_statement(search=None, filters=filters))).scalar_one()
+
+        cases = {
+            "list rebuilt": lambda: runner.run(rebuilt_list()),
+            "list cached": lambda: runner.run(repository.list_asset_rows(columns=columns, **page)),
+            "count rebuilt": lambda: runner.run(rebuilt_count()),
+            "count cached": lambda: runner.run(repository.count_assets(filters=filters)),
+        }
+        for name, case in cases.items():
+            best = min(timeit.repeat(case, number=args.rounds, repeat=5, timer=time.process_time))
+            print(f"{name:>13}: {best / args.rounds * 1e6:8.2f} µs/query")
+        runner.run(session.close())
+        runner.run(engine.dispose())
+
+
+if __name__ == "__main__":
+    main()
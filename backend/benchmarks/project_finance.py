@@ -0,0 +1,123 @@
+"""Cost of recomputing one large project's ``projectsFinanceCache`` row.
+
+Run from the backend directory::
+
+    python -m benchmarks.project_finance --lines 2000 --rounds 50
+
+``totals`` times :func:`app.core.finance.compute_totals` alone over
+pre-fetched lines.
+``recompute`` is the full commit-hook path against in-memory SQLite: one
+period query, one joined line query, the totals and the cache row write.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import timeit
+from datetime import datetime
+
+os.environ.setdefault("APP_DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.finance import compute_totals, hire_period  # noqa: E402
+from app.models.generated import Assets, AssetsAssignments, AssetTypes, Projects, ProjectsFinanceCache  # noqa: E402
+from app.services.finance import ProjectFinanceService  # noqa: E402
+
+
+def _seed(session: Session, lines: int) -> int:
+    connection = session.connection()
+    for model in (AssetTypes, Assets, Projects, AssetsAssignments, ProjectsFinanceCache):
+        model.__table__.create(connection)
+    session.execute(
+        insert(AssetTypes),
+        [
+            {
+                "assetTypes_id": 1,
+                "assetTypes_name": "Benchmark type",
+                "assetCategories_id": 1,
+                "manufacturers_id": 1,
+                "assetTypes_dayRate": 2500,
+                "assetTypes_weekRate": 10000,
+                "assetTypes_value": 35000,
+            }
+        ],
+    )
+    session.execute(
+        insert(Assets),
+        [
+            {
+                "assets_id": index + 1,
+                "assetTypes_id": 1,
+                "instances_id": 1,
+                "assets_inserted": datetime(2026, 1, 1),
+                # Every other asset falls back to the type's rates.
+                "assets_dayRate": None if index % 2 else 1000 + index,
+                "assets_weekRate": None if index % 2 else 4000 + index,
+                "assets_deleted": False,
+                "assets_showPublic": True,
+            }
+            for index in range(lines)
+        ],
+    )
+    session.execute(
+        insert(Projects),
+        [
+            {
+                "projects_id": 1,
+                "projects_name": "Benchmark project",
+                "instances_id": 1,
+                "projects_manager": 1,
+                "projects_created": datetime(2026, 1, 1),
+                "projects_deleted": False,
+                "projects_archived": False,
+                "projects_dates_deliver_start": datetime(2026, 6, 1),
+                "projects_dates_deliver_end": datetime(2026, 6, 17),
+                "projects_status": 1,
+                "projects_defaultDiscount": 0.0,
+                "projectsTypes_id": 1,
+            }
+        ],
+    )
+    session.execute(
+        insert(AssetsAssignments),
+        [
+            {
+                "assets_id": index + 1,
+                "projects_id": 1,
+                "assetsAssignments_customPrice": 0 if index % 5 else 750,
+                "assetsAssignments_discount": float(index % 4) * 5,
+                "assetsAssignments_deleted": False,
+            }
+            for index in range(lines)
+        ],
+    )
+    return 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=2000, help="Assignments on the project")
+    parser.add_argument("--rounds", type=int, default=50, help="Recomputes per timing run")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", future=True)
+    with Session(engine) as session:
+        project_id = _seed(session, args.lines)
+        service = ProjectFinanceService.from_session(session)
+        lines = service.repository.equipment_lines([project_id])
+        periods = {project_id: hire_period(datetime(2026, 6, 1), datetime(2026, 6, 17))}
+        cases = {
+            "totals": lambda: compute_totals(lines, periods),
+            "recompute": lambda: service.recompute([project_id]),
+        }
+        print(f"lines: {len(lines)}")
+        for name, case in cases.items():
+            best = min(timeit.repeat(case, number=args.rounds, repeat=5))
+            print(f"{name:>9}: {best / args.rounds * 1e3:8.3f} ms/project")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,3 +12,10 @@ def test_health_endpoint_returns_ok() -> None:
 
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_replica_health_is_empty_without_replicas() -> None:
+    response = client.get("/api/health/replicas")
+
+    assert response.status_code == 200
+    assert response.json() == []
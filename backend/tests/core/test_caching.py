@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from app.core.caching import TTLCache
+
+
+def test_ttl_cache_expires_and_evicts() -> None:
+    now = [0.0]
+    cache: TTLCache[int] = TTLCache(ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+
+    assert cache.get_or_set("a", lambda: 1) == 1
+    assert cache.get_or_set("a", lambda: 2) == 1
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert len(cache) == 2
+
+    now[0] = 11.0
+    assert cache.get("b") is None
+    assert cache.get_or_set("b", lambda: 5) == 5
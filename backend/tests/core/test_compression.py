@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.compression import CODECS, CompressionMiddleware, negotiate
+
+
+def test_negotiate_honours_q_values_and_server_preference() -> None:
+    codecs = {name: CODECS["gzip"] for name in ("zstd", "br", "gzip")}
+    assert negotiate(None, codecs) is None
+    assert negotiate("identity", codecs) is None
+    assert negotiate("gzip, deflate", codecs) == "gzip"
+    assert negotiate("gzip, br, zstd", codecs) == "zstd"
+    assert negotiate("gzip;q=1.0, br;q=0.5", codecs) == "gzip"
+    assert negotiate("*;q=0.2, zstd;q=0", codecs) == "br"
+    assert negotiate("gzip;q=0", codecs) is None
+    assert negotiate("gzip;q=oops, br", codecs) == "br"
+
+
+def _app() -> Starlette:
+    async def large(request: object) -> PlainTextResponse:
+        return PlainTextResponse("x" * 2000)
+
+    async def small(request: object) -> PlainTextResponse:
+        return PlainTextResponse("x")
+
+    async def stream(request: object) -> StreamingResponse:
+        async def chunks():
+            for _ in range(3):
+                yield b"y" * 1000
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app = Starlette(routes=[Route("/large", large), Route("/small", small), Route("/stream", stream)])
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return app
+
+
+def test_middleware_compresses_complete_and_streamed_bodies() -> None:
+    client = TestClient(_app())
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == "x" * 2000
+
+    raw = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    streamed = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert streamed.headers["content-encoding"] == "gzip"
+    assert "content-length" not in streamed.headers
+    assert streamed.content == b"y" * 3000
+
+
+def test_gzip_stream_flushes_every_chunk() -> None:
+    stream = CODECS["gzip"].stream()
+    first = stream.chunk(b"a" * 1000)
+    # A flushed chunk decodes on its own, before the stream ends.
+    assert zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(first) == b"a" * 1000
+    body = first + stream.chunk(b"b" * 1000) + stream.finish()
+    assert gzip.decompress(body) == b"a" * 1000 + b"b" * 1000
+
+
+def test_gzip_codec_is_deterministic() -> None:
+    body = b"payload" * 100
+    assert CODECS["gzip"].compress(body) == CODECS["gzip"].compress(body)
+    assert gzip.decompress(CODECS["gzip"].compress(body)) == body
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.core.finance import ProjectTotals, compute_totals, hire_period, line_discount, line_price, totals_for
+
+
+# (start, end, overrides) -> (weeks, days), as projectFinance::durationMaths returns them.
+@pytest.mark.parametrize(
+    ("start", "end", "overrides", "expected"),
+    [
+        (datetime(2026, 6, 1), datetime(2026, 6, 10), {}, (0, 10)),
+        (datetime(2026, 6, 1, 9), datetime(2026, 6, 1, 17), {}, (0, 1)),
+        (datetime(2026, 6, 1, 23), datetime(2026, 6, 2, 1), {}, (0, 2)),
+        (datetime(2026, 6, 8), datetime(2026, 6, 1), {}, (0, 1)),
+        (None, None, {}, (0, 1)),
+        (datetime(1970, 1, 1), None, {}, (0, 1)),
+        (datetime(2026, 6, 1), datetime(2026, 6, 10), {"finance_days": 2, "finance_weeks": 1}, (1, 2)),
+        (datetime(2026, 6, 1), datetime(2026, 6, 10), {"finance_days": 0, "finance_weeks": 0}, (0, 0)),
+        # Both overrides must be set.
+        (datetime(2026, 6, 1), datetime(2026, 6, 10), {"finance_days": 3}, (0, 10)),
+    ],
+)
+def test_hire_period_matches_duration_maths(start, end, overrides, expected) -> None:
+    assert hire_period(start, end, **overrides) == expected
+
+
+def test_line_price_and_discount_follow_php_rounding() -> None:
+    assert line_price(1, 2, 2000, 8000, 0) == 12000
+    assert line_price(1, 2, None, None, None) == 0
+    # A custom price of 0 is unset in PHP; anything else replaces the rates.
+    assert line_price(1, 2, 2000, 8000, 500) == 500
+    assert line_discount(4500, 10.0) == 450
+    assert line_discount(4500, 0) == 0
+    assert line_discount(4500, -5.0) == 0
+    # 25 * 0.9 = 22.5 rounds half up to 23, not to the even 22.
+    assert line_discount(25, 10.0) == 2
+    # 1005 * 0.975 = 979.875.
+    assert line_discount(1005, 2.5) == 25
+
+
+LINES = [
+    # projects_id, day, week, value, mass, custom price, discount %
+    (1, 2000, 8000, 20000, Decimal("1.25"), 0, 0.0),
+    (1, 1500, 6000, 15000, Decimal("0.5"), 0, 10.0),
+    (1, 2000, 8000, 20000, 0, 500, 50.0),
+    (2, 100, 250, 900, Decimal("3"), 0, 0.0),
+]
+PERIODS = {1: (0, 3), 2: (2, 1)}
+
+
+def test_compute_totals_prices_lines_per_project() -> None:
+    totals = compute_totals(LINES, PERIODS)
+
+    # 3 * 2000, 3 * 1500 less 10%, and a custom 500 less 50%.
+    assert totals[1] == ProjectTotals(1, subtotal=11000, discounts=700, value=55000, mass=Decimal("1.75"))
+    assert totals[1].total == 10300
+    # Overridden to two weeks and a day.
+    assert totals[2] == ProjectTotals(2, subtotal=600, discounts=0, value=900, mass=Decimal("3.0"))
+    assert compute_totals([], PERIODS) == {}
+    assert totals_for([2, 3], totals) == [totals[2], ProjectTotals(3)]
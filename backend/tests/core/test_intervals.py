@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from app.core.intervals import SortedIntervals
+
+
+def test_sorted_intervals_overlap_is_half_open() -> None:
+    intervals = SortedIntervals([(10, 20), (1, 3), (5, 6), (4, 4)])
+
+    assert len(intervals) == 3
+    assert intervals.overlaps(2, 4)
+    assert intervals.overlaps(0, 100)
+    assert intervals.overlaps(19, 30)
+    assert not intervals.overlaps(3, 5)
+    assert not intervals.overlaps(6, 10)
+    assert not intervals.overlaps(20, 25)
+    assert not SortedIntervals().overlaps(0, 1)
+
+
+def test_long_interval_hides_behind_later_starts() -> None:
+    # The running max of ends catches a long booking that starts early.
+    intervals = SortedIntervals([(0, 100), (10, 11), (20, 21)])
+
+    assert intervals.overlaps(50, 60)
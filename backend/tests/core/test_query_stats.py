@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import query_stats
+from app.core.query_stats import QueryStats, QueryStatsMiddleware, query_stats_scope
+from app.db import instrumentation  # noqa: F401  (registers statement timing)
+
+
+def test_statements_are_counted_in_the_current_scope() -> None:
+    engine = create_engine("sqlite://")
+    with query_stats_scope("test") as stats, engine.connect() as connection:
+        for value in (1, 2, 3):
+            connection.execute(text("SELECT :value"), {"value": value})
+        connection.execute(text("SELECT 2"))
+
+    assert stats.count == 4
+    assert stats.duration_seconds > 0
+    assert stats.repeated(3) == [("SELECT ?", 3)]
+    assert stats.server_timing().endswith('desc="4 queries"')
+
+
+def test_server_timing_example() -> None:
+    stats = QueryStats(count=2, duration_seconds=0.0125)
+
+    assert stats.server_timing() == 'db;dur=12.50;desc="2 queries"'
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.warnings: list[dict[str, object]] = []
+
+    def warning(self, event: str, **fields: object) -> None:
+        self.warnings.append({"event": event, **fields})
+
+
+def test_middleware_reports_queries_and_repeated_statements(monkeypatch) -> None:
+    engine = create_engine("sqlite://")
+
+    async def loop(request: object) -> PlainTextResponse:
+        with engine.connect() as connection:
+            for value in range(3):
+                connection.execute(text("SELECT :value"), {"value": value})
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/loop", loop)])
+    client = TestClient(QueryStatsMiddleware(app, repeat_threshold=3))
+    recorder = _Recorder()
+    monkeypatch.setattr(query_stats, "logger", recorder)
+    response = client.get("/loop")
+
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert response.headers["server-timing"].endswith('desc="3 queries"')
+    warning = next(log for log in recorder.warnings if log["event"] == "n_plus_one_suspected")
+    assert warning["statement"] == "SELECT ?"
+    assert warning["count"] == 3
+    assert warning["route"] == "GET /loop"
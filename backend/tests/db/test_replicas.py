@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy import Column, MetaData, String, Table, create_engine, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.tenancy import tenant_scope
+from app.db.replicas import REPLICA_READS, Replica, ReplicaRouter, RoutingSession
+
+metadata = MetaData()
+marker = Table("marker", metadata, Column("value", String(20)))
+
+
+def _database(path, value: str) -> str:
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(marker).values(value=value))
+    engine.dispose()
+    return f"sqlite+aiosqlite:///{path}"
+
+
+def _async_engine(url: str):
+    # Each test step runs its own event loop, so connections must not outlive it.
+    return create_async_engine(url, poolclass=NullPool)
+
+
+def _setup(tmp_path, replica_names=("replica",), **router_options):
+    primary = _async_engine(_database(tmp_path / "primary.db", "primary"))
+    replicas = [
+        Replica(name, _async_engine(_database(tmp_path / f"{name}.db", name))) for name in replica_names
+    ]
+    router = ReplicaRouter(replicas, **router_options)
+    options = dict(bind=primary, sync_session_class=RoutingSession, router=router, expire_on_commit=False)
+    reads = async_sessionmaker(info={REPLICA_READS: True}, **options)
+    writes = async_sessionmaker(**options)
+    return router, reads, writes
+
+
+async def _read(session_factory) -> str:
+    async with session_factory() as session:
+        return (await session.execute(select(marker.c.value).limit(1))).scalar_one()
+
+
+def test_read_sessions_use_replicas_and_writes_use_the_primary(tmp_path):
+    router, reads, writes = _setup(tmp_path, replica_names=("replica-0", "replica-1"))
+
+    async def scenario():
+        assert [await _read(reads) for _ in range(4)] == ["replica-0", "replica-1"] * 2
+        assert await _read(writes) == "primary"
+
+    asyncio.run(scenario())
+
+
+def test_reads_follow_writes_to_the_primary(tmp_path):
+    router, reads, writes = _setup(tmp_path, read_your_writes_seconds=60)
+
+    async def scenario():
+        async with reads() as session:
+            await session.execute(insert(marker).values(value="written"))
+            # The same session keeps reading from where it wrote.
+            values = (await session.execute(select(marker.c.value))).scalars().all()
+            assert values == ["primary", "written"]
+            await session.commit()
+        # Later sessions of the tenant that wrote stay on the primary for the stickiness window.
+        assert await _read(reads) == "primary"
+
+    with tenant_scope(1):
+        asyncio.run(scenario())
+    with tenant_scope(2):
+        assert asyncio.run(_read(reads)) == "replica"
+    router.read_your_writes_seconds = 0
+    with tenant_scope(1):
+        assert asyncio.run(_read(reads)) == "replica"
+
+
+def test_least_connections_prefers_the_idle_replica(tmp_path):
+    router, _, _ = _setup(tmp_path, replica_names=("busy", "idle"), selection="least_connections")
+    router.replicas[0].in_use = 3
+
+    assert router.choose().name == "idle"
+
+
+def test_unhealthy_replicas_leave_rotation_until_they_recover(tmp_path):
+    router, reads, _ = _setup(tmp_path)
+    replica = router.replicas[0]
+    healthy_engine = replica.engine
+
+    async def scenario():
+        replica.engine = _async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        assert await router.check_health() == {"replica": False}
+        assert await _read(reads) == "primary"
+
+        replica.engine = healthy_engine
+        assert await router.check_health() == {"replica": True}
+        assert await _read(reads) == "replica"
+
+    asyncio.run(scenario())
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import SingletonThreadPool
+
+from app.core.config import get_settings
+from app.db.session import build_engine, engine_options
+
+
+def _settings(**overrides):
+    return get_settings().model_copy(update=overrides)
+
+
+def test_postgres_options_bound_the_pool_and_statement_time():
+    options = engine_options(
+        "postgresql+psycopg://app:app@db/app",
+        _settings(db_pool_size=3, db_max_overflow=2, db_statement_timeout_ms=1500),
+    )
+
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == 2
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"options": "-c statement_timeout=1500"}
+
+
+def test_sqlite_per_thread_strategy_uses_a_connection_per_thread(tmp_path):
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    settings = _settings(sqlite_connection_strategy="per_thread")
+
+    assert engine_options(url, settings)["poolclass"] is SingletonThreadPool
+    # aiosqlite already runs each connection on its own thread.
+    assert "poolclass" not in engine_options(url, settings, is_async=True)
+
+
+def test_sqlite_connections_use_the_production_profile(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}", _settings(sqlite_busy_timeout_ms=7000))
+    try:
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+            assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 7000
+    finally:
+        engine.dispose()
+
+
+def test_sqlite_statement_timeout_interrupts_long_statements(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}", _settings(db_statement_timeout_ms=50))
+    endless = text(
+        "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT count(*) FROM n"
+    )
+    try:
+        with engine.connect() as connection:
+            with pytest.raises(OperationalError, match="interrupted"):
+                connection.execute(endless)
+            connection.rollback()
+            assert connection.execute(text("SELECT 1")).scalar() == 1
+    finally:
+        engine.dispose()
+
+
+def test_pool_events_are_exported(tmp_path):
+    pytest.importorskip("prometheus_client")
+    from app.monitoring.metrics import get_registry, render_metrics
+
+    def checkouts() -> float:
+        value = get_registry().get_sample_value(
+            "db_pool_events_total", {"engine": "metrics-test", "event": "checkout"}
+        )
+        return value or 0.0
+
+    engine = build_engine(f"sqlite:///{tmp_path / 'app.db'}", _settings(), name="metrics-test")
+    try:
+        before = checkouts()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            assert get_registry().get_sample_value("db_pool_checked_out", {"engine": "metrics-test"}) == 1
+        assert checkouts() == before + 1
+        assert get_registry().get_sample_value("db_pool_checked_out", {"engine": "metrics-test"}) == 0
+        assert "db_pool_connections" in render_metrics()
+    finally:
+        engine.dispose()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.etl.extract import extract_batches, extract_from_json, iter_rows
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "sample_dump.json"
+
+TRICKY_DUMP = {
+    "first": [
+        {"id": 1, "name": "Brace } and bracket ] inside", "price": 12.5, "qty": 1234567890},
+        {"id": 2, "name": "Unicode é☃ and \"quotes\"", "meta": {"tags": ["a", "b"], "ok": True}},
+    ],
+    "empty": [],
+    "second": [{"id": 3, "value": None, "neg": -0.25e-3, "emoji": "😀 \\ done", "flags": [True, False]}],
+}
+
+
+def _expected(dump: dict) -> list[tuple[str, dict]]:
+    return [(table, row) for table, rows in dump.items() for row in rows]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 11, 64, 1 << 16])
+def test_iter_rows_matches_json_load_across_chunk_boundaries(tmp_path, chunk_size):
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps(TRICKY_DUMP, indent=2), encoding="utf-8")
+
+    assert list(iter_rows(path, chunk_size=chunk_size)) == _expected(TRICKY_DUMP)
+
+
+def test_extract_batches_split_by_table_and_size():
+    batches = list(extract_batches(FIXTURE_PATH, batch_size=1))
+
+    assert [(table, len(rows)) for table, rows in batches] == [
+        ("actionsCategories", 1),
+        ("actions", 1),
+        ("actions", 1),
+    ]
+    assert [table for table, _ in extract_batches(FIXTURE_PATH, batch_size=10)] == ["actionsCategories", "actions"]
+    assert extract_from_json(FIXTURE_PATH) == json.loads(FIXTURE_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize(
+    ("content", "message"),
+    [
+        ('[{"id": 1}]', "top-level object"),
+        ('{"actions": {"id": 1}}', "must contain a list of rows"),
+        ('{"actions": [1]}', "must be an object"),
+        ('{"actions": [{"id": 1}]} trailing', "Unexpected data"),
+    ],
+)
+def test_iter_rows_rejects_malformed_dumps(tmp_path, content, message):
+    path = tmp_path / "dump.json"
+    path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(ValueError, match=message):
+        list(iter_rows(path))
+
+
+def test_iter_rows_reports_truncated_dumps(tmp_path):
+    path = tmp_path / "dump.json"
+    path.write_text('{"actions": [{"id": 1}, {"id": ', encoding="utf-8")
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_rows(path))
+
+
+def test_iter_rows_fails_fast_on_malformed_rows(tmp_path):
+    path = tmp_path / "dump.json"
+    path.write_text('{"actions": [{"id": 1x}, ' + '{"id": 2}, ' * 10000 + "]}", encoding="utf-8")
+
+    rows = iter_rows(path, chunk_size=16, max_value_size=64)
+    with pytest.raises(json.JSONDecodeError, match="Expecting ',' delimiter"):
+        next(rows)
+
+
+def test_iter_rows_caps_the_size_of_one_row(tmp_path):
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps({"actions": [{"id": 1, "notes": "x" * 1000}]}), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="exceeds 100 characters"):
+        list(iter_rows(path, chunk_size=16, max_value_size=100))
+    assert len(list(iter_rows(path, chunk_size=16, max_value_size=2000))) == 1
@@ -31,3 +31,12 @@ def test_pipeline_loads_rows():
         total_categories = conn.execute(CATEGORIES_COUNT_QUERY).scalar_one()
     assert total_actions == 2
     assert total_categories == 1
+
+
+def test_pipeline_streams_in_small_batches():
+    engine = create_sqlite_engine()
+    Base.metadata.create_all(engine)
+    stats = run_pipeline(FIXTURE_PATH, engine, batch_size=1)
+    assert stats == {"tables": {"actionsCategories": 1, "actions": 2}, "total_rows": 3}
+    with engine.connect() as conn:
+        assert conn.execute(ACTIONS_COUNT_QUERY).scalar_one() == 2
@@ -25,6 +25,15 @@ from app.models.generated import (
 )
 
 
+@pytest.fixture(autouse=True)
+def trusted_tenant_header(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.core.config import get_settings
+
+    # Most suites read across instances; test_tenancy covers the token and deny-by-default paths.
+    monkeypatch.setattr(get_settings(), "tenant_header_trusted", True)
+    monkeypatch.setattr(get_settings(), "tenant_required", False)
+
+
 @pytest.fixture(scope="module", autouse=True)
 def prepare_database() -> Generator[None, None, None]:
     Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+
+from app.db.async_session import async_engine
+from app.db.session import SessionLocal
+from app.models.generated import Assets, AssetTypes
+
+
+@contextmanager
+def _count_queries() -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def _add_unpriced_assets(count: int) -> list[int]:
+    with SessionLocal() as session:
+        template = session.execute(select(Assets).order_by(Assets.assets_id)).scalars().first()
+        assets = [
+            Assets(
+                assets_tag=f"AST-RATE-{index}",
+                assetTypes_id=template.assetTypes_id,
+                instances_id=template.instances_id,
+                assets_inserted=datetime.now(timezone.utc),
+                assets_deleted=False,
+                assets_showPublic=True,
+            )
+            for index in range(count)
+        ]
+        session.add_all(assets)
+        session.commit()
+        return [asset.assets_id for asset in assets]
+
+
+def test_effective_rates_fall_back_to_asset_type(client: TestClient) -> None:
+    [unpriced] = _add_unpriced_assets(1)
+
+    detail = client.get(f"/api/assets/{unpriced}").json()
+    assert (detail["day_rate"], detail["effective_day_rate"]) == (None, 2500)
+    assert (detail["week_rate"], detail["effective_week_rate"]) == (None, 10000)
+    assert detail["effective_value"] == 35000
+    assert detail["effective_mass"] is None
+    priced = client.get("/api/assets", params={"fields": "id,day_rate,effective_day_rate", "limit": 1}).json()
+    assert priced["items"] == [{"id": 1, "day_rate": 2000, "effective_day_rate": 2000}]
+
+    # Type edits reach cached asset responses too.
+    with SessionLocal() as session:
+        session.get(AssetTypes, detail["asset_type_id"]).assetTypes_dayRate = 2600
+        session.commit()
+    assert client.get(f"/api/assets/{unpriced}").json()["effective_day_rate"] == 2600
+
+
+def test_asset_pages_take_constant_queries(client: TestClient) -> None:
+    ids = _add_unpriced_assets(20)
+
+    def queries(url: str, **params: object) -> int:
+        with _count_queries() as statements:
+            assert client.get(url, params=params).status_code == 200
+        return len(statements)
+
+    assert queries("/api/assets", limit=2) == queries("/api/assets", limit=20)
+    assert queries("/api/assets", limit=3, facets="type") == queries("/api/assets", limit=21, facets="type")
+    # One asset row query and one current-location query, however many ids.
+    assert queries("/api/assets:batch", ids=ids[0]) == 2
+    assert queries("/api/assets:batch", ids=",".join(map(str, ids))) == 2
+    assert queries(f"/api/assets/{ids[1]}") == 2
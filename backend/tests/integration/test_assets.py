@@ -33,3 +33,526 @@ def test_get_asset_detail(client: TestClient) -> None:
 def test_get_asset_not_found_returns_404(client: TestClient) -> None:
     response = client.get("/api/assets/999999")
     assert response.status_code == 404
+
+
+def test_cursor_pagination_walks_all_assets(client: TestClient) -> None:
+    first = client.get("/api/assets", params={"limit": 1}).json()
+    assert first["next_cursor"]
+    second = client.get("/api/assets", params={"limit": 1, "cursor": first["next_cursor"]}).json()
+    assert second["cursor"] == first["next_cursor"]
+    assert second["items"][0]["id"] > first["items"][0]["id"]
+    assert second["items"][0]["tag"] == "AST-0002"
+
+
+def test_cursor_rejects_garbage_and_offset(client: TestClient) -> None:
+    assert client.get("/api/assets", params={"cursor": "not-a-cursor"}).status_code == 400
+    cursor = client.get("/api/assets", params={"limit": 1}).json()["next_cursor"]
+    response = client.get("/api/assets", params={"cursor": cursor, "offset": 1})
+    assert response.status_code == 400
+
+
+def test_total_modes(client: TestClient) -> None:
+    exact = client.get("/api/assets", params={"limit": 1}).json()
+    assert exact["total_mode"] == "exact"
+    assert exact["has_more"] is True
+
+    estimated = client.get("/api/assets", params={"limit": 1, "total_mode": "estimated"}).json()
+    assert estimated["total"] == exact["total"]
+
+    skipped = client.get("/api/assets", params={"search": "0002", "total_mode": "none"}).json()
+    assert skipped["total"] is None
+    assert skipped["has_more"] is False
+    assert skipped["next_cursor"] is None
+
+
+def test_search_covers_notes_and_custom_fields(client: TestClient) -> None:
+    by_notes = client.get("/api/assets", params={"search": "backup"}).json()
+    assert [item["tag"] for item in by_notes["items"]] == ["AST-0002"]
+    by_field = client.get("/api/assets", params={"search": "serial-001"}).json()
+    assert [item["tag"] for item in by_field["items"]] == ["AST-0001"]
+    short = client.get("/api/assets", params={"search": "02"}).json()
+    assert [item["tag"] for item in short["items"]] == ["AST-0002"]
+
+
+def test_search_relevance_sort(client: TestClient) -> None:
+    response = client.get("/api/assets", params={"search": "kit", "sort": "relevance"})
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["total"] == 2
+    assert payload["next_cursor"] is None
+    cursor = client.get("/api/assets", params={"limit": 1}).json()["next_cursor"]
+    rejected = client.get("/api/assets", params={"cursor": cursor, "sort": "relevance"})
+    assert rejected.status_code == 400
+
+
+def test_search_index_follows_updates(client: TestClient) -> None:
+    import asyncio
+
+    from sqlalchemy import select
+
+    from app.db.async_session import AsyncSessionLocal, async_engine
+    from app.db.session import SessionLocal
+    from app.models.generated import Assets
+    from app.repositories.assets import AsyncAssetsRepository
+    from app.repositories.search import SEARCH_BACKENDS, AssetSearchBackend
+
+    async def matching_tags(backend: AssetSearchBackend) -> list[str]:
+        async with AsyncSessionLocal() as session:
+            repository = AsyncAssetsRepository(session, search_backend=backend)
+            hits = await repository.list_asset_rows(columns=["assets_tag"], limit=10, search="FLIGHTCASE")
+            return [hit["assets_tag"] for hit in hits]
+
+    async def search_all() -> dict[str, list[str]]:
+        try:
+            return {
+                backend.name: await matching_tags(backend)
+                for backend in SEARCH_BACKENDS.values()
+                if backend.name != "trigram"
+            }
+        finally:
+            await async_engine.dispose()
+
+    with SessionLocal() as session:
+        asset = session.execute(select(Assets).where(Assets.assets_tag == "AST-0002")).scalar_one()
+        asset.asset_definableFields_3 = "Flightcase"
+        session.commit()
+        try:
+            for name, tags in asyncio.run(search_all()).items():
+                assert tags == ["AST-0002"], name
+        finally:
+            asset.asset_definableFields_3 = None
+            session.commit()
+    assert client.get("/api/assets", params={"search": "flightcase"}).json()["total"] == 0
+
+
+def test_async_service_runs_concurrent_queries(client: TestClient) -> None:
+    import asyncio
+
+    from app.db.async_session import AsyncSessionLocal, async_engine, to_async_url
+    from app.services.assets import AsyncAssetsService
+
+    assert to_async_url("sqlite:///./data/app.db") == "sqlite+aiosqlite:///./data/app.db"
+    assert to_async_url("postgresql+psycopg://app:app@db/app").startswith("postgresql+psycopg://app:app@")
+
+    async def fetch_tags() -> list[str | None]:
+        async def one(search: str) -> str | None:
+            async with AsyncSessionLocal() as session:
+                page = await AsyncAssetsService.from_session(session).list_assets(limit=5, search=search)
+                return page.items[0].tag
+
+        try:
+            return await asyncio.gather(*(one(term) for term in ("0001", "0002", "backup")))
+        finally:
+            await async_engine.dispose()
+
+    assert asyncio.run(fetch_tags()) == ["AST-0001", "AST-0002", "AST-0002"]
+
+
+def test_batch_lookup_reports_missing(client: TestClient, monkeypatch) -> None:
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "assets_batch_chunk_size", 1)
+    ids = [item["id"] for item in client.get("/api/assets").json()["items"]]
+    response = client.get("/api/assets:batch", params={"ids": f"{ids[1]},999999,{ids[0]}"})
+    assert response.status_code == 200
+    payload = response.json()
+    assert list(payload["items"]) == [str(ids[1]), str(ids[0])]
+    assert payload["items"][str(ids[0])]["custom_fields"] == {"field_1": "Serial-001"}
+    assert payload["missing"] == [999999]
+
+
+def test_batch_lookup_validates_ids(client: TestClient, monkeypatch) -> None:
+    from app.core.config import get_settings
+
+    assert client.get("/api/assets:batch", params={"ids": "1,abc"}).status_code == 422
+    monkeypatch.setattr(get_settings(), "assets_batch_max_ids", 2)
+    assert client.get("/api/assets:batch", params=[("ids", "1,2"), ("ids", "3")]).status_code == 422
+
+
+def test_sparse_fieldsets(client: TestClient) -> None:
+    listing = client.get("/api/assets", params={"fields": "tag,day_rate", "limit": 1})
+    assert listing.status_code == 200
+    payload = listing.json()
+    assert set(payload["items"][0]) == {"tag", "day_rate"}
+    assert payload["next_cursor"]
+
+    asset_id = client.get("/api/assets", params={"search": "0001"}).json()["items"][0]["id"]
+    detail = client.get(f"/api/assets/{asset_id}", params={"fields": "id,custom_fields"}).json()
+    assert detail == {"id": asset_id, "custom_fields": {"field_1": "Serial-001"}}
+
+    assert client.get("/api/assets", params={"fields": "tag,notes"}).status_code == 422
+    assert client.get("/api/assets/999999", params={"fields": "id"}).status_code == 404
+
+
+def test_etag_revalidation_and_invalidation(client: TestClient) -> None:
+    from sqlalchemy import select
+
+    from app.db.session import SessionLocal
+    from app.models.generated import Assets
+
+    first = client.get("/api/assets", params={"search": "AST"})
+    etag = first.headers["etag"]
+    assert etag.startswith('"')
+    revalidated = client.get("/api/assets", params={"search": "AST"}, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+    with SessionLocal() as session:
+        asset = session.execute(select(Assets).where(Assets.assets_tag == "AST-0002")).scalar_one()
+        asset.assets_dayRate = 1750
+        session.commit()
+    try:
+        changed = client.get("/api/assets", params={"search": "AST"}, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert {item["day_rate"] for item in changed.json()["items"]} == {2000, 1750}
+    finally:
+        with SessionLocal() as session:
+            asset = session.execute(select(Assets).where(Assets.assets_tag == "AST-0002")).scalar_one()
+            asset.assets_dayRate = 1500
+            session.commit()
+
+
+def test_export_streams_csv_and_ndjson(client: TestClient, monkeypatch) -> None:
+    import csv
+    import io
+    import json
+
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "assets_export_batch_size", 1)
+
+    response = client.get("/api/assets/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="assets.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["tag"] for row in rows] == ["AST-0001", "AST-0002"]
+    assert rows[0]["field_1"] == "Serial-001"
+    assert rows[1]["field_1"] == ""
+
+    lines = client.get("/api/assets/export", params={"format": "ndjson"}).text.splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record["tag"] for record in records] == ["AST-0001", "AST-0002"]
+
+    resumed = client.get(
+        "/api/assets/export", params={"format": "ndjson", "after_id": records[0]["id"]}
+    ).text.splitlines()
+    assert [json.loads(line)["tag"] for line in resumed] == ["AST-0002"]
+
+    empty = client.get("/api/assets/export", params={"search": "no-such-asset"})
+    assert empty.text.splitlines() == [",".join(next(csv.reader(io.StringIO(response.text))))]
+    assert client.get("/api/assets/export", params={"format": "xml"}).status_code == 422
+
+
+def test_list_filters_and_facets(client: TestClient) -> None:
+    base = client.get("/api/assets").json()["items"][0]
+    type_id = base["asset_type_id"]
+
+    filtered = client.get(
+        "/api/assets", params={"asset_type_id": type_id, "deleted": "false", "archived": "false"}
+    ).json()
+    assert filtered["total"] == 2
+    assert client.get("/api/assets", params={"deleted": "true"}).json()["total"] == 0
+    assert client.get("/api/assets", params={"instance_id": 999}).json()["items"] == []
+
+    payload = client.get(
+        "/api/assets",
+        params={"search": "AST", "facets": "category,type,location", "instance_id": base["instance_id"]},
+    ).json()
+    facets = payload["facets"]
+    assert list(facets) == ["type", "location", "category"]
+    assert facets["type"] == [{"value": type_id, "count": 2}]
+    assert facets["location"] == [{"value": None, "count": 2}]
+    assert facets["category"][0]["count"] == 2
+
+    assert client.get("/api/assets", params={"search": "0001", "facets": "type"}).json()["facets"] == {
+        "type": [{"value": type_id, "count": 1}]
+    }
+    assert client.get("/api/assets", params={"fields": "id"}).json()["facets"] is None
+    assert client.get("/api/assets", params={"facets": "colour"}).status_code == 422
+    assert client.get("/api/assets", params={"asset_type_id": 0}).status_code == 422
+
+
+def test_availability_follows_assignment_and_project_writes(client: TestClient) -> None:
+    from datetime import datetime
+
+    from sqlalchemy import select
+
+    from app.db.session import SessionLocal
+    from app.models.generated import Assets, AssetsAssignments, Projects
+
+    with SessionLocal() as session:
+        first, second = session.execute(select(Assets).order_by(Assets.assets_id)).scalars()
+        project = Projects(
+            projects_name="Festival",
+            instances_id=first.instances_id,
+            projects_manager=1,
+            projects_created=datetime(2026, 1, 1),
+            projects_deleted=False,
+            projects_archived=False,
+            projects_dates_deliver_start=datetime(2026, 6, 1),
+            projects_dates_deliver_end=datetime(2026, 6, 10),
+            projects_status=1,
+            projects_defaultDiscount=0.0,
+            projectsTypes_id=1,
+        )
+        session.add(project)
+        session.commit()
+        asset_ids = (first.assets_id, second.assets_id)
+        type_id = first.assetTypes_id
+        project_id = project.projects_id
+
+    def check(start: str, end: str) -> dict:
+        response = client.get(
+            "/api/assets/availability", params={"start": start, "end": end, "type": type_id}
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    assert check("2026-06-01T00:00:00", "2026-06-05T00:00:00")["available"] == list(asset_ids)
+
+    with SessionLocal() as session:
+        assignment = AssetsAssignments(
+            assets_id=asset_ids[0],
+            projects_id=project_id,
+            assetsAssignments_customPrice=0,
+            assetsAssignments_discount=0.0,
+            assetsAssignments_deleted=False,
+        )
+        session.add(assignment)
+        session.commit()
+        assignment_id = assignment.assetsAssignments_id
+    try:
+        booked = check("2026-06-09T00:00:00", "2026-07-01T00:00:00")
+        assert booked["unavailable"] == [asset_ids[0]]
+        assert booked["available"] == [asset_ids[1]]
+        assert check("2026-06-10T00:00:00", "2026-06-11T00:00:00")["unavailable"] == []
+
+        with SessionLocal() as session:
+            moved = session.get(Projects, project_id)
+            moved.projects_dates_deliver_start = datetime(2026, 8, 1)
+            moved.projects_dates_deliver_end = datetime(2026, 8, 3)
+            session.commit()
+        assert check("2026-06-01T00:00:00", "2026-06-30T00:00:00")["unavailable"] == []
+        assert check("2026-08-02T00:00:00", "2026-08-05T00:00:00")["unavailable"] == [asset_ids[0]]
+    finally:
+        with SessionLocal() as session:
+            session.delete(session.get(AssetsAssignments, assignment_id))
+            session.delete(session.get(Projects, project_id))
+            session.commit()
+    assert check("2026-08-01T00:00:00", "2026-08-05T00:00:00")["unavailable"] == []
+    assert client.get(
+        "/api/assets/availability", params={"start": "2026-06-02T00:00:00", "end": "2026-06-01T00:00:00"}
+    ).status_code == 422
+
+
+def test_availability_reloads_after_writes_it_did_not_see(client: TestClient, monkeypatch) -> None:
+    import asyncio
+    from datetime import datetime
+
+    import pytest
+    from sqlalchemy import delete, insert, select
+
+    from app.core.config import get_settings
+    from app.db.session import SessionLocal, engine
+    from app.models.generated import Assets, AssetsAssignments, Projects
+    from app.services.availability import AsyncAvailabilityService, availability_index
+
+    def check() -> list[int]:
+        response = client.get(
+            "/api/assets/availability",
+            params={"start": "2026-09-01T00:00:00", "end": "2026-09-02T00:00:00"},
+        )
+        assert response.status_code == 200
+        return response.json()["unavailable"]
+
+    monkeypatch.setattr(get_settings(), "availability_check_interval_seconds", 0.0)
+    assert check() == []
+    with SessionLocal() as session:
+        asset = session.execute(select(Assets).order_by(Assets.assets_id)).scalars().first()
+        asset_id, instance_id = asset.assets_id, asset.instances_id
+    # Core statements on a bare connection bypass the session listeners, like another process would.
+    with engine.begin() as connection:
+        project_id = connection.execute(
+            insert(Projects).values(
+                projects_name="Elsewhere",
+                instances_id=instance_id,
+                projects_manager=1,
+                projects_created=datetime(2026, 1, 1),
+                projects_deleted=False,
+                projects_archived=False,
+                projects_dates_deliver_start=datetime(2026, 9, 1),
+                projects_dates_deliver_end=datetime(2026, 9, 5),
+                projects_status=1,
+                projects_defaultDiscount=0.0,
+                projectsTypes_id=1,
+            )
+        ).inserted_primary_key[0]
+        connection.execute(
+            insert(AssetsAssignments).values(
+                assets_id=asset_id,
+                projects_id=project_id,
+                assetsAssignments_customPrice=0,
+                assetsAssignments_discount=0.0,
+                assetsAssignments_deleted=False,
+            )
+        )
+    try:
+        assert check() == [asset_id]
+    finally:
+        with engine.begin() as connection:
+            connection.execute(delete(AssetsAssignments).where(AssetsAssignments.projects_id == project_id))
+            connection.execute(delete(Projects).where(Projects.projects_id == project_id))
+    assert check() == []
+
+    class FailingBookings:
+        async def fingerprint(self) -> tuple[int, ...]:
+            raise RuntimeError("database unavailable")
+
+    service = AsyncAvailabilityService(assets=None, bookings=FailingBookings())  # type: ignore[arg-type]
+    monkeypatch.setattr(get_settings(), "availability_max_age_seconds", 0.0)
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.ensure_loaded())
+    assert availability_index._loading is False
+    assert availability_index._replay == []
+
+
+def test_asset_tree_via_cte_and_closure(client: TestClient, monkeypatch) -> None:
+    from datetime import datetime
+
+    from sqlalchemy import select
+
+    from app.core.config import get_settings
+    from app.db import closure
+    from app.db.session import SessionLocal
+    from app.models.derived import AssetsClosure
+    from app.models.generated import Assets
+
+    def make(session, tag: str, parent: int | None) -> int:
+        template = session.execute(select(Assets).where(Assets.assets_tag == "AST-0002")).scalar_one()
+        asset = Assets(
+            assets_tag=tag,
+            assetTypes_id=template.assetTypes_id,
+            instances_id=template.instances_id,
+            assets_inserted=datetime(2026, 1, 1),
+            assets_linkedTo=parent,
+            assets_deleted=False,
+            assets_showPublic=False,
+        )
+        session.add(asset)
+        session.flush()
+        return asset.assets_id
+
+    with SessionLocal() as session:
+        case = make(session, "TREE-CASE", None)
+        kit = make(session, "TREE-KIT", case)
+        item = make(session, "TREE-ITEM", kit)
+        loose = make(session, "TREE-LOOSE", None)
+        session.commit()
+
+    def tree(asset_id: int) -> dict:
+        response = client.get(f"/api/assets/{asset_id}/tree")
+        assert response.status_code == 200
+        return response.json()
+
+    payload = tree(kit)
+    assert payload["root"]["tag"] == "TREE-KIT"
+    assert [child["tag"] for child in payload["root"]["children"]] == ["TREE-ITEM"]
+    assert [(node["tag"], node["depth"]) for node in payload["ancestors"]] == [("TREE-CASE", -1)]
+    assert tree(case)["root"]["children"][0]["children"][0]["id"] == item
+    assert client.get("/api/assets/999999/tree").status_code == 404
+
+    monkeypatch.setattr(get_settings(), "assets_closure_enabled", True)
+    with SessionLocal() as session:
+        closure.rebuild(session.connection())
+        session.commit()
+    try:
+        with SessionLocal() as session:
+            session.get(Assets, kit).assets_linkedTo = loose
+            session.commit()
+            depths = dict(
+                session.execute(
+                    select(AssetsClosure.ancestor_id, AssetsClosure.depth).where(
+                        AssetsClosure.descendant_id == item
+                    )
+                ).all()
+            )
+        assert depths == {item: 0, kit: 1, loose: 2}
+        assert [node["tag"] for node in tree(item)["ancestors"]] == ["TREE-LOOSE", "TREE-KIT"]
+        assert tree(case)["root"]["children"] == []
+    finally:
+        with SessionLocal() as session:
+            for asset_id in (item, kit, case, loose):
+                session.delete(session.get(Assets, asset_id))
+            session.commit()
+            remaining = session.execute(
+                select(AssetsClosure).where(AssetsClosure.descendant_id.in_((item, kit, case, loose)))
+            ).all()
+        assert remaining == []
+
+
+def test_cached_bodies_are_served_precompressed(client: TestClient, monkeypatch) -> None:
+    from app.core.caching import compressed_cache
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "compression_min_size", 1)
+    compressed_cache.clear()
+    headers = {"Accept-Encoding": "gzip"}
+
+    first = client.get("/api/assets", params={"limit": 2}, headers=headers)
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["etag"].endswith('-gzip"')
+    assert first.headers["vary"] == "Accept-Encoding"
+    second = client.get("/api/assets", params={"limit": 2}, headers=headers)
+    assert second.content == first.content
+    assert len(compressed_cache) == 1
+
+    identity = client.get("/api/assets", params={"limit": 2}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.json() == first.json()
+    revalidated = client.get(
+        "/api/assets", params={"limit": 2}, headers={**headers, "If-None-Match": identity.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+
+    export = client.get("/api/assets/export", params={"format": "ndjson"}, headers=headers)
+    assert export.headers["content-encoding"] == "gzip"
+    assert export.text.splitlines()[0].startswith('{"id":1,')
+
+
+def test_list_and_count_reuse_statement_templates(client: TestClient) -> None:
+    import asyncio
+
+    from app.db.async_session import AsyncSessionLocal, async_engine
+    from app.monitoring.metrics import get_registry
+    from app.repositories.assets import AsyncAssetsRepository
+    from app.repositories.statements import statement_cache
+    from app.schemas.assets import AssetFilters
+
+    def lookups(result: str) -> float:
+        value = get_registry().get_sample_value(
+            "statement_cache_lookups_total", {"statement": "list_assets", "result": result}
+        )
+        return value or 0.0
+
+    statement_cache.clear()
+    hits, misses = lookups("hit"), lookups("miss")
+
+    async def exercise() -> None:
+        try:
+            async with AsyncSessionLocal() as session:
+                repository = AsyncAssetsRepository(session)
+                # Same shape, different values: the second call reuses the first call's template.
+                first = await repository.list_asset_rows(columns=["assets_tag"], limit=1, search="0001")
+                second = await repository.list_asset_rows(columns=["assets_tag"], limit=1, search="0002")
+                assert [asset["assets_tag"] for asset in first] == ["AST-0001"]
+                assert [asset["assets_tag"] for asset in second] == ["AST-0002"]
+                assert await repository.count_assets(filters=AssetFilters(deleted=False)) == 2
+                assert await repository.count_assets(filters=AssetFilters(deleted=True)) == 0
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(exercise())
+    assert lookups("miss") == misses + 1
+    assert lookups("hit") == hits + 1
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.db import current_location
+from app.db.session import SessionLocal, engine
+from app.models.derived import AssetCurrentLocation
+from app.models.generated import Assets, AssetsBarcodes, AssetsBarcodesScans, LocationsBarcodes
+
+
+def _add_barcode(value: str, *, deleted: bool | None = None) -> int:
+    with SessionLocal() as session:
+        asset = session.execute(select(Assets).where(Assets.assets_tag == "AST-0001")).scalar_one()
+        barcode = AssetsBarcodes(
+            assets_id=asset.assets_id,
+            assetsBarcodes_value=value,
+            assetsBarcodes_type="CODE_128",
+            assetsBarcodes_added=datetime.now(timezone.utc),
+            assetsBarcodes_deleted=deleted,
+        )
+        session.add(barcode)
+        session.commit()
+        return barcode.assetsBarcodes_id
+
+
+def test_barcode_lookup_resolves_asset(client: TestClient) -> None:
+    barcode_id = _add_barcode("BC-LOOKUP-1")
+    _add_barcode("BC-GONE", deleted=True)
+
+    response = client.get("/api/barcodes/BC-LOOKUP-1")
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["id"] == barcode_id
+    assert payload["type"] == "CODE_128"
+    assert payload["asset"]["tag"] == "AST-0001"
+
+    assert client.get("/api/barcodes/BC-GONE").status_code == 404
+    assert client.get("/api/barcodes/BC-MISSING").status_code == 404
+
+    # A barcode added after a miss is visible straight away.
+    _add_barcode("BC-MISSING")
+    assert client.get("/api/barcodes/BC-MISSING").status_code == 200
+
+
+def test_bulk_scan_ingestion(client: TestClient, monkeypatch) -> None:
+    from app.core.config import get_settings
+
+    barcode_id = _add_barcode("BC-SCAN-1")
+    scans = [
+        {"value": "BC-SCAN-1", "scanned_at": f"2026-03-01T10:00:{second:02d}Z", "custom_location": "Bay 4"}
+        for second in range(50)
+    ]
+    scans.append({"value": "BC-NOPE", "scanned_at": "2026-03-01T10:01:00Z"})
+
+    response = client.post("/api/barcodes/scans:bulk", json={"scans": scans})
+    assert response.status_code == 201
+    assert response.json() == {"inserted": 50, "unknown": ["BC-NOPE"]}
+    with SessionLocal() as session:
+        stored = session.execute(
+            select(func.count()).where(AssetsBarcodesScans.assetsBarcodes_id == barcode_id)
+        ).scalar_one()
+    assert stored == 50
+
+    monkeypatch.setattr(get_settings(), "barcode_scans_bulk_max", 10)
+    assert client.post("/api/barcodes/scans:bulk", json={"scans": scans}).status_code == 422
+    assert client.post("/api/barcodes/scans:bulk", json={"scans": []}).status_code == 422
+
+
+def test_scans_project_current_location(client: TestClient) -> None:
+    barcode_id = _add_barcode("BC-WHERE-1")
+    with SessionLocal() as session:
+        shelf = LocationsBarcodes(
+            locations_id=42,
+            locationsBarcodes_value="LOC-SHELF-42",
+            locationsBarcodes_type="CODE_128",
+            locationsBarcodes_added=datetime.now(timezone.utc),
+        )
+        session.add(shelf)
+        session.commit()
+        shelf_id = shelf.locationsBarcodes_id
+        asset_id = session.get(AssetsBarcodes, barcode_id).assets_id
+
+    scans = [
+        {"value": "BC-WHERE-1", "scanned_at": "2026-04-01T09:00:00Z", "custom_location": "Van"},
+        {"value": "BC-WHERE-1", "scanned_at": "2026-04-01T12:00:00Z", "location_barcode_id": shelf_id},
+    ]
+    assert client.post("/api/barcodes/scans:bulk", json={"scans": scans}).status_code == 201
+
+    location = client.get(f"/api/assets/{asset_id}").json()["current_location"]
+    assert location["location_id"] == 42
+    assert location["custom_location"] is None
+    assert location["scanned_at"].startswith("2026-04-01T12:00:00")
+    listed = client.get("/api/assets", params={"current_location_id": 42}).json()["items"]
+    assert [item["id"] for item in listed] == [asset_id]
+    assert client.get("/api/assets", params={"current_location_id": 43}).json()["items"] == []
+
+    # A late upload of an older scan is recorded but does not move the asset.
+    late = [{"value": "BC-WHERE-1", "scanned_at": "2026-04-01T10:00:00Z", "custom_location": "Stage left"}]
+    assert client.post("/api/barcodes/scans:bulk", json={"scans": late}).status_code == 201
+    assert client.get(f"/api/assets/{asset_id}").json()["current_location"]["location_id"] == 42
+
+    with engine.begin() as connection:
+        connection.execute(AssetCurrentLocation.__table__.delete())
+        assert current_location.rebuild(connection) >= 1
+    with SessionLocal() as session:
+        rebuilt = session.get(AssetCurrentLocation, asset_id)
+        assert rebuilt is not None
+        assert (rebuilt.locations_id, rebuilt.scanned_at) == (42, datetime(2026, 4, 1, 12, 0))
+
+
+def test_current_location_fallback_without_on_conflict(client: TestClient, monkeypatch) -> None:
+    from app.repositories import barcodes as barcodes_repository
+
+    # Dialects without ON CONFLICT read the stored scan times and insert or update.
+    monkeypatch.setattr(barcodes_repository, "_current_location_upsert", lambda dialect_name: None)
+    barcode_id = _add_barcode("BC-FALLBACK-1")
+    with SessionLocal() as session:
+        asset_id = session.get(AssetsBarcodes, barcode_id).assets_id
+    with engine.begin() as connection:
+        connection.execute(AssetCurrentLocation.__table__.delete())
+
+    def scan(at: str, where: str) -> str:
+        payload = {"scans": [{"value": "BC-FALLBACK-1", "scanned_at": at, "custom_location": where}]}
+        assert client.post("/api/barcodes/scans:bulk", json=payload).status_code == 201
+        return client.get(f"/api/assets/{asset_id}").json()["current_location"]["custom_location"]
+
+    assert scan("2026-05-01T09:00:00Z", "Van") == "Van"
+    assert scan("2026-05-01T11:00:00Z", "Stage") == "Stage"
+    assert scan("2026-05-01T10:00:00Z", "Dock") == "Stage"
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+
+
+def test_batch_runs_gets_in_one_request(client: TestClient) -> None:
+    response = client.post(
+        "/api/batch",
+        json={
+            "requests": [
+                {"id": "assets", "path": "/api/assets?limit=1&fields=id,tag"},
+                {"path": "/api/assets/999999"},
+                {"path": "/api/health"},
+                {"path": "/api/metrics"},
+                {"path": "/api/assets?limit=0"},
+            ]
+        },
+        headers={"Accept-Encoding": "gzip", "If-None-Match": "*"},
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [(item["id"], item["status"]) for item in items] == [
+        ("assets", 200),
+        ("1", 404),
+        ("2", 200),
+        ("3", 200),
+        ("4", 422),
+    ]
+    assert items[0]["body"]["items"] == [{"id": 1, "tag": "AST-0001"}]
+    assert items[0]["headers"]["etag"] == client.get("/api/assets?limit=1&fields=id,tag").headers["etag"]
+    assert items[1]["body"] == {"detail": "Asset not found"}
+    assert items[2]["body"]["status"]
+    assert isinstance(items[3]["body"], str)
+
+
+def test_batch_scopes_items_to_the_batch_tenant(client: TestClient) -> None:
+    response = client.post(
+        "/api/batch",
+        json={"requests": [{"path": "/api/assets/1"}]},
+        headers={"X-Instance-Id": "999"},
+    )
+    assert response.json()["items"][0]["status"] == 404
+
+
+def test_batch_rejects_foreign_nested_and_oversized_requests(client: TestClient) -> None:
+    for path in ("https://example.com/api/assets", "/docs", "/api/batch", "/api/batch/"):
+        response = client.post("/api/batch", json={"requests": [{"path": path}]})
+        assert response.status_code == 422, path
+    assert client.post("/api/batch", json={"requests": []}).status_code == 422
+    too_many = [{"path": "/api/health"}] * (get_settings().batch_max_requests + 1)
+    assert client.post("/api/batch", json={"requests": too_many}).status_code == 422
+
+
+def test_batch_caps_buffered_response_bytes(client: TestClient, monkeypatch) -> None:
+    monkeypatch.setattr(get_settings(), "assets_export_batch_size", 1)
+    monkeypatch.setattr(get_settings(), "batch_max_item_bytes", 200)
+    response = client.post(
+        "/api/batch",
+        json={"requests": [{"path": "/api/health"}, {"path": "/api/assets/export?format=ndjson"}]},
+    )
+    assert response.status_code == 200
+    health, export = response.json()["items"]
+    assert health["status"] == 200
+    assert export["status"] == 413
+    assert export["body"] == {"detail": "Response exceeds 200 bytes"}
+
+    monkeypatch.setattr(get_settings(), "batch_max_item_bytes", 1_000_000)
+    monkeypatch.setattr(get_settings(), "batch_max_response_bytes", 200)
+    response = client.post("/api/batch", json={"requests": [{"path": "/api/assets/export?format=ndjson"}]})
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Batch responses exceed 200 bytes"}
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.models.generated import Assets, AssetsAssignments, Projects, ProjectsFinanceCache
+
+
+def _cache(project_id: int) -> list[ProjectsFinanceCache]:
+    with SessionLocal() as session:
+        return list(
+            session.execute(
+                select(ProjectsFinanceCache).where(ProjectsFinanceCache.projects_id == project_id)
+            ).scalars()
+        )
+
+
+def test_assignment_changes_recompute_finance_cache() -> None:
+    with SessionLocal() as session:
+        first, second = session.execute(select(Assets).order_by(Assets.assets_id)).scalars().all()[:2]
+        project = Projects(
+            projects_name="Tour",
+            instances_id=first.instances_id,
+            projects_manager=1,
+            projects_created=datetime(2026, 1, 1),
+            projects_deleted=False,
+            projects_archived=False,
+            projects_dates_deliver_start=datetime(2026, 6, 1),
+            projects_dates_deliver_end=datetime(2026, 6, 10),
+            projects_status=1,
+            projects_defaultDiscount=0.0,
+            projectsTypes_id=1,
+        )
+        session.add(project)
+        session.flush()
+        session.add_all(
+            AssetsAssignments(
+                assets_id=asset.assets_id,
+                projects_id=project.projects_id,
+                assetsAssignments_customPrice=0,
+                assetsAssignments_discount=discount,
+                assetsAssignments_deleted=False,
+            )
+            for asset, discount in ((first, 0.0), (second, 10.0))
+        )
+        session.commit()
+        project_id, first_id = project.projects_id, first.assets_id
+
+    # June 1 to June 10 is ten days of each asset, 10% off the second.
+    [cached] = _cache(project_id)
+    assert cached.projectsFinanceCache_equipmentSubTotal == 20000 + 15000
+    assert cached.projectsFinanceCache_equiptmentDiscounts == 1500
+    assert cached.projectsFinanceCache_equiptmentTotal == 33500
+    assert cached.projectsFinanceCache_grandTotal == 33500
+    assert cached.projectsFinanceCache_value == 35000
+    assert cached.projectsFinanceCache_mass == Decimal(0)
+
+    with SessionLocal() as session:
+        # Totals kept by the PHP screens feed the grand total on the next write.
+        row = session.get(ProjectsFinanceCache, cached.projectsFinanceCache_id)
+        row.projectsFinanceCache_salesTotal = 700
+        row.projectsFinanceCache_paymentsReceived = 200
+        session.commit()
+
+    with SessionLocal() as session:
+        # Unset rates fall back to the asset type (2500/day, 10000/week).
+        asset = session.get(Assets, first_id)
+        asset.assets_dayRate = None
+        asset.assets_weekRate = None
+        session.commit()
+    [cached] = _cache(project_id)
+    assert cached.projectsFinanceCache_equipmentSubTotal == 25000 + 15000
+    assert cached.projectsFinanceCache_grandTotal == 38500 + 700 - 200
+
+    with SessionLocal() as session:
+        # Finance overrides replace the delivery dates: one week and two days.
+        project = session.get(Projects, project_id)
+        project.projects_dates_finances_days = 2
+        project.projects_dates_finances_weeks = 1
+        session.commit()
+    [cached] = _cache(project_id)
+    assert cached.projectsFinanceCache_equipmentSubTotal == 15000 + 9000
+
+    with SessionLocal() as session:
+        for assignment in session.execute(
+            select(AssetsAssignments).where(AssetsAssignments.projects_id == project_id)
+        ).scalars():
+            session.delete(assignment)
+        session.commit()
+    [cached] = _cache(project_id)
+    assert cached.projectsFinanceCache_equiptmentTotal == 0
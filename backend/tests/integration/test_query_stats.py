@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+
+from fastapi.testclient import TestClient
+
+
+def test_responses_carry_server_timing(client: TestClient) -> None:
+    from app.services.assets import response_cache
+
+    response_cache.clear()
+    response = client.get("/api/assets")
+
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert '"0 queries"' not in timing
+
+
+def test_slow_statements_are_logged_with_their_plan(client: TestClient, monkeypatch, tmp_path) -> None:
+    from app.core.config import get_settings
+    from app.db.instrumentation import flush_slow_query_log
+    from app.services.assets import response_cache
+
+    log_path = tmp_path / "slow.jsonl"
+    monkeypatch.setattr(get_settings(), "slow_query_threshold_ms", 0.000001)
+    monkeypatch.setattr(get_settings(), "slow_query_log_path", str(log_path))
+
+    def listing() -> dict:
+        response_cache.clear()
+        assert client.get("/api/assets", params={"limit": 1}).status_code == 200
+        flush_slow_query_log()
+        entries = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+        log_path.unlink()
+        return next(entry for entry in entries if entry["statement"].lstrip().upper().startswith("SELECT"))
+
+    redacted = listing()
+    assert redacted["route"] == "GET /api/assets"
+    assert redacted["dialect"] == "sqlite"
+    assert redacted["duration_ms"] >= 0
+    assert redacted["parameters"] is None
+    assert redacted["plan"] is None
+
+    monkeypatch.setattr(get_settings(), "slow_query_explain", True)
+    monkeypatch.setattr(get_settings(), "slow_query_log_parameters", True)
+    detailed = listing()
+    assert detailed["parameters"] is not None
+    # EXPLAIN QUERY PLAN rows: id, parent, notused, detail.
+    assert any("assets" in str(step[-1]) for step in detailed["plan"])
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.db import search_index
+from app.db.session import SessionLocal, engine
+from app.models.derived import SearchDocument
+from app.models.generated import Assets, Clients, Projects, Users
+from app.schemas.search import SEARCH_ENTITY_TYPES
+
+
+def _search(client: TestClient, q: str, **params: object) -> list[tuple[str, str]]:
+    response = client.get("/api/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return [(hit["type"], hit["title"]) for hit in response.json()["hits"]]
+
+
+def test_global_search_ranks_typed_hits(client: TestClient) -> None:
+    assert search_index.SEARCH_ENTITIES == SEARCH_ENTITY_TYPES
+    with SessionLocal() as session:
+        instance_id = session.execute(select(Assets.instances_id)).scalars().first()
+        session.add_all(
+            [
+                Projects(
+                    projects_name="Glastonbury Main Stage",
+                    projects_description="Lighting rig for the pyramid",
+                    instances_id=instance_id,
+                    projects_manager=1,
+                    projects_created=datetime(2026, 1, 1),
+                    projects_deleted=False,
+                    projects_archived=False,
+                    projects_status=1,
+                    projects_defaultDiscount=0.0,
+                    projectsTypes_id=1,
+                ),
+                Clients(
+                    clients_name="Pyramid Events Ltd",
+                    clients_email="hire@pyramid.example",
+                    instances_id=instance_id,
+                    clients_deleted=False,
+                ),
+                Users(
+                    users_username="lsmith",
+                    users_name1="Lee",
+                    users_name2="Smith",
+                    users_hash="x",
+                    users_changepass=False,
+                    users_suspended=False,
+                    users_deleted=False,
+                    users_emailVerified=True,
+                ),
+            ]
+        )
+        session.commit()
+
+    # Prefix matching across types; the client's title match outranks the body match.
+    assert _search(client, "pyram") == [
+        ("client", "Pyramid Events Ltd"),
+        ("project", "Glastonbury Main Stage"),
+    ]
+    assert _search(client, "AST-0001") == [("asset", "AST-0001")]
+    assert _search(client, "led panel") == [("asset_type", "LED Panel")]
+    assert _search(client, "lee") == [("user", "Lee Smith")]
+    assert _search(client, "pyramid", types="project") == [("project", "Glastonbury Main Stage")]
+    assert _search(client, "pyramid", instance_id=instance_id + 1) == []
+    assert _search(client, "!!!") == []
+    assert client.get("/api/search", params={"q": "x", "types": "planet"}).status_code == 422
+
+    hit = client.get("/api/search", params={"q": "glastonbury"}).json()["hits"][0]
+    assert hit["excerpt"] == "Lighting rig for the pyramid"
+    # Client contact details only reach requests scoped to a tenant.
+    hit = client.get("/api/search", params={"q": "pyramid events"}).json()["hits"][0]
+    assert (hit["type"], hit["excerpt"]) == ("client", None)
+    scoped = client.get(
+        "/api/search", params={"q": "pyramid events"}, headers={"X-Instance-Id": str(instance_id)}
+    ).json()["hits"][0]
+    assert scoped["excerpt"] == "hire@pyramid.example"
+
+    # ORM writes update the index in the same transaction.
+    with SessionLocal() as session:
+        project = session.execute(select(Projects).where(Projects.projects_name.like("Glastonbury%"))).scalar_one()
+        project.projects_name = "Reading Festival"
+        session.execute(select(Clients)).scalar_one().clients_deleted = True
+        session.commit()
+    assert _search(client, "glastonbury") == []
+    assert _search(client, "pyramid") == [("project", "Reading Festival")]
+
+    with engine.begin() as connection:
+        connection.execute(SearchDocument.__table__.delete())
+        assert search_index.rebuild(connection) == 5
+    assert _search(client, "reading") == [("project", "Reading Festival")]
+
+
+def test_write_replaces_documents_without_on_conflict(monkeypatch) -> None:
+    # Dialects without ON CONFLICT delete a document's previous row, then insert it.
+    monkeypatch.setattr(search_index, "_upsert", lambda dialect_name: None)
+    document = {"entity": "project", "entity_id": 9001, "instances_id": None, "title": "Old", "body": ""}
+    with engine.begin() as connection:
+        search_index.write(connection, [document], [])
+        search_index.write(connection, [{**document, "title": "New"}], [])
+    with engine.connect() as connection:
+        titles = connection.execute(
+            select(SearchDocument.title).where(SearchDocument.entity_id == 9001)
+        ).scalars().all()
+    assert titles == ["New"]
+    with engine.begin() as connection:
+        search_index.write(connection, [], [("project", 9001)])
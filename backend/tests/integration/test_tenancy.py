@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert, select
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.auth.jwt import JWTManager
+from app.core.config import get_settings
+from app.core.middleware import token_instance
+from app.core.tenancy import TenantScopeMiddleware, current_instance_id, tenant_scope
+from app.db.partitioning import partition_statements
+from app.db.session import SessionLocal, engine
+from app.db.tenancy import ALL_TENANTS_OPTION
+from app.models.generated import (
+    Assets,
+    AssetsAssignments,
+    AssetsBarcodes,
+    AssetTypes,
+    InstancePositions,
+    Instances,
+    Projects,
+    UserInstances,
+    Users,
+)
+
+
+def _tags(client: TestClient, instance_id: int | None = None) -> list[str]:
+    headers = {} if instance_id is None else {"X-Instance-Id": str(instance_id)}
+    response = client.get("/api/assets", params={"fields": "tag,effective_day_rate"}, headers=headers)
+    assert response.status_code == 200
+    return [item["tag"] for item in response.json()["items"]]
+
+
+def test_requests_are_scoped_to_the_header_instance(client: TestClient) -> None:
+    with SessionLocal() as session:
+        asset_type = session.execute(select(AssetTypes)).scalar_one()
+        first_instance = asset_type.instances_id
+        # A type without an instance is shared by every instance.
+        asset_type.instances_id = None
+        other = Instances(
+            instances_name="Other Instance",
+            instances_deleted=False,
+            instances_plan="basic",
+            instances_storageLimit=1000,
+            instances_config_linkedDefaultDiscount=0.0,
+            instances_config_currency="GBP",
+        )
+        session.add(other)
+        session.flush()
+        other_id = other.instances_id
+        session.add(
+            Assets(
+                assets_tag="OTH-0001",
+                assetTypes_id=asset_type.assetTypes_id,
+                instances_id=other_id,
+                assets_inserted=datetime(2026, 1, 1),
+                assets_deleted=False,
+                assets_showPublic=True,
+            )
+        )
+        # Lee Member holds a position in the other instance; the rest only in the first, or an expired one.
+        for instance_id, name, archived in (
+            (other_id, "Member", None),
+            (first_instance, "Outsider", None),
+            (other_id, "Former", datetime(2020, 1, 1)),
+        ):
+            position = InstancePositions(
+                instances_id=instance_id,
+                instancePositions_displayName="Crew",
+                instancePositions_rank=1,
+                instancePositions_deleted=False,
+            )
+            user = Users(
+                users_username=f"lee{name.lower()}",
+                users_name1="Lee",
+                users_name2=name,
+                users_hash="x",
+                users_changepass=False,
+                users_suspended=False,
+                users_deleted=False,
+                users_emailVerified=True,
+            )
+            session.add_all([position, user])
+            session.flush()
+            session.add(
+                UserInstances(
+                    users_userid=user.users_userid,
+                    instancePositions_id=position.instancePositions_id,
+                    userInstances_deleted=False,
+                    userInstances_archived=archived,
+                )
+            )
+        session.commit()
+
+    assert _tags(client) == ["AST-0001", "AST-0002", "OTH-0001"]
+    assert _tags(client, first_instance) == ["AST-0001", "AST-0002"]
+    assert _tags(client, other_id) == ["OTH-0001"]
+
+    headers = {"X-Instance-Id": str(other_id)}
+    listing = client.get("/api/assets", params={"fields": "tag,effective_day_rate"}, headers=headers).json()
+    assert listing["total"] == 1
+    assert listing["items"][0]["effective_day_rate"] == 2500
+    assert client.get("/api/assets/1", headers=headers).status_code == 404
+
+    def search(q: str) -> list[tuple[str, str]]:
+        hits = client.get("/api/search", params={"q": q}, headers=headers).json()["hits"]
+        return [(hit["type"], hit["title"]) for hit in hits]
+
+    assert search("oth") == [("asset", "OTH-0001")]
+    assert search("ast") == []
+    assert search("led") == [("asset_type", "LED Panel")]
+    # Users are only found by instances they hold a live position in.
+    assert search("lee") == [("user", "Lee Member")]
+
+    response = client.get("/api/assets", headers={"X-Instance-Id": "first"})
+    assert response.status_code == 400
+
+    with SessionLocal() as session, tenant_scope(other_id):
+        assert session.execute(select(Assets.assets_tag)).scalars().all() == ["OTH-0001"]
+        unscoped = select(Assets.assets_tag).execution_options(**{ALL_TENANTS_OPTION: True})
+        assert len(session.execute(unscoped).scalars().all()) == 3
+
+
+def test_availability_index_holds_the_bookings_of_every_tenant(client: TestClient, monkeypatch) -> None:
+    with SessionLocal() as session:
+        assets = session.execute(select(Assets).where(Assets.assets_tag.in_(["AST-0001", "OTH-0001"]))).scalars()
+        booked = {asset.instances_id: asset.assets_id for asset in assets}
+    assert len(booked) == 2
+    # Core statements bypass the session listeners, so only a reload can see these bookings.
+    with engine.begin() as connection:
+        project_ids = []
+        for instance_id, asset_id in booked.items():
+            project_id = connection.execute(
+                insert(Projects).values(
+                    projects_name=f"Booking {instance_id}",
+                    instances_id=instance_id,
+                    projects_manager=1,
+                    projects_created=datetime(2026, 1, 1),
+                    projects_deleted=False,
+                    projects_archived=False,
+                    projects_dates_deliver_start=datetime(2026, 10, 1),
+                    projects_dates_deliver_end=datetime(2026, 10, 5),
+                    projects_status=1,
+                    projects_defaultDiscount=0.0,
+                    projectsTypes_id=1,
+                )
+            ).inserted_primary_key[0]
+            project_ids.append(project_id)
+            connection.execute(
+                insert(AssetsAssignments).values(
+                    assets_id=asset_id,
+                    projects_id=project_id,
+                    assetsAssignments_customPrice=0,
+                    assetsAssignments_discount=0.0,
+                    assetsAssignments_deleted=False,
+                )
+            )
+
+    def unavailable(instance_id: int) -> list[int]:
+        response = client.get(
+            "/api/assets/availability",
+            params={"start": "2026-10-02T00:00:00", "end": "2026-10-03T00:00:00"},
+            headers={"X-Instance-Id": str(instance_id)},
+        )
+        assert response.status_code == 200
+        return response.json()["unavailable"]
+
+    first, other = booked
+    try:
+        # The first tenant's request loads the shared index; the other tenant then reads it as loaded.
+        monkeypatch.setattr(get_settings(), "availability_max_age_seconds", 0.0)
+        assert unavailable(first) == [booked[first]]
+        monkeypatch.setattr(get_settings(), "availability_max_age_seconds", 300.0)
+        monkeypatch.setattr(get_settings(), "availability_check_interval_seconds", 300.0)
+        assert unavailable(other) == [booked[other]]
+        assert unavailable(first) == [booked[first]]
+    finally:
+        with engine.begin() as connection:
+            connection.execute(delete(AssetsAssignments).where(AssetsAssignments.projects_id.in_(project_ids)))
+            connection.execute(delete(Projects).where(Projects.projects_id.in_(project_ids)))
+
+
+def _access_token(instance_id: int | None, **claims: object) -> str:
+    settings = get_settings()
+    tokens = JWTManager(settings.jwt_secret_key, algorithm=settings.jwt_algorithm, issuer=settings.jwt_issuer)
+    payload = {"sub": "1", "jti": "test", "type": "access", "instance_id": instance_id, **claims}
+    return tokens.encode(payload, timedelta(minutes=5))
+
+
+def test_tenant_comes_from_the_token_and_unscoped_requests_are_refused(client: TestClient, monkeypatch) -> None:
+    with SessionLocal() as session:
+        asset = session.execute(select(Assets).where(Assets.assets_tag == "AST-0001")).scalar_one()
+        own_id = asset.instances_id
+        session.add(
+            AssetsBarcodes(
+                assets_id=asset.assets_id,
+                assetsBarcodes_value="BC-TENANT-1",
+                assetsBarcodes_type="CODE_128",
+                assetsBarcodes_added=datetime.now(timezone.utc),
+            )
+        )
+        session.commit()
+    other_id = own_id + 1
+    monkeypatch.setattr(get_settings(), "tenant_required", True)
+
+    assert client.get("/api/assets").status_code == 403
+    assert client.get("/api/search", params={"q": "ast"}).status_code == 403
+    own = {"Authorization": f"Bearer {_access_token(own_id)}"}
+    other = {"Authorization": f"Bearer {_access_token(other_id)}"}
+    assert client.get("/api/assets/1", headers=own).status_code == 200
+    assert client.get("/api/assets/1", headers=other).status_code == 404
+    # The token's instance wins over the header.
+    assert client.get("/api/assets/1", headers={**other, "X-Instance-Id": str(own_id)}).status_code == 404
+    assert client.get("/api/assets", headers={"Authorization": "Bearer not-a-token"}).status_code == 401
+
+    # Barcodes have no instance of their own; the scope applies through their asset.
+    assert client.get("/api/barcodes/BC-TENANT-1", headers=own).json()["asset"]["tag"] == "AST-0001"
+    assert client.get("/api/barcodes/BC-TENANT-1", headers=other).status_code == 404
+
+
+def test_tenant_header_is_ignored_unless_trusted(monkeypatch) -> None:
+    async def scope(request: Request) -> JSONResponse:
+        return JSONResponse({"instance_id": current_instance_id()})
+
+    def instance(headers: dict[str, str], *, trust_header: bool) -> object:
+        monkeypatch.setattr(get_settings(), "tenant_header_trusted", trust_header)
+        app = Starlette(routes=[Route("/", scope)])
+        app.add_middleware(TenantScopeMiddleware, header="X-Instance-Id", token_instance=token_instance(get_settings()))
+        response = TestClient(app).get("/", headers=headers)
+        return response.json()["instance_id"] if response.status_code == 200 else response.status_code
+
+    assert instance({"X-Instance-Id": "7"}, trust_header=False) is None
+    assert instance({"X-Instance-Id": "7"}, trust_header=True) == 7
+    assert instance({"X-Instance-Id": "x"}, trust_header=True) == 400
+    # Refresh tokens do not scope requests.
+    refresh = _access_token(7, type="refresh")
+    assert instance({"Authorization": f"Bearer {refresh}"}, trust_header=False) is None
+    assert instance({"Authorization": f"Bearer {_access_token(7)}"}, trust_header=False) == 7
+
+
+def test_partition_plan_gives_dedicated_instances_their_own_partition() -> None:
+    statements = partition_statements([7, 3, 7])
+    partitions = [statement for statement in statements if "PARTITION OF assets FOR VALUES" in statement]
+    assert partitions == [
+        "CREATE TABLE assets_instance_3 PARTITION OF assets FOR VALUES IN (3)",
+        "CREATE TABLE assets_instance_7 PARTITION OF assets FOR VALUES IN (7)",
+    ]
+    assert "ALTER TABLE assets ADD PRIMARY KEY (assets_id, instances_id)" in statements
+    assert any(statement.startswith("CREATE INDEX ix_assets_instance_live ON assets") for statement in statements)
+    with pytest.raises(ValueError):
+        partition_statements([0])